@@ -1,5 +1,5 @@
 """
-Configuration package - Environment variables, paths, and LLM settings
+Configuration package - Environment variables, paths, LLM and embedding settings
 """
 from .configuration import (
     GROQ_API_KEY,
@@ -8,28 +8,102 @@ from .configuration import (
     DATA_DIR,
     PDF_FILE,
     TEXT_FILE,
+    CORPUS_DIR,
     URLS,
+    URL_FETCH_MAX_WORKERS,
+    URL_FETCH_PER_HOST,
+    URL_FETCH_CONNECT_TIMEOUT,
+    URL_FETCH_READ_TIMEOUT,
+    WEB_CONTENT_EXTRACTION,
     DEFAULT_MODEL,
     DEFAULT_TEMPERATURE,
+    LLM_ROLE_MODELS,
+    GROQ_REQUESTS_PER_MINUTE,
+    GROQ_TOKENS_PER_MINUTE,
+    LLM_COMPLETION_TOKENS_ESTIMATE,
+    LLM_MAX_RETRIES,
+    LLM_BACKOFF_BASE,
+    LLM_BACKOFF_MAX,
     EMBEDDING_MODEL,
+    EMBEDDING_DEVICE,
+    QUERY_EMBEDDING_CACHE_SIZE,
     CHUNK_SIZE,
     CHUNK_OVERLAP,
+    SPLITTER_MODE,
+    SPLITTER_TOKENIZER,
+    LLM_TOKENIZER,
+    CHUNK_TOKENS,
+    CHUNK_OVERLAP_TOKENS,
+    EMBED_BATCH_SIZE,
+    INGEST_QUEUE_SIZE,
+    NEAR_DUPLICATE_THRESHOLD,
+    MINHASH_PERMUTATIONS,
+    MINHASH_BANDS,
+    SHINGLE_SIZE,
+    EMBED_ENCODE_BATCH_SIZE,
+    EMBED_ENCODE_WORKERS,
+    PDF_PARSER,
+    PDF_PARSE_WORKERS,
+    PDF_PAGES_PER_TASK,
+    CORPUS_EXTENSIONS,
+    CORPUS_LOAD_WORKERS,
+    INDEX_CACHE_DIR,
+    HTTP_CACHE_DIR,
     RETRIEVER_K,
+    INDEX_TYPE,
+    ANN_TARGET_P95_MS,
+    ANN_MIN_RECALL,
+    ANN_TUNE_SAMPLE_SIZE,
+    HNSW_M,
+    VECTOR_STORAGE,
+    PQ_M,
+    INDEX_MMAP,
+    SEARCH_BATCH_WINDOW_MS,
+    SEARCH_WORKERS,
+    UNIFIED_FETCH_FACTOR,
+    RETRIEVAL_MODE,
+    BM25_K1,
+    BM25_B,
+    RRF_K,
     RECURSION_LIMIT,
+    GRADE_ACCEPT_SCORE,
+    GRADE_REJECT_SCORE,
+    GRADE_CALIBRATION_LOG,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL,
+    LLM_CACHE_MAX_BYTES,
+    ANSWER_CACHE_SIZE,
+    ANSWER_CACHE_THRESHOLD,
+    ANSWER_CACHE_TTL,
     WIKIPEDIA_TOP_K,
     WIKIPEDIA_DOC_CONTENT_CHARS_MAX,
     ARXIV_TOP_K,
     ARXIV_DOC_CONTENT_CHARS_MAX,
+    TOOL_READY_TIMEOUT,
 )
 
 from .llm import (
     get_llm,
     get_llm_with_tools,
     get_llm_with_structured_output,
+    get_chain,
+    get_llm_cache,
+    llm_cache_stats,
+    rate_limit_stats,
+    LLM_PRIORITY_GENERATE,
+    LLM_PRIORITY_DEFAULT,
+    LLM_PRIORITY_GRADE,
     set_api_key,
     get_api_key,
 )
 
+from .embeddings import (
+    get_embeddings,
+    embedding_memory_report,
+    query_cache_stats,
+)
+
 __all__ = [
     # Configuration constants
     "GROQ_API_KEY",
@@ -38,20 +112,92 @@ __all__ = [
     "DATA_DIR",
     "PDF_FILE",
     "TEXT_FILE",
+    "CORPUS_DIR",
     "URLS",
+    "URL_FETCH_MAX_WORKERS",
+    "URL_FETCH_PER_HOST",
+    "URL_FETCH_CONNECT_TIMEOUT",
+    "URL_FETCH_READ_TIMEOUT",
+    "WEB_CONTENT_EXTRACTION",
     "DEFAULT_MODEL",
     "DEFAULT_TEMPERATURE",
+    "LLM_ROLE_MODELS",
+    "GROQ_REQUESTS_PER_MINUTE",
+    "GROQ_TOKENS_PER_MINUTE",
+    "LLM_COMPLETION_TOKENS_ESTIMATE",
+    "LLM_MAX_RETRIES",
+    "LLM_BACKOFF_BASE",
+    "LLM_BACKOFF_MAX",
     "EMBEDDING_MODEL",
+    "EMBEDDING_DEVICE",
+    "QUERY_EMBEDDING_CACHE_SIZE",
     "CHUNK_SIZE",
     "CHUNK_OVERLAP",
+    "SPLITTER_MODE",
+    "SPLITTER_TOKENIZER",
+    "LLM_TOKENIZER",
+    "CHUNK_TOKENS",
+    "CHUNK_OVERLAP_TOKENS",
+    "EMBED_BATCH_SIZE",
+    "INGEST_QUEUE_SIZE",
+    "NEAR_DUPLICATE_THRESHOLD",
+    "MINHASH_PERMUTATIONS",
+    "MINHASH_BANDS",
+    "SHINGLE_SIZE",
+    "EMBED_ENCODE_BATCH_SIZE",
+    "EMBED_ENCODE_WORKERS",
+    "PDF_PARSER",
+    "PDF_PARSE_WORKERS",
+    "PDF_PAGES_PER_TASK",
+    "CORPUS_EXTENSIONS",
+    "CORPUS_LOAD_WORKERS",
+    "INDEX_CACHE_DIR",
+    "HTTP_CACHE_DIR",
     "RETRIEVER_K",
+    "INDEX_TYPE",
+    "ANN_TARGET_P95_MS",
+    "ANN_MIN_RECALL",
+    "ANN_TUNE_SAMPLE_SIZE",
+    "HNSW_M",
+    "VECTOR_STORAGE",
+    "PQ_M",
+    "INDEX_MMAP",
+    "SEARCH_BATCH_WINDOW_MS",
+    "SEARCH_WORKERS",
+    "UNIFIED_FETCH_FACTOR",
+    "RETRIEVAL_MODE",
+    "BM25_K1",
+    "BM25_B",
+    "RRF_K",
     "RECURSION_LIMIT",
+    "GRADE_ACCEPT_SCORE",
+    "GRADE_REJECT_SCORE",
+    "GRADE_CALIBRATION_LOG",
+    "LLM_CACHE_ENABLED",
+    "LLM_CACHE_PATH",
+    "LLM_CACHE_TTL",
+    "LLM_CACHE_MAX_BYTES",
+    "ANSWER_CACHE_SIZE",
+    "ANSWER_CACHE_THRESHOLD",
+    "ANSWER_CACHE_TTL",
     "WIKIPEDIA_TOP_K",
     "WIKIPEDIA_DOC_CONTENT_CHARS_MAX",
     "ARXIV_TOP_K",
     "ARXIV_DOC_CONTENT_CHARS_MAX",
+    "TOOL_READY_TIMEOUT",
     # LLM functions
     "get_llm",
     "get_llm_with_tools",
     "get_llm_with_structured_output",
+    "get_chain",
+    "get_llm_cache",
+    "llm_cache_stats",
+    "rate_limit_stats",
+    "LLM_PRIORITY_GENERATE",
+    "LLM_PRIORITY_DEFAULT",
+    "LLM_PRIORITY_GRADE",
+    # Embedding functions
+    "get_embeddings",
+    "embedding_memory_report",
+    "query_cache_stats",
 ]
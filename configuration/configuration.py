@@ -26,6 +26,8 @@ PROJECT_ROOT = Path(__file__).parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
 PDF_FILE = DATA_DIR / "Agent Quality Whitepaper.pdf"
 TEXT_FILE = DATA_DIR / "about_me.txt"
+# Directory tree of PDF / text / markdown files indexed by the knowledge base tool
+CORPUS_DIR = Path(os.getenv("CORPUS_DIR", str(DATA_DIR / "corpus")))
 
 # ==================== URL Configuration ====================
 # URLs for web retrieval
@@ -35,25 +37,160 @@ URLS = [
     "https://langchain-ai.github.io/langgraph/how-tos/map-reduce/"
 ]
 
+# URL fetching: overall / per-host concurrency and timeouts (seconds)
+URL_FETCH_MAX_WORKERS = int(os.getenv("URL_FETCH_MAX_WORKERS", "16"))
+URL_FETCH_PER_HOST = int(os.getenv("URL_FETCH_PER_HOST", "4"))
+URL_FETCH_CONNECT_TIMEOUT = 5
+URL_FETCH_READ_TIMEOUT = 20
+# Keep only the main content (article body, code blocks) of fetched pages, split into
+# sections that carry their heading path as metadata; false indexes the full page text
+WEB_CONTENT_EXTRACTION = os.getenv("WEB_CONTENT_EXTRACTION", "true").lower() in ("1", "true", "yes")
+
 # ==================== LLM Configuration ====================
 DEFAULT_MODEL = "llama-3.1-8b-instant"
 DEFAULT_TEMPERATURE = 0
+# (model, fallback model) of every LLM role, overridable with LLM_MODEL_<ROLE> / LLM_FALLBACK_MODEL_<ROLE>;
+# tool choice, routing, grading and rewriting run on the fast model, only the answer pays for the larger one
+LLM_ROLE_MODELS = {
+    role: (
+        os.getenv(f"LLM_MODEL_{role.upper()}", model),
+        os.getenv(f"LLM_FALLBACK_MODEL_{role.upper()}", fallback),
+    )
+    for role, (model, fallback) in {
+        "route": (DEFAULT_MODEL, "meta-llama/llama-4-scout-17b-16e-instruct"),
+        "grade": (DEFAULT_MODEL, "meta-llama/llama-4-scout-17b-16e-instruct"),
+        "rewrite": (DEFAULT_MODEL, "meta-llama/llama-4-scout-17b-16e-instruct"),
+        "agent": (DEFAULT_MODEL, "llama-3.3-70b-versatile"),
+        "generate": ("llama-3.3-70b-versatile", DEFAULT_MODEL),
+    }.items()
+}
+# Groq limits of the account tier, per model (0 disables a bucket); calls are admitted client-side within them
+GROQ_REQUESTS_PER_MINUTE = int(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30"))
+GROQ_TOKENS_PER_MINUTE = int(os.getenv("GROQ_TOKENS_PER_MINUTE", "6000"))
+# Completion tokens reserved for a call without max_tokens (settled against the reported usage afterwards)
+LLM_COMPLETION_TOKENS_ESTIMATE = 512
+# Retries of rate-limited and failed LLM calls, with jittered exponential backoff (seconds)
+LLM_MAX_RETRIES = 5
+LLM_BACKOFF_BASE = 1.0
+LLM_BACKOFF_MAX = 30.0
 
 # ==================== Embedding Configuration ====================
 EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+# Torch device for the embedding model (None lets sentence-transformers choose)
+EMBEDDING_DEVICE = os.getenv("EMBEDDING_DEVICE") or None
+# Number of query embeddings kept in the process-wide LRU cache (0 disables it)
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024"))
 
 # ==================== Text Splitter Configuration ====================
 CHUNK_SIZE = 1000
 CHUNK_OVERLAP = 100
+# "characters" (RecursiveCharacterTextSplitter, sized by CHUNK_SIZE / CHUNK_OVERLAP) or
+# "tokens" (single-pass splitter sized in model tokens by CHUNK_TOKENS / CHUNK_OVERLAP_TOKENS)
+SPLITTER_MODE = os.getenv("SPLITTER_MODE", "characters")
+# Tokenizer counting tokens in "tokens" mode: "embedding" (EMBEDDING_MODEL) or "llm" (LLM_TOKENIZER)
+SPLITTER_TOKENIZER = os.getenv("SPLITTER_TOKENIZER", "embedding")
+# Hugging Face tokenizer matching the Groq Llama 3.x models
+LLM_TOKENIZER = os.getenv("LLM_TOKENIZER", "Xenova/Meta-Llama-3.1-Tokenizer")
+# all-MiniLM-L6-v2 truncates inputs beyond 256 tokens
+CHUNK_TOKENS = 240
+CHUNK_OVERLAP_TOKENS = 24
+
+# ==================== Ingestion Configuration ====================
+# Chunks embedded and added to the index per batch while a source is loading
+EMBED_BATCH_SIZE = 256
+# Maximum number of chunk batches buffered between loading and embedding
+INGEST_QUEUE_SIZE = 4
+# Chunks whose estimated Jaccard similarity (over word shingles) with an earlier chunk
+# of the same source reaches this threshold are dropped before embedding (0 disables)
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.85"))
+# MinHash signature length, LSH bands it is split into, and words per shingle
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 16
+SHINGLE_SIZE = 5
+
+# Encoder batch size and worker processes used to embed chunks during index builds
+# (1 worker encodes in-process; more spread batches over a pool of model replicas)
+EMBED_ENCODE_BATCH_SIZE = int(os.getenv("EMBED_ENCODE_BATCH_SIZE", "32"))
+EMBED_ENCODE_WORKERS = int(os.getenv("EMBED_ENCODE_WORKERS", "1"))
+
+# PDF parser backend: "pypdf" (default), "pymupdf" or "pdfium"
+PDF_PARSER = os.getenv("PDF_PARSER", "pypdf")
+# Worker processes used to parse PDF pages and pages handed to each task
+PDF_PARSE_WORKERS = int(os.getenv("PDF_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_PAGES_PER_TASK = 8
+
+# File types ingested from CORPUS_DIR and worker processes used to parse them
+CORPUS_EXTENSIONS = (".pdf", ".txt", ".md", ".markdown")
+CORPUS_LOAD_WORKERS = int(os.getenv("CORPUS_LOAD_WORKERS", str(os.cpu_count() or 1)))
+
+# ==================== Index Cache Configuration ====================
+# Directory where built FAISS indexes are persisted between runs
+INDEX_CACHE_DIR = Path(os.getenv("INDEX_CACHE_DIR", str(PROJECT_ROOT / ".index_cache")))
+# Directory where fetched web pages and their ETag / Last-Modified validators are kept
+HTTP_CACHE_DIR = INDEX_CACHE_DIR / "http"
 
 # ==================== Retrieval Configuration ====================
 # Number of documents to retrieve
 RETRIEVER_K = 4
 
+# FAISS index type for the retriever tools: "flat" (exact), "hnsw" or "ivf"
+INDEX_TYPE = os.getenv("INDEX_TYPE", "flat")
+# Autotuning targets for approximate indexes (efSearch / nprobe are picked to meet them)
+ANN_TARGET_P95_MS = float(os.getenv("ANN_TARGET_P95_MS", "5"))
+ANN_MIN_RECALL = float(os.getenv("ANN_MIN_RECALL", "0.95"))
+ANN_TUNE_SAMPLE_SIZE = 200
+# Graph degree of HNSW indexes
+HNSW_M = 32
+# Vector storage of the indexes: "float32", "float16", "int8" (scalar quantized) or "pq"
+VECTOR_STORAGE = os.getenv("VECTOR_STORAGE", "float32")
+# Number of sub-quantizers (bytes per vector) of PQ storage
+PQ_M = 48
+# Open saved indexes memory-mapped and read-only instead of reading them into memory
+INDEX_MMAP = os.getenv("INDEX_MMAP", "true").lower() in ("1", "true", "yes")
+# Local sources share one index; concurrent tool searches arriving within this
+# window are embedded and searched as one batch
+SEARCH_BATCH_WINDOW_MS = float(os.getenv("SEARCH_BATCH_WINDOW_MS", "5"))
+# Threads running the search batches (and index builds) of async searches
+SEARCH_WORKERS = int(os.getenv("SEARCH_WORKERS", "4"))
+# Neighbours fetched per source and result before falling back to a filtered search
+UNIFIED_FETCH_FACTOR = 4
+# "hybrid" merges BM25 and dense results with reciprocal rank fusion, "dense" uses vectors only
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "hybrid")
+# BM25 term frequency saturation and length normalization
+BM25_K1 = 1.5
+BM25_B = 0.75
+# Reciprocal rank fusion constant (higher values flatten the rank weights)
+RRF_K = 60
+
 # ==================== Graph Configuration ====================
 # Maximum recursion limit for graph execution
 RECURSION_LIMIT = 25
 
+# ==================== Grading Configuration ====================
+# Top retrieval similarity (query / chunk cosine) at or above which documents go straight to
+# generation, and below which the question is rewritten; only scores in between are graded by the LLM
+GRADE_ACCEPT_SCORE = float(os.getenv("GRADE_ACCEPT_SCORE", "0.6"))
+GRADE_REJECT_SCORE = float(os.getenv("GRADE_REJECT_SCORE", "0.2"))
+# LLM grades of scored retrievals are appended here; calibrate_thresholds() derives the two scores from them
+GRADE_CALIBRATION_LOG = INDEX_CACHE_DIR / "grade_calibration.jsonl"
+
+# ==================== LLM Cache Configuration ====================
+# Serve repeated temperature-0 LLM calls from a local SQLite cache (opt-in)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+LLM_CACHE_PATH = Path(os.getenv("LLM_CACHE_PATH", str(INDEX_CACHE_DIR / "llm_cache.sqlite")))
+# Seconds a cached response stays valid
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+# Bytes of cached responses kept; least recently used responses are evicted beyond it
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# ==================== Answer Cache Configuration ====================
+# Answers kept per agent for repeated and paraphrased questions (0 disables the cache)
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "512"))
+# Cosine similarity between two questions above which the earlier answer is reused
+ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.92"))
+# Seconds an answer is reused (web search answers go stale even when the local indexes do not)
+ANSWER_CACHE_TTL = float(os.getenv("ANSWER_CACHE_TTL", "3600"))
+
 # ==================== Tool Configuration ====================
 # Wikipedia settings
 WIKIPEDIA_TOP_K = 1
@@ -62,3 +199,7 @@ WIKIPEDIA_DOC_CONTENT_CHARS_MAX = 500
 # Arxiv settings
 ARXIV_TOP_K = 1
 ARXIV_DOC_CONTENT_CHARS_MAX = 500
+
+# Tools backed by the local index are built in the background; seconds a query
+# routed to one of them waits for it to become ready
+TOOL_READY_TIMEOUT = float(os.getenv("TOOL_READY_TIMEOUT", "300"))
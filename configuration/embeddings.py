@@ -0,0 +1,248 @@
+"""
+Embeddings Configuration - Process-wide shared embedding model registry
+"""
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from configuration.configuration import EMBEDDING_MODEL, EMBEDDING_DEVICE, QUERY_EMBEDDING_CACHE_SIZE
+
+# Registry of shared embedding models keyed by (model_name, device, normalize_embeddings)
+_REGISTRY: Dict[Tuple[str, Optional[str], bool], "SharedEmbeddings"] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def _current_rss() -> Optional[int]:
+    """Get the resident set size of this process in bytes (None if unavailable)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _format_mb(num_bytes: Optional[int]) -> str:
+    """Format a byte count as megabytes"""
+    return "n/a" if num_bytes is None else f"{num_bytes / (1024 * 1024):.1f} MB"
+
+
+def normalize_query(text: str) -> str:
+    """Normalize query text for cache lookups (Unicode NFKC, collapsed whitespace)"""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+class QueryEmbeddingCache:
+    """
+    Bounded, thread-safe LRU cache of query embeddings keyed by model and normalized text
+
+    Vectors are stored as float32 arrays. Hits, misses and evictions are counted
+    for the hit-rate report.
+    """
+
+    def __init__(self, max_size: int = QUERY_EMBEDDING_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        """Return the cached embedding of a query, if any"""
+        key = (model, normalize_query(text))
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return vector.tolist()
+
+    def put(self, model: str, text: str, vector: List[float]):
+        """Store the embedding of a query, evicting the least recently used entries"""
+        if self.max_size <= 0:
+            return
+        key = (model, normalize_query(text))
+        with self._lock:
+            self._entries[key] = np.asarray(vector, dtype=np.float32)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every cached embedding and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """Size, hit/miss/eviction counts and hit rate"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# One cache for the whole process, so every retriever and every rewrite loop shares it
+_QUERY_CACHE = QueryEmbeddingCache()
+
+
+class SharedEmbeddings(Embeddings):
+    """
+    Lazily loaded, thread-safe wrapper around a single HuggingFaceEmbeddings model
+
+    The underlying model is only loaded on the first embed call, and calls are
+    serialized because the fast tokenizer cannot be used from several threads at once.
+    Query embeddings go through the process-wide query embedding cache.
+    """
+
+    def __init__(self, model_name: str, device: Optional[str] = None, normalize_embeddings: bool = False):
+        self.model_name = model_name
+        self.device = device
+        self.normalize_embeddings = normalize_embeddings
+        self.resident_bytes: Optional[int] = None
+        self.parameter_bytes: Optional[int] = None
+        self.load_seconds: Optional[float] = None
+        self._model = None
+        self._load_lock = threading.Lock()
+        self._encode_lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the underlying model has been loaded"""
+        return self._model is not None
+
+    def _get_model(self):
+        """Load the underlying model on first use"""
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    from langchain_huggingface import HuggingFaceEmbeddings
+
+                    model_kwargs = {"device": self.device} if self.device else {}
+                    rss_before = _current_rss()
+                    start = time.perf_counter()
+                    model = HuggingFaceEmbeddings(
+                        model_name=self.model_name,
+                        model_kwargs=model_kwargs,
+                        encode_kwargs={"normalize_embeddings": self.normalize_embeddings},
+                    )
+                    self.load_seconds = time.perf_counter() - start
+                    rss_after = _current_rss()
+                    if rss_before is not None and rss_after is not None:
+                        self.resident_bytes = max(rss_after - rss_before, 0)
+
+                    client = getattr(model, "_client", None) or getattr(model, "client", None)
+                    if client is not None and hasattr(client, "parameters"):
+                        self.parameter_bytes = sum(p.numel() * p.element_size() for p in client.parameters())
+
+                    self._model = model
+                    print(
+                        f"✓ Embedding model loaded: {self.model_name} "
+                        f"({self.load_seconds:.1f}s, {_format_mb(self.resident_bytes)} resident)"
+                    )
+        return self._model
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed a list of documents"""
+        model = self._get_model()
+        with self._encode_lock:
+            return model.embed_documents(texts)
+
+    @property
+    def cache_id(self) -> str:
+        """Identifier of the vectors this model produces, part of the query cache key"""
+        return f"{self.model_name}#normalized" if self.normalize_embeddings else self.model_name
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query (served from the query embedding cache when possible)"""
+        vector = _QUERY_CACHE.get(self.cache_id, text)
+        if vector is not None:
+            return vector
+        model = self._get_model()
+        with self._encode_lock:
+            vector = model.embed_query(text)
+        _QUERY_CACHE.put(self.cache_id, text, vector)
+        return vector
+
+
+def get_embeddings(
+    model_name: str = None,
+    device: str = None,
+    normalize_embeddings: bool = False,
+) -> SharedEmbeddings:
+    """
+    Get the shared embedding model for the given settings
+
+    Every caller asking for the same model and device settings receives the same
+    instance, so the model is loaded at most once per process.
+
+    Args:
+        model_name: Model name (defaults to EMBEDDING_MODEL from config)
+        device: Torch device (defaults to EMBEDDING_DEVICE from config)
+        normalize_embeddings: Whether to L2-normalize the vectors
+
+    Returns:
+        SharedEmbeddings instance
+    """
+    key = (model_name or EMBEDDING_MODEL, device or EMBEDDING_DEVICE, normalize_embeddings)
+    with _REGISTRY_LOCK:
+        embeddings = _REGISTRY.get(key)
+        if embeddings is None:
+            embeddings = SharedEmbeddings(*key)
+            _REGISTRY[key] = embeddings
+        return embeddings
+
+
+def query_cache_stats() -> dict:
+    """
+    Report the hit rate of the query embedding cache
+
+    Returns:
+        Dict with size, max_size, hits, misses, evictions and hit_rate
+    """
+    return _QUERY_CACHE.stats()
+
+
+def embedding_memory_report() -> List[dict]:
+    """
+    Report the memory used by every registered embedding model
+
+    Returns:
+        List of dicts with model settings, load state, load time, resident memory
+        growth measured around the load and the size of the model parameters
+    """
+    with _REGISTRY_LOCK:
+        entries = list(_REGISTRY.values())
+
+    return [
+        {
+            "model_name": e.model_name,
+            "device": e.device,
+            "normalize_embeddings": e.normalize_embeddings,
+            "loaded": e.loaded,
+            "load_seconds": e.load_seconds,
+            "resident_bytes": e.resident_bytes,
+            "parameter_bytes": e.parameter_bytes,
+        }
+        for e in entries
+    ]
@@ -1,13 +1,61 @@
 """
 LLM Configuration - Centralized LLM model initialization with dynamic API key support
 """
+import asyncio
+import json
 import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Callable, Hashable, Iterator, List, Optional, Tuple
+
+import groq
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable
 from langchain_groq import ChatGroq
-from configuration.configuration import DEFAULT_MODEL
+from pydantic import PrivateAttr
+from configuration.configuration import (
+    DEFAULT_MODEL,
+    LLM_CACHE_ENABLED,
+    LLM_COMPLETION_TOKENS_ESTIMATE,
+    LLM_MAX_RETRIES,
+    LLM_ROLE_MODELS,
+)
+from configuration.llm_cache import LLMResponseCache
+from configuration.rate_limit import (
+    LLM_PRIORITY_DEFAULT,
+    LLM_PRIORITY_GENERATE,
+    LLM_PRIORITY_GRADE,
+    RateLimitScheduler,
+)
 
 # Module-level API key storage
 _API_KEY = None
 
+# Admission priority of every LLM role: the answer first, grading last
+LLM_ROLE_PRIORITIES = {
+    "route": LLM_PRIORITY_DEFAULT,
+    "grade": LLM_PRIORITY_GRADE,
+    "rewrite": LLM_PRIORITY_DEFAULT,
+    "agent": LLM_PRIORITY_DEFAULT,
+    "generate": LLM_PRIORITY_GENERATE,
+}
+
+# Clients keyed by (model, temperature, api_key, priority, 429 retries); each keeps its HTTP connection pool alive
+_CLIENTS: "OrderedDict[Tuple, ChatGroq]" = OrderedDict()
+# Tool-bound models, structured-output models and chains built on top of the clients
+_RUNNABLES: "OrderedDict[Tuple, Tuple[Any, Any]]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+# Entries kept per cache (older API keys and tool sets are evicted first)
+_MAX_CACHED = 64
+# Persistent response cache of temperature-0 calls, opened on first use when LLM_CACHE_ENABLED
+_RESPONSE_CACHE: "LLMResponseCache | None" = None
+# One scheduler for the process, so all nodes and agents share the Groq limits
+_SCHEDULER = RateLimitScheduler()
+# Transient failures retried with backoff besides 429s (the Groq SDK's own retries are disabled)
+_RETRYABLE_ERRORS = (groq.APIConnectionError, groq.InternalServerError)
+
 
 def set_api_key(api_key: str):
     """Set the API key dynamically (for Streamlit UI)"""
@@ -22,53 +70,368 @@ def get_api_key() -> str:
     return _API_KEY or os.getenv("GROQ_API_KEY")
 
 
-def get_llm(model: str = None, temperature: float = 0):
+def get_llm_cache() -> "LLMResponseCache | None":
+    """Get the persistent LLM response cache, or None if it is disabled or cannot be opened"""
+    global _RESPONSE_CACHE
+    if not LLM_CACHE_ENABLED:
+        return None
+    with _CACHE_LOCK:
+        if _RESPONSE_CACHE is None:
+            try:
+                _RESPONSE_CACHE = LLMResponseCache()
+                print(f"✓ LLM response cache: {_RESPONSE_CACHE.path}")
+            except Exception as e:
+                print(f"✗ Failed to open LLM response cache: {e}")
+                return None
+        return _RESPONSE_CACHE
+
+
+def llm_cache_stats() -> dict:
+    """
+    Report the hit rate of the persistent LLM response cache
+
+    Returns:
+        Dict with entries, bytes, hits, misses, writes, evictions and hit_rate
+        (empty if the cache is disabled)
+    """
+    cache = get_llm_cache()
+    return cache.stats() if cache is not None else {}
+
+
+def rate_limit_stats() -> dict:
+    """
+    Report the client-side rate limiting of LLM calls
+
+    Returns:
+        Dict with admitted calls, wait_seconds, rate_limited (429s), retries
+        and the bucket levels per model
+    """
+    return _SCHEDULER.stats()
+
+
+def _retry_after(error: groq.APIStatusError) -> Optional[float]:
+    """Seconds the server asked to wait before retrying, if it said"""
+    try:
+        return float(error.response.headers["retry-after"])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
+class ScheduledChatGroq(ChatGroq):
+    """
+    ChatGroq whose calls are admitted by the shared rate-limit scheduler
+
+    Each call reserves one request and its estimated tokens (prompt and tool
+    schemas at ~4 characters per token plus the completion budget) before it
+    is sent, and settles the reservation against the reported usage. 429s block
+    the model for everyone and are retried after a jittered backoff, as are
+    connection errors and server errors. A client with a fallback model gives up
+    on 429s after ``rate_limit_retries`` retries instead.
+
+    Priority and retries are private attributes rather than model fields, so
+    they stay out of the serialized model the LLM response cache keys on.
+    """
+
+    _priority: int = PrivateAttr(default=LLM_PRIORITY_DEFAULT)
+    _rate_limit_retries: int = PrivateAttr(default=LLM_MAX_RETRIES)
+
+    def __init__(self, *, priority: int = LLM_PRIORITY_DEFAULT, rate_limit_retries: int = LLM_MAX_RETRIES, **kwargs):
+        super().__init__(**kwargs)
+        self._priority = priority
+        self._rate_limit_retries = rate_limit_retries
+
+    def _estimate_tokens(self, messages: List[BaseMessage], kwargs: dict) -> int:
+        chars = sum(len(str(message.content)) for message in messages)
+        chars += len(json.dumps(kwargs.get("tools") or [], default=str))
+        return chars // 4 + (self.max_tokens or LLM_COMPLETION_TOKENS_ESTIMATE)
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        """Backoff before the next attempt, re-raising when the error is final"""
+        if attempt >= LLM_MAX_RETRIES:
+            raise error
+        if isinstance(error, groq.RateLimitError):
+            delay = _SCHEDULER.rate_limit_hit(self.model_name, attempt, _retry_after(error))
+            if attempt >= self._rate_limit_retries:
+                print(f"✗ Groq rate limit hit ({self.model_name}), falling back")
+                raise error
+            print(f"✗ Groq rate limit hit ({self.model_name}), retrying in {delay:.1f}s")
+            # The scheduler holds the next admission until the block ends
+            return 0.0
+        delay = _SCHEDULER.backoff(attempt)
+        print(f"✗ Groq call failed ({error}), retrying in {delay:.1f}s")
+        return delay
+
+    @staticmethod
+    def _used_tokens(result: ChatResult) -> Optional[int]:
+        return ((result.llm_output or {}).get("token_usage") or {}).get("total_tokens")
+
+    @staticmethod
+    def _chunk_tokens(chunk: ChatGenerationChunk) -> Optional[int]:
+        # Groq reports the usage of a stream on its last chunk
+        usage = getattr(chunk.message, "usage_metadata", None)
+        return usage.get("total_tokens") if usage else None
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.streaming:
+            # Goes through _stream, which is scheduled itself
+            return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        estimate = self._estimate_tokens(messages, kwargs)
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            reserved = _SCHEDULER.acquire(self.model_name, estimate, self._priority)
+            try:
+                result = super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            except (groq.RateLimitError, *_RETRYABLE_ERRORS) as e:
+                time.sleep(self._retry_delay(e, attempt))
+                continue
+            _SCHEDULER.settle(self.model_name, reserved, self._used_tokens(result))
+            return result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.streaming:
+            return await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        estimate = self._estimate_tokens(messages, kwargs)
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            reserved = await _SCHEDULER.aacquire(self.model_name, estimate, self._priority)
+            try:
+                result = await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            except (groq.RateLimitError, *_RETRYABLE_ERRORS) as e:
+                await asyncio.sleep(self._retry_delay(e, attempt))
+                continue
+            _SCHEDULER.settle(self.model_name, reserved, self._used_tokens(result))
+            return result
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        estimate = self._estimate_tokens(messages, kwargs)
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            reserved = _SCHEDULER.acquire(self.model_name, estimate, self._priority)
+            chunks = super()._stream(messages, stop=stop, run_manager=run_manager, **kwargs)
+            try:
+                # Errors surface on the first chunk; once tokens flow the stream is not retried
+                first = next(chunks, None)
+            except (groq.RateLimitError, *_RETRYABLE_ERRORS) as e:
+                time.sleep(self._retry_delay(e, attempt))
+                continue
+            used = None
+            try:
+                if first is not None:
+                    used = self._chunk_tokens(first)
+                    yield first
+                    for chunk in chunks:
+                        used = self._chunk_tokens(chunk) or used
+                        yield chunk
+            finally:
+                _SCHEDULER.settle(self.model_name, reserved, used)
+            return
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        estimate = self._estimate_tokens(messages, kwargs)
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            reserved = await _SCHEDULER.aacquire(self.model_name, estimate, self._priority)
+            chunks = super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs)
+            try:
+                first = await anext(chunks, None)
+            except (groq.RateLimitError, *_RETRYABLE_ERRORS) as e:
+                await asyncio.sleep(self._retry_delay(e, attempt))
+                continue
+            used = None
+            try:
+                if first is not None:
+                    used = self._chunk_tokens(first)
+                    yield first
+                    async for chunk in chunks:
+                        used = self._chunk_tokens(chunk) or used
+                        yield chunk
+            finally:
+                _SCHEDULER.settle(self.model_name, reserved, used)
+            return
+
+
+def _client_key(
+    model: str = None,
+    temperature: float = 0,
+    priority: int = LLM_PRIORITY_DEFAULT,
+    rate_limit_retries: int = LLM_MAX_RETRIES,
+) -> Tuple:
+    return (model or DEFAULT_MODEL, float(temperature), get_api_key(), priority, rate_limit_retries)
+
+
+def _cached(cache: OrderedDict, key: Hashable, build):
+    """Return the cached value for a key, building and storing it on a miss (bounded LRU)"""
+    with _CACHE_LOCK:
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+    value = build()
+    with _CACHE_LOCK:
+        value = cache.setdefault(key, value)
+        cache.move_to_end(key)
+        while len(cache) > _MAX_CACHED:
+            cache.popitem(last=False)
+    return value
+
+
+def _get_client(model: str, temperature: float, priority: int, rate_limit_retries: int = LLM_MAX_RETRIES):
+    model_name, temperature, api_key, priority, rate_limit_retries = key = _client_key(
+        model, temperature, priority, rate_limit_retries
+    )
+    
+    def build():
+        kwargs = {"api_key": api_key} if api_key else {}
+        # Only deterministic calls are worth replaying
+        cache = get_llm_cache() if temperature == 0 else None
+        if cache is not None:
+            kwargs["cache"] = cache
+        return ScheduledChatGroq(
+            model=model_name,
+            temperature=temperature,
+            priority=priority,
+            rate_limit_retries=rate_limit_retries,
+            max_retries=0,
+            **kwargs,
+        )
+    
+    return _cached(_CLIENTS, key, build)
+
+
+def _for_role(role: str, temperature: float, make: Callable[[ChatGroq], Runnable]) -> Runnable:
+    """
+    Build a runnable on the role's model, falling back to the same runnable on its fallback model
+
+    The primary model gives up on the first 429 (the fallback model has its own
+    Groq limits); the fallback retries as usual.
+    """
+    if role not in LLM_ROLE_MODELS:
+        raise ValueError(f"Unknown LLM role '{role}', available: {', '.join(LLM_ROLE_MODELS)}")
+    model, fallback = LLM_ROLE_MODELS[role]
+    priority = LLM_ROLE_PRIORITIES.get(role, LLM_PRIORITY_DEFAULT)
+    if not fallback or fallback == model:
+        return make(_get_client(model, temperature, priority))
+    primary = make(_get_client(model, temperature, priority, rate_limit_retries=0))
+    return primary.with_fallbacks([make(_get_client(fallback, temperature, priority))])
+
+
+def _role_key(kind: str, role: str, temperature: float) -> Tuple:
+    return (kind, role, float(temperature), get_api_key())
+
+
+def get_llm(model: str = None, temperature: float = 0, priority: int = LLM_PRIORITY_DEFAULT, role: str = None):
     """
     Get a ChatGroq LLM instance
     
+    Instances are pooled by model, temperature, API key and priority, so every
+    node reuses the same client and its open HTTP connections. Calls are admitted
+    by the shared rate-limit scheduler. With LLM_CACHE_ENABLED, temperature-0
+    clients answer repeated calls from the persistent response cache.
+    
     Args:
         model: Model name (defaults to DEFAULT_MODEL from config)
         temperature: Temperature for generation (default: 0)
+        priority: Admission priority under rate limits (LLM_PRIORITY_*)
+        role: LLM role (route, grade, rewrite, agent, generate); when given, the
+            model, fallback model and priority come from LLM_ROLE_MODELS instead
         
     Returns:
-        ChatGroq instance
+        ChatGroq instance (with a fallback model, for a role that has one)
     """
-    model_name = model or DEFAULT_MODEL
-    api_key = get_api_key()
-    
-    if api_key:
-        return ChatGroq(model=model_name, temperature=temperature, api_key=api_key)
-    else:
-        return ChatGroq(model=model_name, temperature=temperature)
+    if role is not None:
+        return _cached(_RUNNABLES, _role_key("llm", role, temperature), lambda: (
+            _for_role(role, temperature, lambda llm: llm), None
+        ))[0]
+    return _get_client(model, temperature, priority)
 
 
-def get_llm_with_tools(tools: list, model: str = None, temperature: float = 0):
+def get_llm_with_tools(
+    tools: list, model: str = None, temperature: float = 0, priority: int = LLM_PRIORITY_DEFAULT, role: str = None
+):
     """
     Get a ChatGroq LLM instance with tools bound
     
+    The bound model is built once per client and tool set.
+    
     Args:
         tools: List of tools to bind to the model
         model: Model name (defaults to DEFAULT_MODEL from config)
         temperature: Temperature for generation (default: 0)
+        priority: Admission priority under rate limits (LLM_PRIORITY_*)
+        role: LLM role selecting the model, fallback model and priority
         
     Returns:
         ChatGroq instance with tools bound
     """
-    llm = get_llm(model, temperature)
-    return llm.bind_tools(tools)
+    # The tools are kept in the entry so their ids cannot be reused while it is cached
+    tool_ids = tuple(id(tool) for tool in tools)
+    if role is not None:
+        return _cached(_RUNNABLES, (*_role_key("tools", role, temperature), tool_ids), lambda: (
+            _for_role(role, temperature, lambda llm: llm.bind_tools(tools)), list(tools)
+        ))[0]
+    key = ("tools", _client_key(model, temperature, priority), tool_ids)
+    return _cached(
+        _RUNNABLES, key, lambda: (get_llm(model, temperature, priority).bind_tools(tools), list(tools))
+    )[0]
 
 
-def get_llm_with_structured_output(output_schema, model: str = None, temperature: float = 0):
+def get_llm_with_structured_output(
+    output_schema, model: str = None, temperature: float = 0, priority: int = LLM_PRIORITY_DEFAULT, role: str = None
+):
     """
     Get a ChatGroq LLM instance with structured output
     
+    The structured model is built once per client and schema.
+    
     Args:
         output_schema: Pydantic model or schema for structured output
         model: Model name (defaults to DEFAULT_MODEL from config)
         temperature: Temperature for generation (default: 0)
+        priority: Admission priority under rate limits (LLM_PRIORITY_*)
+        role: LLM role selecting the model, fallback model and priority
         
     Returns:
         ChatGroq instance with structured output
     """
-    llm = get_llm(model, temperature)
-    return llm.with_structured_output(output_schema)
+    if role is not None:
+        return _cached(_RUNNABLES, (*_role_key("structured", role, temperature), output_schema), lambda: (
+            _for_role(role, temperature, lambda llm: llm.with_structured_output(output_schema)), None
+        ))[0]
+    key = ("structured", _client_key(model, temperature, priority), output_schema)
+    return _cached(
+        _RUNNABLES, key, lambda: (get_llm(model, temperature, priority).with_structured_output(output_schema), None)
+    )[0]
+
+
+def get_chain(
+    prompt,
+    output_schema=None,
+    output_parser=None,
+    model: str = None,
+    temperature: float = 0,
+    priority: int = LLM_PRIORITY_DEFAULT,
+    role: str = None,
+):
+    """
+    Get a prompt | LLM chain, built once per client
+    
+    Args:
+        prompt: Prompt template (a module-level constant, the cache holds it by identity)
+        output_schema: Optional Pydantic model for structured output
+        output_parser: Optional parser appended to the chain (e.g. StrOutputParser())
+        model: Model name (defaults to DEFAULT_MODEL from config)
+        temperature: Temperature for generation (default: 0)
+        priority: Admission priority under rate limits (LLM_PRIORITY_*)
+        role: LLM role selecting the model, fallback model and priority
+        
+    Returns:
+        Runnable chain
+    """
+    def build():
+        if output_schema is not None:
+            chain = prompt | get_llm_with_structured_output(output_schema, model, temperature, priority, role)
+        else:
+            chain = prompt | get_llm(model, temperature, priority, role)
+        if output_parser is not None:
+            chain = chain | output_parser
+        # The prompt and parser are kept in the entry so their ids cannot be reused while it is cached
+        return chain, (prompt, output_parser)
+    
+    client = _role_key("chain", role, temperature) if role is not None else _client_key(model, temperature, priority)
+    key = ("chain", client, id(prompt), output_schema, id(output_parser))
+    return _cached(_RUNNABLES, key, build)[0]
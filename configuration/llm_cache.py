@@ -0,0 +1,193 @@
+"""
+LLM Cache - Persistent exact-match cache of deterministic LLM responses in SQLite
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+from configuration.configuration import LLM_CACHE_PATH, LLM_CACHE_TTL, LLM_CACHE_MAX_BYTES
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    model TEXT NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    llm_hash TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (model, prompt_hash, llm_hash)
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _cache_key(prompt: str, llm_string: str) -> Tuple[str, str, str]:
+    """
+    (model, messages hash, settings hash) of an LLM call
+
+    ``prompt`` is the serialized message list; ``llm_string`` is the serialized
+    model followed by the call parameters, which hold the bound tool schemas and
+    structured output format, so a call with other tools never hits.
+    """
+    model = ""
+    try:
+        model = json.loads(llm_string.split("---", 1)[0])["kwargs"]["model_name"]
+    except (ValueError, KeyError, TypeError):
+        pass
+    return model, _sha256(prompt), _sha256(llm_string)
+
+
+def _dump_generations(generations: RETURN_VAL_TYPE) -> str:
+    """Serialize chat generations as plain message dicts (no class revival needed to read them back)"""
+    return json.dumps([
+        {
+            "text": g.text,
+            "message": message_to_dict(g.message) if isinstance(g, ChatGeneration) else None,
+            "generation_info": g.generation_info,
+        }
+        for g in generations
+    ])
+
+
+def _load_generations(response: str) -> RETURN_VAL_TYPE:
+    generations = []
+    for g in json.loads(response):
+        if g["message"] is not None:
+            message = messages_from_dict([g["message"]])[0]
+            generations.append(ChatGeneration(message=message, generation_info=g["generation_info"]))
+        else:
+            generations.append(Generation(text=g["text"], generation_info=g["generation_info"]))
+    return generations
+
+
+class LLMResponseCache(BaseCache):
+    """
+    Exact-match LLM response cache persisted in a local SQLite file
+
+    Responses are keyed by model, the hash of the serialized messages and the
+    hash of the model settings and bound tool schemas. Entries expire after
+    ``ttl`` seconds; once the stored responses exceed ``max_bytes`` the least
+    recently used ones are evicted. Hits, misses, writes and evictions are
+    counted for the hit-rate report. Database errors are reported and treated
+    as misses, so a broken cache never fails an LLM call.
+    """
+
+    def __init__(
+        self,
+        path: Path = LLM_CACHE_PATH,
+        ttl: float = LLM_CACHE_TTL,
+        max_bytes: int = LLM_CACHE_MAX_BYTES,
+    ):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by all threads (serialized by the lock); WAL lets other processes read meanwhile
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Return the cached generations of a call, if any and not expired"""
+        key = _cache_key(prompt, llm_string)
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT response, created FROM responses WHERE model = ? AND prompt_hash = ? AND llm_hash = ?",
+                    key,
+                ).fetchone()
+                if row is None or now - row[1] > self.ttl:
+                    if row is not None:
+                        self._conn.execute(
+                            "DELETE FROM responses WHERE model = ? AND prompt_hash = ? AND llm_hash = ?", key
+                        )
+                    self.misses += 1
+                    return None
+                self._conn.execute(
+                    "UPDATE responses SET accessed = ? WHERE model = ? AND prompt_hash = ? AND llm_hash = ?",
+                    (now, *key),
+                )
+                self.hits += 1
+            return _load_generations(row[0])
+        except (sqlite3.Error, ValueError, TypeError, KeyError) as e:
+            print(f"✗ LLM cache lookup failed: {e}")
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store the generations of a call, then evict expired and least recently used responses"""
+        try:
+            response = _dump_generations(return_val)
+        except (TypeError, ValueError) as e:
+            print(f"✗ LLM response not cacheable: {e}")
+            return
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (*_cache_key(prompt, llm_string), response, size, now, now),
+                )
+                self.writes += 1
+                self._evict(now)
+        except sqlite3.Error as e:
+            print(f"✗ LLM cache update failed: {e}")
+
+    def _evict(self, now: float):
+        expired = self._conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,)).rowcount
+        # Keep the most recently used responses whose running size fits max_bytes
+        evicted = self._conn.execute(
+            """DELETE FROM responses WHERE rowid IN (
+                SELECT rowid FROM (
+                    SELECT rowid, SUM(size) OVER (ORDER BY accessed DESC, rowid DESC) AS running
+                    FROM responses
+                ) WHERE running > ?
+            )""",
+            (self.max_bytes,),
+        ).rowcount
+        self.evictions += max(expired, 0) + max(evicted, 0)
+
+    def clear(self, **kwargs: Any) -> None:
+        """Drop every cached response and reset the counters"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self.hits = self.misses = self.writes = self.evictions = 0
+
+    def stats(self) -> dict:
+        """Size, hit/miss/write/eviction counts and hit rate"""
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "path": str(self.path),
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,270 @@
+"""
+Rate Limit - Client-side request / token buckets with priority admission for LLM calls
+"""
+import asyncio
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from configuration.configuration import (
+    GROQ_REQUESTS_PER_MINUTE,
+    GROQ_TOKENS_PER_MINUTE,
+    LLM_BACKOFF_BASE,
+    LLM_BACKOFF_MAX,
+)
+
+# Admission priorities (lower is served first): the answer the user waits for goes ahead of grading
+LLM_PRIORITY_GENERATE = 0
+LLM_PRIORITY_DEFAULT = 1
+LLM_PRIORITY_GRADE = 2
+
+
+class TokenBucket:
+    """
+    Bucket refilled continuously at ``per_minute`` units per minute, holding at most a minute's worth
+
+    A limit of 0 or less disables the bucket.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def refill(self, now: float):
+        if self.enabled:
+            self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` units are available (after refill)"""
+        if not self.enabled or self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        if self.enabled:
+            self.level -= amount
+
+
+class _ModelLimits:
+    """Buckets, waiting callers and rate-limit block of one model (Groq limits are per model)"""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.waiting: List[Tuple[int, int]] = []
+        # Futures of the async callers in ``waiting``, by ticket, resolved whenever the queue may move
+        self.wakeups: Dict[Tuple[int, int], asyncio.Future] = {}
+        self.blocked_until = 0.0
+
+    def notify(self, changed: threading.Condition):
+        """Wake every waiting caller, threads and coroutines alike (called with ``changed`` held)"""
+        changed.notify_all()
+        for future in self.wakeups.values():
+            future.get_loop().call_soon_threadsafe(_resolve, future)
+
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class RateLimitScheduler:
+    """
+    Admits LLM calls through per-model request and token buckets in priority order
+
+    Every call asks for one request and its estimated tokens. Callers wait in a
+    priority queue (lower priority value first, FIFO within a priority) and only
+    the head of a model's queue is admitted, as soon as both buckets hold
+    enough, so a burst of grading calls cannot starve a waiting generation.
+    After the call the estimate is settled against the reported usage. A 429
+    blocks the model for the Retry-After time (or a jittered exponential
+    backoff), so every caller backs off together instead of retrying into the limit.
+    Threads wait with acquire() and coroutines with aacquire(), in the same queues.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = GROQ_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = GROQ_TOKENS_PER_MINUTE,
+        backoff_base: float = LLM_BACKOFF_BASE,
+        backoff_max: float = LLM_BACKOFF_MAX,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._models: Dict[str, _ModelLimits] = {}
+        self._changed = threading.Condition()
+        self._sequence = itertools.count()
+        self.admitted = 0
+        self.wait_seconds = 0.0
+        self.rate_limited = 0
+        self.retries = 0
+
+    def _limits(self, model: str) -> _ModelLimits:
+        limits = self._models.get(model)
+        if limits is None:
+            limits = self._models[model] = _ModelLimits(self.requests_per_minute, self.tokens_per_minute)
+        return limits
+
+    def acquire(self, model: str, tokens: int, priority: int = LLM_PRIORITY_DEFAULT) -> int:
+        """
+        Wait until a call may be sent
+
+        Args:
+            model: Model the call goes to
+            tokens: Estimated prompt and completion tokens of the call
+            priority: Admission priority (LLM_PRIORITY_*)
+
+        Returns:
+            Tokens taken from the bucket (the estimate, capped at a minute's worth),
+            to be passed to settle() once the call is done
+        """
+        start = time.monotonic()
+        with self._changed:
+            limits, ticket, tokens = self._enqueue(model, tokens, priority)
+            try:
+                while True:
+                    admitted, delay = self._try_admit(limits, ticket, tokens, start)
+                    if admitted:
+                        return tokens
+                    self._changed.wait(delay)
+            except BaseException:
+                self._dequeue(limits, ticket)
+                raise
+
+    async def aacquire(self, model: str, tokens: int, priority: int = LLM_PRIORITY_DEFAULT) -> int:
+        """
+        Async version of acquire: waits on the event loop, not in a thread
+
+        The caller takes its place in the same priority queue as threaded
+        callers; a cancelled caller leaves the queue without taking any tokens.
+        """
+        start = time.monotonic()
+        loop = asyncio.get_running_loop()
+        with self._changed:
+            limits, ticket, tokens = self._enqueue(model, tokens, priority)
+        try:
+            while True:
+                with self._changed:
+                    admitted, delay = self._try_admit(limits, ticket, tokens, start)
+                    if admitted:
+                        return tokens
+                    wakeup = limits.wakeups[ticket] = loop.create_future()
+                try:
+                    await asyncio.wait([wakeup], timeout=delay)
+                finally:
+                    with self._changed:
+                        limits.wakeups.pop(ticket, None)
+        except BaseException:
+            with self._changed:
+                self._dequeue(limits, ticket)
+            raise
+
+    def _enqueue(self, model: str, tokens: int, priority: int) -> Tuple[_ModelLimits, Tuple[int, int], int]:
+        """Queue a caller (lower priority value first, FIFO within a priority); called with the lock held"""
+        limits = self._limits(model)
+        if limits.tokens.enabled:
+            tokens = min(tokens, int(limits.tokens.capacity))
+        ticket = (priority, next(self._sequence))
+        heapq.heappush(limits.waiting, ticket)
+        return limits, ticket, tokens
+
+    def _dequeue(self, limits: _ModelLimits, ticket: Tuple[int, int]):
+        """Remove a caller that gave up, letting the next one move to the head"""
+        limits.waiting.remove(ticket)
+        heapq.heapify(limits.waiting)
+        limits.notify(self._changed)
+
+    def _try_admit(
+        self, limits: _ModelLimits, ticket: Tuple[int, int], tokens: int, start: float
+    ) -> Tuple[bool, Optional[float]]:
+        """
+        Admit a queued caller if it heads the queue and both buckets hold enough (called with the lock held)
+
+        Returns:
+            Tuple of (admitted, seconds to wait before trying again or None until woken)
+        """
+        now = time.monotonic()
+        limits.requests.refill(now)
+        limits.tokens.refill(now)
+        if limits.waiting[0] != ticket:
+            return False, None
+        delay = max(
+            limits.blocked_until - now,
+            limits.requests.wait_time(1),
+            limits.tokens.wait_time(tokens),
+        )
+        if delay > 0:
+            return False, delay
+        heapq.heappop(limits.waiting)
+        limits.requests.take(1)
+        limits.tokens.take(tokens)
+        self.admitted += 1
+        self.wait_seconds += now - start
+        limits.notify(self._changed)
+        return True, None
+
+    def settle(self, model: str, reserved: int, used: Optional[int]):
+        """Correct the token bucket by the difference between the reserved and the reported tokens"""
+        if used is None:
+            return
+        with self._changed:
+            limits = self._limits(model)
+            if limits.tokens.enabled:
+                limits.tokens.level = min(limits.tokens.capacity, limits.tokens.level + reserved - used)
+            limits.notify(self._changed)
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Jittered exponential backoff delay of a retry (at least ``retry_after`` when the server gave one)"""
+        self.retries += 1
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        delay = ceiling / 2 + random.uniform(0, ceiling / 2)
+        if retry_after is not None:
+            delay = retry_after + random.uniform(0, self.backoff_base)
+        return delay
+
+    def rate_limit_hit(self, model: str, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Block a model after a 429, so queued callers wait instead of tripping the limit again
+
+        Returns:
+            Backoff delay in seconds
+        """
+        delay = self.backoff(attempt, retry_after)
+        with self._changed:
+            self.rate_limited += 1
+            limits = self._limits(model)
+            limits.blocked_until = max(limits.blocked_until, time.monotonic() + delay)
+            # The server counts differently than the estimates; start the next window empty
+            limits.tokens.level = min(limits.tokens.level, 0.0)
+            limits.notify(self._changed)
+        return delay
+
+    def stats(self) -> dict:
+        """Admitted calls, time spent waiting, 429s, retries and the bucket levels per model"""
+        with self._changed:
+            return {
+                "admitted": self.admitted,
+                "wait_seconds": self.wait_seconds,
+                "rate_limited": self.rate_limited,
+                "retries": self.retries,
+                "models": {
+                    model: {
+                        "requests_available": limits.requests.level,
+                        "tokens_available": limits.tokens.level,
+                        "waiting": len(limits.waiting),
+                    }
+                    for model, limits in self._models.items()
+                },
+            }
@@ -3,6 +3,7 @@ Agentic RAG Agent - Following 1-AgenticRAG_langraph.ipynb pattern exactly
 Simple agent with tools: Wikipedia, Arxiv, PDF, Text, URL retrievers
 """
 import os
+import sys
 from pathlib import Path
 from typing import Annotated
 from typing_extensions import TypedDict
@@ -13,7 +14,6 @@ from langchain_community.document_loaders import WebBaseLoader, PyPDFLoader, Tex
 from langchain_community.vectorstores import FAISS
 from langchain_community.tools import WikipediaQueryRun, ArxivQueryRun
 from langchain_community.utilities import WikipediaAPIWrapper, ArxivAPIWrapper
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.tools.retriever import create_retriever_tool
 
@@ -21,6 +21,11 @@ from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode, tools_condition
 
+# Add project root to path so the shared embedding registry can be used
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from configuration.embeddings import get_embeddings
+
 # Load environment variables
 load_dotenv()
 os.environ["GROQ_API_KEY"] = os.getenv("GROQ_API_KEY", "")
@@ -68,7 +73,7 @@ def create_url_retriever_tool():
         
         vectorstore = FAISS.from_documents(
             documents=doc_splits,
-            embedding=HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
+            embedding=get_embeddings("sentence-transformers/all-MiniLM-L6-v2")
         )
         retriever = vectorstore.as_retriever()
         
@@ -97,7 +102,7 @@ def create_pdf_retriever_tool():
         
         vectorstore = FAISS.from_documents(
             documents=doc_splits,
-            embedding=HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
+            embedding=get_embeddings("sentence-transformers/all-MiniLM-L6-v2")
         )
         retriever = vectorstore.as_retriever()
         
@@ -126,7 +131,7 @@ def create_text_retriever_tool():
         
         vectorstore = FAISS.from_documents(
             documents=doc_splits,
-            embedding=HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
+            embedding=get_embeddings("sentence-transformers/all-MiniLM-L6-v2")
         )
         retriever = vectorstore.as_retriever()
         
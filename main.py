@@ -15,7 +15,10 @@ def main():
     print("\n" + "="*60)
     print("[AGENT] Agentic RAG - Multi-Source Tool Retriever")
     print("="*60)
-    print(f"Loaded {agent.get_tool_count()} tools")
+    print(f"Loaded {agent.get_tool_count()} tools", end="")
+    if agent.get_pending_tool_count():
+        print(f" ({agent.get_pending_tool_count()} more loading in the background)", end="")
+    print()
     print("Ask questions about LangGraph, Agent Quality, or Abhiram")
     print("Type 'exit' or 'quit' to stop\n")
     
@@ -31,16 +34,34 @@ def main():
             if not user_input:
                 continue
             
-            # Get response from agent with details
+            # Stream progress and the answer from the agent
             print("\n🤔 Thinking...\n")
-            response, details = agent.query_with_details(user_input)
+            details = {}
+            answering = False
+            for event in agent.stream(user_input):
+                if event["event"] == "node":
+                    print(f"✔️ Step finished: {event['node']}")
+                elif event["event"] == "token":
+                    if not answering:
+                        print("\nAssistant: ", end="", flush=True)
+                        answering = True
+                    print(event["text"], end="", flush=True)
+                else:
+                    details = event["details"]
+            print("\n")
             
             # Display execution details
             if details["tools_used"]:
                 print(f"🔧 Tools Used: {', '.join(details['tools_used'])}")
-                print(f"📊 Total Steps: {details['total_messages']}\n")
+                print(f"📊 Total Steps: {details['total_messages']}")
+                cache = details["query_cache"]
+                print(f"🗂️ Query Embedding Cache: {cache['hits']} hits / {cache['misses']} misses "
+                      f"({cache['hit_rate']:.0%} hit rate)\n")
+            answer_cache = details.get("answer_cache", {})
+            if answer_cache.get("hit"):
+                print(f"⚡ Answered from cache: \"{answer_cache['question']}\" "
+                      f"(similarity {answer_cache['similarity']:.2f})\n")
             
-            print(f"Assistant: {response}\n")
             print("-" * 60 + "\n")
             
         except KeyboardInterrupt:
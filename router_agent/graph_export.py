@@ -8,33 +8,57 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from configuration.configuration import PDF_FILE, TEXT_FILE, URLS
+import threading
+
+from langchain_core.runnables import RunnableConfig
+
+from configuration.configuration import PDF_FILE, TEXT_FILE, URLS, CORPUS_DIR
 from src.tools import (
+    ToolRegistry,
+    ToolSpec,
     create_wikipedia_tool,
     create_arxiv_tool,
     create_duckgo_search_tool,
     create_url_retriever_tool,
     create_pdf_retriever_tool,
     create_text_retriever_tool,
+    create_corpus_retriever_tool,
 )
 from src.graph.graph import create_graph
 
 
-# Initialize tools at module level (required for LangGraph Studio)
+# Start building tools at module level (required for LangGraph Studio); the retriever
+# tools are built in the background so the server starts serving right away
 print("[INFO] Initializing tools for LangGraph Studio...")
-_tools_raw = [
-    create_url_retriever_tool(URLS),
-    create_pdf_retriever_tool(PDF_FILE),
-    create_text_retriever_tool(TEXT_FILE),
-    create_wikipedia_tool(),
-    create_arxiv_tool(),
-    create_duckgo_search_tool()
-]
-tools = [t for t in _tools_raw if t is not None]
-print(f"[INFO] {len(tools)} tools initialized successfully")
-
-if not tools:
-    raise RuntimeError("No tools were initialized! Check your data files and network connection.")
-
-# Create and export the compiled graph
-graph = create_graph(tools)
+tool_registry = ToolRegistry([
+    ToolSpec("langgraph_docs_search", lambda: create_url_retriever_tool(URLS), indexed=True),
+    ToolSpec("pdf_search", lambda: create_pdf_retriever_tool(PDF_FILE), indexed=True),
+    ToolSpec("about_abhiram_search", lambda: create_text_retriever_tool(TEXT_FILE), indexed=True),
+    ToolSpec("knowledge_base_search", lambda: create_corpus_retriever_tool(CORPUS_DIR), indexed=True),
+    ToolSpec("wikipedia", create_wikipedia_tool),
+    ToolSpec("arxiv", create_arxiv_tool),
+    ToolSpec("duckduckgo_search", create_duckgo_search_tool),
+]).start()
+print(f"[INFO] {len(tool_registry.ready_tools())} tools ready, {tool_registry.pending_count()} loading in the background")
+
+_graph = None
+_graph_version = -1
+_graph_lock = threading.Lock()
+
+
+def make_graph(config: RunnableConfig = None):
+    """
+    Graph factory for LangGraph Studio, called for every run
+
+    Returns:
+        Compiled graph bound to the tools that are ready, recompiled when more join
+    """
+    global _graph, _graph_version
+    with _graph_lock:
+        if _graph_version != tool_registry.version:
+            if not tool_registry.ready_tools() and not tool_registry.wait_for_any():
+                raise RuntimeError("No tools were initialized! Check your data files and network connection.")
+            version = tool_registry.version
+            _graph = create_graph(list(tool_registry.ready_tools().values()))
+            _graph_version = version
+        return _graph
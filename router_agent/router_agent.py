@@ -1,9 +1,10 @@
 """
 Router-Based Agent - Semantic routing for intelligent tool selection
 """
+import asyncio
 import sys
 from pathlib import Path
-from typing import Literal, Dict, Any
+from typing import Any, Dict, Iterator, Literal, Optional, Tuple
 from pydantic import BaseModel, Field
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
@@ -11,9 +12,13 @@ from langchain_core.output_parsers import StrOutputParser
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from configuration.llm import get_llm, get_llm_with_structured_output
+from configuration.llm import get_llm_with_structured_output, get_chain
 from configuration.configuration import PDF_FILE, TEXT_FILE, URLS
+from src.agent.answer_cache import SemanticAnswerCache
+from src.retrieval import get_unified_index
 from src.tools import (
+    ToolRegistry,
+    ToolSpec,
     create_wikipedia_tool,
     create_arxiv_tool,
     create_duckgo_search_tool,
@@ -38,6 +43,20 @@ class RouteQuery(BaseModel):
     )
 
 
+ANSWER_PROMPT = PromptTemplate(
+    template="""You are a helpful assistant. Use the following context to answer the question.
+If you don't know the answer, just say so. Keep the answer concise and informative.
+
+Question: {question}
+
+Context: {context}
+
+Answer:""",
+    input_variables=["question", "context"],
+)
+_STR_PARSER = StrOutputParser()
+
+
 class RouterAgent:
     """
     Router-based agent that uses semantic routing to select the best tool
@@ -46,29 +65,31 @@ class RouterAgent:
     def __init__(self):
         """Initialize the router agent"""
         print("[INFO] Initializing Router Agent...")
-        self.llm = get_llm()
-        self.tools = self._initialize_tools()
+        self.tool_registry = self._initialize_tools()
         self.router = self._create_router()
+        self.answer_cache = SemanticAnswerCache()
         print("[INFO] Router Agent initialized successfully")
     
-    def _initialize_tools(self) -> Dict[str, Any]:
-        """Initialize all available tools"""
+    def _initialize_tools(self) -> ToolRegistry:
+        """Start building all available tools (retriever tools finish in the background)"""
         print("[INFO] Initializing tools...")
         
-        tools = {
-            "langgraph_docs": create_url_retriever_tool(URLS),
-            "pdf_whitepaper": create_pdf_retriever_tool(PDF_FILE),
-            "personal_info": create_text_retriever_tool(TEXT_FILE),
-            "wikipedia": create_wikipedia_tool(),
-            "arxiv": create_arxiv_tool(),
-            "web_search": create_duckgo_search_tool()
-        }
+        registry = ToolRegistry([
+            ToolSpec("langgraph_docs", lambda: create_url_retriever_tool(URLS), indexed=True),
+            ToolSpec("pdf_whitepaper", lambda: create_pdf_retriever_tool(PDF_FILE), indexed=True),
+            ToolSpec("personal_info", lambda: create_text_retriever_tool(TEXT_FILE), indexed=True),
+            ToolSpec("wikipedia", create_wikipedia_tool),
+            ToolSpec("arxiv", create_arxiv_tool),
+            ToolSpec("web_search", create_duckgo_search_tool),
+        ]).start()
         
-        # Filter out None values
-        tools = {k: v for k, v in tools.items() if v is not None}
-        print(f"[INFO] {len(tools)} tools initialized")
-        
-        return tools
+        print(f"[INFO] {len(registry.ready_tools())} tools ready, {registry.pending_count()} loading in the background")
+        return registry
+    
+    @property
+    def tools(self) -> Dict[str, Any]:
+        """Tools that are ready to use, by route"""
+        return self.tool_registry.ready_tools()
     
     def _create_router(self):
         """Create the routing chain"""
@@ -92,79 +113,208 @@ Return only the datasource name.""",
         )
         
         # Create structured output LLM
-        structured_llm = get_llm_with_structured_output(RouteQuery)
+        structured_llm = get_llm_with_structured_output(RouteQuery, role="route")
         
         # Create chain
         router_chain = router_prompt | structured_llm
         
         return router_chain
     
-    def _execute_tool(self, tool_name: str, query: str) -> str:
-        """Execute the selected tool"""
-        tool = self.tools.get(tool_name)
+    def _execute_tool(self, tool_name: str, query: str) -> Tuple[str, bool]:
+        """
+        Execute the selected tool (waiting for it if it is still being built)
+        
+        Returns:
+            Tuple of (result or error message, whether the tool failed)
+        """
+        tool = self.tool_registry.get(tool_name)
         
         if not tool:
-            return f"Tool '{tool_name}' not available"
+            return f"Tool '{tool_name}' not available", True
         
         try:
             print(f"[INFO] Executing tool: {tool_name}")
             result = tool.invoke(query)
-            return result
+            return result, False
         except Exception as e:
             print(f"[ERROR] Tool execution failed: {e}")
-            return f"Error executing tool: {str(e)}"
+            return f"Error executing tool: {str(e)}", True
     
-    def _generate_answer(self, question: str, context: str) -> str:
-        """Generate final answer using retrieved context"""
-        prompt = PromptTemplate(
-            template="""You are a helpful assistant. Use the following context to answer the question.
-If you don't know the answer, just say so. Keep the answer concise and informative.
-
-Question: {question}
-
-Context: {context}
-
-Answer:""",
-            input_variables=["question", "context"],
-        )
+    async def _aexecute_tool(self, tool_name: str, query: str) -> Tuple[str, bool]:
+        """Async version of _execute_tool"""
+        tool = await asyncio.to_thread(self.tool_registry.get, tool_name)
+        
+        if not tool:
+            return f"Tool '{tool_name}' not available", True
+        
+        try:
+            print(f"[INFO] Executing tool: {tool_name}")
+            result = await tool.ainvoke(query)
+            return result, False
+        except Exception as e:
+            print(f"[ERROR] Tool execution failed: {e}")
+            return f"Error executing tool: {str(e)}", True
+    
+    def _generate_answer(self, question: str, context: str) -> Tuple[str, bool]:
+        """
+        Generate final answer using retrieved context
         
-        chain = prompt | self.llm | StrOutputParser()
+        Returns:
+            Tuple of (answer or error message, whether generation failed)
+        """
+        chain = get_chain(ANSWER_PROMPT, output_parser=_STR_PARSER, role="generate")
         
         try:
             answer = chain.invoke({"question": question, "context": context})
-            return answer
+            return answer, False
         except Exception as e:
-            return f"Error generating answer: {str(e)}"
+            return f"Error generating answer: {str(e)}", True
+    
+    async def _agenerate_answer(self, question: str, context: str) -> Tuple[str, bool]:
+        """Async version of _generate_answer"""
+        chain = get_chain(ANSWER_PROMPT, output_parser=_STR_PARSER, role="generate")
+        
+        try:
+            answer = await chain.ainvoke({"question": question, "context": context})
+            return answer, False
+        except Exception as e:
+            return f"Error generating answer: {str(e)}", True
+    
+    def _stream_answer(self, question: str, context: str) -> Iterator[str]:
+        """Generate final answer using retrieved context, yielding tokens as the LLM produces them (errors propagate)"""
+        chain = get_chain(ANSWER_PROMPT, output_parser=_STR_PARSER, role="generate")
+        
+        for token in chain.stream({"question": question, "context": context}):
+            if token:
+                yield token
+    
+    def _cached_result(self, question: str, version: tuple) -> Optional[Dict[str, Any]]:
+        """Result of a similar cached question, if any"""
+        hit = self.answer_cache.get(question, version)
+        if hit is None:
+            return None
+        print(f"[CACHE] Answer of \"{hit.question}\" reused (similarity {hit.similarity:.2f})")
+        return {**hit.value, "cached": True}
+    
+    def _finish(
+        self, question: str, answer: str, route: str, context: str, version: tuple, failed: bool = False
+    ) -> Dict[str, Any]:
+        """Build the query result and cache it (unless the tool or the answer generation failed)"""
+        result = {
+            "answer": answer,
+            "route": route,
+            "context": context[:500] + "..." if len(context) > 500 else context
+        }
+        # Failed tools and generations are retried rather than replayed
+        if not failed:
+            self.answer_cache.put(question, result, version)
+        return {**result, "cached": False}
     
     def query(self, question: str) -> Dict[str, Any]:
         """
         Process a query using semantic routing
         
+        Paraphrases of a recently answered question are served from the
+        semantic answer cache without routing or calling a tool.
+        
         Returns:
-            Dict with 'answer', 'route', and 'context'
+            Dict with 'answer', 'route', 'context' and 'cached'
         """
         print(f"\n[QUERY] {question}")
         
+        version = (self.tool_registry.version, get_unified_index().version)
+        cached = self._cached_result(question, version)
+        if cached is not None:
+            return cached
+        
         # Step 1: Route the query
         route_result = self.router.invoke({"question": question})
         selected_route = route_result.datasource
         print(f"[ROUTE] Selected: {selected_route}")
         
         # Step 2: Execute the tool
-        context = self._execute_tool(selected_route, question)
+        context, tool_failed = self._execute_tool(selected_route, question)
         
         # Step 3: Generate answer
-        answer = self._generate_answer(question, context)
+        answer, answer_failed = self._generate_answer(question, context)
         
-        return {
-            "answer": answer,
-            "route": selected_route,
-            "context": context[:500] + "..." if len(context) > 500 else context
-        }
+        return self._finish(question, answer, selected_route, context, version, failed=tool_failed or answer_failed)
+    
+    async def aquery(self, question: str) -> Dict[str, Any]:
+        """
+        Async version of query: routing, the tool call and the answer are awaited
+        on the event loop, so one worker can hold many concurrent queries
+        
+        Returns:
+            Dict with 'answer', 'route', 'context' and 'cached'
+        """
+        print(f"\n[QUERY] {question}")
+        
+        version = (self.tool_registry.version, get_unified_index().version)
+        cached = await asyncio.to_thread(self._cached_result, question, version)
+        if cached is not None:
+            return cached
+        
+        route_result = await self.router.ainvoke({"question": question})
+        selected_route = route_result.datasource
+        print(f"[ROUTE] Selected: {selected_route}")
+        
+        context, tool_failed = await self._aexecute_tool(selected_route, question)
+        answer, answer_failed = await self._agenerate_answer(question, context)
+        
+        return await asyncio.to_thread(
+            self._finish, question, answer, selected_route, context, version, tool_failed or answer_failed
+        )
+    
+    def stream(self, question: str) -> Iterator[Dict[str, Any]]:
+        """
+        Process a query using semantic routing, yielding progress and answer tokens as they happen
+        
+        Yields dicts with an "event" key:
+            - "node": a step finished ("node" is "route" with the selected
+              "route", or "retrieve")
+            - "token": a piece of the answer ("text"), as the LLM produces it
+            - "done": the final "result", as returned by query
+        """
+        print(f"\n[QUERY] {question}")
+        
+        version = (self.tool_registry.version, get_unified_index().version)
+        cached = self._cached_result(question, version)
+        if cached is not None:
+            yield {"event": "token", "text": cached["answer"]}
+            yield {"event": "done", "result": cached}
+            return
+        
+        route_result = self.router.invoke({"question": question})
+        selected_route = route_result.datasource
+        print(f"[ROUTE] Selected: {selected_route}")
+        yield {"event": "node", "node": "route", "route": selected_route}
+        
+        context, failed = self._execute_tool(selected_route, question)
+        yield {"event": "node", "node": "retrieve"}
+        
+        tokens = []
+        try:
+            for token in self._stream_answer(question, context):
+                tokens.append(token)
+                yield {"event": "token", "text": token}
+        except Exception as e:
+            # The partial answer stays on screen but is never cached
+            failed = True
+            error = f"Error generating answer: {str(e)}"
+            tokens.append(error)
+            yield {"event": "token", "text": error}
+        
+        result = self._finish(question, "".join(tokens), selected_route, context, version, failed=failed)
+        yield {"event": "done", "result": result}
     
     def get_available_routes(self):
         """Get list of available routes"""
         return list(self.tools.keys())
+    
+    def get_pending_route_count(self) -> int:
+        """Get the number of routes whose tool is still being built in the background"""
+        return self.tool_registry.pending_count()
 
 
 def main():
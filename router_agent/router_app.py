@@ -72,6 +72,8 @@ def get_agent():
 try:
     agent = get_agent()
     st.sidebar.success(f"✅ {len(agent.get_available_routes())} routes ready")
+    if agent.get_pending_route_count():
+        st.sidebar.info(f"⏳ {agent.get_pending_route_count()} routes indexing in the background")
 except Exception as e:
     st.error(f"Failed to initialize agent: {e}")
     st.stop()
@@ -116,6 +118,8 @@ if prompt := st.chat_input("Ask me anything..."):
                     f'<span class="route-badge route-{route_class}">📍 {result["route"]}</span>',
                     unsafe_allow_html=True
                 )
+                if result.get("cached"):
+                    st.caption("⚡ Answered from cache")
                 
                 # Show context in expander
                 with st.expander("📄 Retrieved Context"):
@@ -2,5 +2,6 @@
 Agent package - High-level agent interface
 """
 from .agent import AgenticRAGAgent, create_agent
+from .answer_cache import AnswerCacheHit, SemanticAnswerCache
 
-__all__ = ["AgenticRAGAgent", "create_agent"]
+__all__ = ["AgenticRAGAgent", "create_agent", "AnswerCacheHit", "SemanticAnswerCache"]
@@ -2,49 +2,77 @@
 Agent Module - Agentic RAG with custom graph architecture
 Following agentic_rag_with_multiple_tools.ipynb
 """
-from typing import List
-from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
+import asyncio
+import threading
+from typing import Iterator, List, Optional
+from langchain_core.messages import HumanMessage, AIMessage, AIMessageChunk, ToolMessage
 
-from configuration.configuration import PDF_FILE, TEXT_FILE, URLS
+from configuration.configuration import PDF_FILE, TEXT_FILE, URLS, CORPUS_DIR
+from configuration.embeddings import query_cache_stats
+from configuration.llm import llm_cache_stats
+from src.agent.answer_cache import SemanticAnswerCache
 from src.graph.graph import create_graph
+from src.retrieval import get_unified_index
 from src.tools import (
+    ToolRegistry,
+    ToolSpec,
     create_wikipedia_tool,
     create_arxiv_tool,
     create_duckgo_search_tool,
     create_url_retriever_tool,
     create_pdf_retriever_tool,
     create_text_retriever_tool,
+    create_corpus_retriever_tool,
 )
 
+NO_RESPONSE = "Sorry, I couldn't generate a response."
+
 
 class AgenticRAGAgent:
     """Agentic RAG agent with custom graph workflow"""
     
     def __init__(self):
         """Initialize the agent with tools and custom graph"""
-        self.tools = self._initialize_tools()
-        self.graph = create_graph(self.tools)
+        self.tool_registry = self._initialize_tools()
+        self._graph = None
+        self._graph_version = -1
+        self._graph_lock = threading.Lock()
+        self.answer_cache = SemanticAnswerCache()
         
-    def _initialize_tools(self) -> List:
-        """Initialize all available tools"""
+    def _initialize_tools(self) -> ToolRegistry:
+        """Start building all available tools (retriever tools finish in the background)"""
         print("[INFO] Initializing tools...")
         
-        tools_raw = [
-            create_url_retriever_tool(URLS),
-            create_pdf_retriever_tool(PDF_FILE),
-            create_text_retriever_tool(TEXT_FILE),
-            create_wikipedia_tool(),
-            create_arxiv_tool(),
-            create_duckgo_search_tool()
-        ]
-        
-        tools = [t for t in tools_raw if t is not None]
-        print(f"[INFO] {len(tools)} tools initialized successfully")
-        
-        if not tools:
-            raise RuntimeError("No tools were initialized!")
+        registry = ToolRegistry([
+            ToolSpec("langgraph_docs_search", lambda: create_url_retriever_tool(URLS), indexed=True),
+            ToolSpec("pdf_search", lambda: create_pdf_retriever_tool(PDF_FILE), indexed=True),
+            ToolSpec("about_abhiram_search", lambda: create_text_retriever_tool(TEXT_FILE), indexed=True),
+            ToolSpec("knowledge_base_search", lambda: create_corpus_retriever_tool(CORPUS_DIR), indexed=True),
+            ToolSpec("wikipedia", create_wikipedia_tool),
+            ToolSpec("arxiv", create_arxiv_tool),
+            ToolSpec("duckduckgo_search", create_duckgo_search_tool),
+        ]).start()
         
-        return tools
+        print(f"[INFO] {len(registry.ready_tools())} tools ready, {registry.pending_count()} loading in the background")
+        return registry
+    
+    @property
+    def tools(self) -> List:
+        """Tools that are ready to use"""
+        return list(self.tool_registry.ready_tools().values())
+    
+    @property
+    def graph(self):
+        """Graph bound to the ready tools, recompiled when more tools become ready"""
+        with self._graph_lock:
+            if self._graph_version != self.tool_registry.version:
+                if not self.tool_registry.ready_tools() and not self.tool_registry.wait_for_any():
+                    raise RuntimeError("No tools were initialized!")
+                # Read the version first so a tool joining during compilation triggers another rebuild
+                version = self.tool_registry.version
+                self._graph = create_graph(self.tools)
+                self._graph_version = version
+            return self._graph
     
     def _extract_response(self, messages: list) -> str:
         """
@@ -67,34 +95,129 @@ class AgenticRAGAgent:
                     if content_stripped:
                         return content_stripped
         
-        return "Sorry, I couldn't generate a response."
+        return NO_RESPONSE
+    
+    def _answer_version(self) -> tuple:
+        """Version of the tools and local index that answers are built from"""
+        return self.tool_registry.version, get_unified_index().version
     
     def query(self, question: str) -> str:
         """
         Process a query and return the response
         """
+        return self.query_with_details(question)[0]
+    
+    def query_with_details(self, question: str) -> tuple[str, dict]:
+        """
+        Process a query and return response with execution details
+        
+        Paraphrases of a recently answered question are served from the
+        semantic answer cache without running the graph.
+        
+        Returns:
+            Tuple of (response, details_dict)
+        """
+        version = self._answer_version()
+        cached = self._cached_answer(question, version)
+        if cached is not None:
+            return cached
+        
         result = self.graph.invoke(
             {"messages": [HumanMessage(content=question)]},
             config={"recursion_limit": 25}
         )
         
-        messages = result.get("messages", [])
-        return self._extract_response(messages)
+        return self._finish(question, result.get("messages", []), version)
     
-    def query_with_details(self, question: str) -> tuple[str, dict]:
+    async def aquery(self, question: str) -> str:
         """
-        Process a query and return response with execution details
+        Async version of query
+        """
+        return (await self.aquery_with_details(question))[0]
+    
+    async def aquery_with_details(self, question: str) -> tuple[str, dict]:
+        """
+        Async version of query_with_details, running the graph with ainvoke
+        
+        LLM calls, retrieval and tools are awaited on the event loop, so one
+        worker can hold many concurrent queries. The graph compilation and the
+        answer cache (which embeds the question) run in a worker thread.
         
         Returns:
             Tuple of (response, details_dict)
         """
-        result = self.graph.invoke(
+        version = await asyncio.to_thread(self._answer_version)
+        cached = await asyncio.to_thread(self._cached_answer, question, version)
+        if cached is not None:
+            return cached
+        
+        graph = await asyncio.to_thread(lambda: self.graph)
+        result = await graph.ainvoke(
             {"messages": [HumanMessage(content=question)]},
             config={"recursion_limit": 25}
         )
         
-        messages = result.get("messages", [])
+        return await asyncio.to_thread(self._finish, question, result.get("messages", []), version)
+    
+    def stream(self, question: str) -> Iterator[dict]:
+        """
+        Process a query, yielding progress and answer tokens as they happen
         
+        Yields dicts with an "event" key:
+            - "node": a graph node finished ("node" holds its name)
+            - "token": a piece of the answer ("text"), streamed from the generate
+              node as the LLM produces it
+            - "done": the final "response" and "details", as returned by
+              query_with_details
+        """
+        version = self._answer_version()
+        cached = self._cached_answer(question, version)
+        if cached is not None:
+            yield {"event": "token", "text": cached[0]}
+            yield {"event": "done", "response": cached[0], "details": cached[1]}
+            return
+        
+        messages = [HumanMessage(content=question)]
+        streamed = False
+        for mode, payload in self.graph.stream(
+            {"messages": messages},
+            config={"recursion_limit": 25},
+            stream_mode=["updates", "messages"],
+        ):
+            if mode == "messages":
+                # Only chunks of the generate node's LLM call are answer tokens
+                chunk, metadata = payload
+                if isinstance(chunk, AIMessageChunk) and metadata.get("langgraph_node") == "generate" and chunk.content:
+                    streamed = True
+                    yield {"event": "token", "text": chunk.content}
+                continue
+            for node, update in payload.items():
+                messages.extend((update or {}).get("messages", []))
+                yield {"event": "node", "node": node}
+        
+        response, details = self._finish(question, messages, version)
+        if not streamed:
+            # The agent answered directly, or the answer came from the LLM cache
+            yield {"event": "token", "text": response}
+        yield {"event": "done", "response": response, "details": details}
+    
+    def _cached_answer(self, question: str, version: tuple) -> Optional[tuple[str, dict]]:
+        """Answer and details of a similar cached question, if any"""
+        hit = self.answer_cache.get(question, version)
+        if hit is None:
+            return None
+        print(f"[CACHE] Answer of \"{hit.question}\" reused (similarity {hit.similarity:.2f})")
+        response, details = hit.value
+        return response, {
+            **details,
+            "query_cache": query_cache_stats(),
+            "llm_cache": llm_cache_stats(),
+            "answer_cache": {"hit": True, "question": hit.question, "similarity": hit.similarity,
+                             **self.answer_cache.stats()},
+        }
+    
+    def _finish(self, question: str, messages: list, version: tuple) -> tuple[str, dict]:
+        """Extract the response and execution details of a graph run and cache the answer"""
         # Extract tools used
         tools_used = []
         for msg in messages:
@@ -109,14 +232,24 @@ class AgenticRAGAgent:
         
         details = {
             "tools_used": tools_used,
-            "total_messages": len(messages)
+            "total_messages": len(messages),
+            "query_cache": query_cache_stats(),
+            "llm_cache": llm_cache_stats(),
         }
         
+        if response != NO_RESPONSE:
+            self.answer_cache.put(question, (response, details), version)
+        details = {**details, "answer_cache": {"hit": False, **self.answer_cache.stats()}}
+        
         return response, details
     
     def get_tool_count(self) -> int:
         """Get the number of initialized tools"""
         return len(self.tools)
+    
+    def get_pending_tool_count(self) -> int:
+        """Get the number of tools still being built in the background"""
+        return self.tool_registry.pending_count()
 
 
 def create_agent() -> AgenticRAGAgent:
@@ -0,0 +1,184 @@
+"""
+Answer Cache - Semantic cache of agent answers for repeated and paraphrased questions
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from configuration.configuration import ANSWER_CACHE_SIZE, ANSWER_CACHE_THRESHOLD, ANSWER_CACHE_TTL
+from configuration.embeddings import get_embeddings, normalize_query
+
+
+@dataclass
+class AnswerCacheHit:
+    """A cached answer and how closely its question matched"""
+    value: Any
+    question: str
+    similarity: float
+
+
+class SemanticAnswerCache:
+    """
+    Bounded, thread-safe LRU cache of answers, looked up by question similarity
+
+    Every question is embedded (through the shared query embedding cache, so the
+    retrievers reuse the vector on a miss) and compared with the cached questions
+    in one matrix product; the closest one at or above ``threshold`` returns its
+    answer. Entries belong to a version of the sources the answers were built
+    from: when the version changes (a tool becomes ready or an index is rebuilt)
+    every entry is dropped. Entries older than ``ttl`` seconds are not reused.
+    """
+
+    def __init__(
+        self,
+        embeddings: Optional[Embeddings] = None,
+        threshold: float = ANSWER_CACHE_THRESHOLD,
+        max_size: int = ANSWER_CACHE_SIZE,
+        ttl: float = ANSWER_CACHE_TTL,
+    ):
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        # Version of the entries (set by the first lookup or store)
+        self._version: Hashable = None
+        # Unit question vectors of the entries, in entry order (rebuilt lazily after changes)
+        self._matrix: Optional[np.ndarray] = None
+        self._keys: list = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether answers are cached at all"""
+        return self.max_size > 0
+
+    def _embed(self, question: str) -> Optional[np.ndarray]:
+        try:
+            embeddings = self.embeddings or get_embeddings()
+            vector = np.asarray(embeddings.embed_query(question), dtype=np.float32)
+        except Exception as e:
+            print(f"✗ Answer cache could not embed the question: {e}")
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def _check_version(self, version: Hashable):
+        if version != self._version:
+            self.expirations += len(self._entries)
+            self._entries.clear()
+            self._matrix = None
+            self._version = version
+
+    def get(self, question: str, version: Hashable = None) -> Optional[AnswerCacheHit]:
+        """
+        Look up the answer of the most similar cached question
+
+        Args:
+            question: Incoming question
+            version: Version of the sources answers depend on
+
+        Returns:
+            AnswerCacheHit, or None if no cached question is similar enough
+        """
+        if not self.enabled:
+            return None
+        key = normalize_query(question)
+        with self._lock:
+            self._check_version(version)
+            if key in self._entries and not self._expire(key):
+                return self._hit(key, 1.0)
+            if not self._entries:
+                self.misses += 1
+                return None
+
+        vector = self._embed(question)
+        with self._lock:
+            self._check_version(version)
+            if vector is None or not self._entries:
+                self.misses += 1
+                return None
+            if self._matrix is None:
+                self._keys = list(self._entries)
+                self._matrix = np.stack([self._entries[k][0] for k in self._keys])
+            keys = self._keys
+            similarities = self._matrix @ vector
+            # Closest unexpired question; expired ones found on the way are dropped
+            for best in np.argsort(-similarities):
+                if similarities[best] < self.threshold:
+                    break
+                if not self._expire(keys[best]):
+                    return self._hit(keys[best], float(similarities[best]))
+            self.misses += 1
+            return None
+
+    def _expire(self, key: str) -> bool:
+        """Drop an entry older than the TTL; True if it was dropped"""
+        if time.time() - self._entries[key][2] <= self.ttl:
+            return False
+        del self._entries[key]
+        self._matrix = None
+        self.expirations += 1
+        return True
+
+    def _hit(self, key: str, similarity: float) -> AnswerCacheHit:
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return AnswerCacheHit(value=self._entries[key][1], question=key, similarity=similarity)
+
+    def put(self, question: str, value: Any, version: Hashable = None):
+        """
+        Store the answer to a question, evicting the least recently used entries
+
+        Args:
+            question: Answered question
+            value: Answer (and whatever details should be returned with it)
+            version: Version of the sources read before answering; answers built
+                from a version that has since been superseded are not stored
+        """
+        if not self.enabled:
+            return
+        vector = self._embed(question)
+        if vector is None:
+            return
+        key = normalize_query(question)
+        with self._lock:
+            if self._version is not None and version != self._version:
+                return
+            self._version = version
+            self._entries[key] = (vector, value, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._matrix = None
+
+    def clear(self):
+        """Drop every cached answer and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._matrix = None
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> dict:
+        """Size, hit/miss/eviction/expiration counts and hit rate"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
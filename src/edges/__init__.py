@@ -1,6 +1,7 @@
 """
 Edges package - Conditional routing logic
 """
-from .edges import grade_documents
+from .edges import grade_documents, agrade_documents
+from .calibration import calibrate_thresholds, load_grades, log_grade, top_similarity
 
-__all__ = ["grade_documents"]
+__all__ = ["grade_documents", "agrade_documents", "calibrate_thresholds", "load_grades", "log_grade", "top_similarity"]
@@ -0,0 +1,122 @@
+"""
+Grade Calibration - Retrieval score thresholds learned from logged LLM relevance grades
+"""
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+from configuration.configuration import GRADE_CALIBRATION_LOG
+from src.retrieval import SIMILARITY_KEY
+
+_LOG_LOCK = threading.Lock()
+
+
+def top_similarity(artifact) -> Optional[float]:
+    """
+    Highest query similarity among the documents of a retriever tool artifact
+
+    Returns:
+        The top score, or None when the tool returned no scored documents
+    """
+    if not isinstance(artifact, (list, tuple)):
+        return None
+    scores = [
+        doc.metadata[SIMILARITY_KEY]
+        for doc in artifact
+        if isinstance(doc, Document) and SIMILARITY_KEY in doc.metadata
+    ]
+    return max(scores) if scores else None
+
+
+def log_grade(score: float, relevant: bool, tool: str = "", path: Path = GRADE_CALIBRATION_LOG):
+    """Append one LLM relevance grade and the top retrieval score it was given for"""
+    record = {"score": score, "relevant": relevant, "tool": tool, "time": time.time()}
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with _LOG_LOCK, open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+    except OSError as e:
+        print(f"✗ Failed to log grade: {e}")
+
+
+def load_grades(path: Path = GRADE_CALIBRATION_LOG) -> List[Tuple[float, bool]]:
+    """Read the logged (score, relevant) grades"""
+    grades = []
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    grades.append((float(record["score"]), bool(record["relevant"])))
+                except (ValueError, KeyError, TypeError):
+                    continue
+    except OSError:
+        pass
+    return grades
+
+
+def calibrate_thresholds(
+    grades: Iterable[Tuple[float, bool]],
+    target_precision: float = 0.95,
+    min_support: int = 10,
+) -> Optional[Tuple[float, float]]:
+    """
+    Derive the reject and accept scores from logged grades
+
+    The accept score is the lowest score above which at least
+    ``target_precision`` of the graded retrievals were relevant; the reject
+    score is the highest score below which at least that share were not.
+
+    Args:
+        grades: (top score, LLM said relevant) pairs
+        target_precision: Agreement with the LLM grader required on either side
+        min_support: Minimum number of grades on a side of a threshold
+
+    Returns:
+        Tuple of (reject_score, accept_score), or None with too few grades
+    """
+    grades: Sequence[Tuple[float, bool]] = sorted(grades)
+    if len(grades) < 2 * min_support:
+        return None
+
+    accept = None
+    relevant_above = 0
+    for i in range(len(grades) - 1, -1, -1):
+        relevant_above += grades[i][1]
+        support = len(grades) - i
+        if support >= min_support and relevant_above / support >= target_precision:
+            accept = grades[i][0]
+
+    reject = None
+    irrelevant_below = 0
+    for i, (score, relevant) in enumerate(grades):
+        irrelevant_below += not relevant
+        support = i + 1
+        if support >= min_support and irrelevant_below / support >= target_precision:
+            # Strictly below the next score, so the rejected band covers this grade
+            reject = grades[i + 1][0] if i + 1 < len(grades) else score
+
+    if accept is None or reject is None or reject > accept:
+        return None
+    return reject, accept
+
+
+def main():
+    """Print thresholds calibrated from the grade log"""
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else GRADE_CALIBRATION_LOG
+    grades = load_grades(path)
+    thresholds = calibrate_thresholds(grades)
+    if thresholds is None:
+        print(f"Not enough consistent grades to calibrate ({len(grades)} logged in {path})")
+        return
+    reject, accept = thresholds
+    print(f"{len(grades)} grades: GRADE_REJECT_SCORE={reject:.3f} GRADE_ACCEPT_SCORE={accept:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,13 +7,74 @@ from langchain_core.messages import HumanMessage
 from langchain_core.prompts import PromptTemplate
 from pydantic import BaseModel, Field
 
-from configuration.llm import get_llm
+from configuration.configuration import GRADE_ACCEPT_SCORE, GRADE_REJECT_SCORE
+from configuration.llm import get_chain
+from src.edges.calibration import log_grade, top_similarity
+
+
+# Data model for grading
+class Grade(BaseModel):
+    """Binary score for relevance check."""
+    binary_score: str = Field(description="Relevance score 'yes' or 'no'")
+
+
+GRADE_PROMPT = PromptTemplate(
+    template="""You are a grader assessing relevance of a retrieved document to a user question.
+    Here is the retrieved document: \n\n {context} \n\n
+    Here is the user question: {question} \n
+    If the document contains keyword(s) or semantic meaning related to the user question, grade it as relevant.
+    Give a binary score 'yes' or 'no' score to indicate whether the document is relevant to the question.""",
+    input_variables=["context", "question"],
+)
+
+
+def _score_decision(last_message):
+    """
+    Decision from the retrieval scores alone
+
+    Returns:
+        Tuple of (decision or None when the LLM has to grade, top score or None)
+    """
+    top_score = top_similarity(getattr(last_message, "artifact", None))
+    if top_score is not None:
+        if top_score >= GRADE_ACCEPT_SCORE:
+            print(f"---DECISION: DOCS RELEVANT (score {top_score:.2f}, LLM grading skipped)---")
+            return "generate", top_score
+        if top_score < GRADE_REJECT_SCORE:
+            print(f"---DECISION: DOCS NOT RELEVANT (score {top_score:.2f}, LLM grading skipped)---")
+            return "rewrite", top_score
+    return None, top_score
+
+
+def _grade_inputs(messages) -> dict:
+    # Get the last human message (question)
+    user_messages = [m for m in messages if isinstance(m, HumanMessage)]
+    question = user_messages[-1].content if user_messages else messages[0].content
+    return {"question": question, "context": messages[-1].content}
+
+
+def _llm_decision(score: str, top_score, last_message) -> Literal["generate", "rewrite"]:
+    if top_score is not None:
+        # Grades of the uncertain band calibrate GRADE_ACCEPT_SCORE / GRADE_REJECT_SCORE
+        log_grade(top_score, score == "yes", getattr(last_message, "name", "") or "")
+
+    if score == "yes":
+        print("---DECISION: DOCS RELEVANT---")
+        return "generate"
+    else:
+        print("---DECISION: DOCS NOT RELEVANT---")
+        return "rewrite"
 
 
 def grade_documents(state) -> Literal["generate", "rewrite"]:
     """
     Determines whether the retrieved documents are relevant to the question.
 
+    Retriever tools attach the query similarity of every document to the tool
+    message artifact: a top score at or above GRADE_ACCEPT_SCORE goes straight
+    to generate and one below GRADE_REJECT_SCORE straight to rewrite. The LLM
+    grader only runs for scores in between and for unscored tools.
+
     Args:
         state: The current state with messages
 
@@ -22,42 +83,31 @@ def grade_documents(state) -> Literal["generate", "rewrite"]:
     """
     print("---CHECK RELEVANCE---")
 
-    # Data model for grading
-    class Grade(BaseModel):
-        """Binary score for relevance check."""
-        binary_score: str = Field(description="Relevance score 'yes' or 'no'")
+    messages = state["messages"]
+    last_message = messages[-1]
 
-    # LLM with structured output
-    llm_with_tool = get_llm().with_structured_output(Grade)
+    decision, top_score = _score_decision(last_message)
+    if decision is not None:
+        return decision
 
-    # Prompt
-    prompt = PromptTemplate(
-        template="""You are a grader assessing relevance of a retrieved document to a user question.
-        Here is the retrieved document: \n\n {context} \n\n
-        Here is the user question: {question} \n
-        If the document contains keyword(s) or semantic meaning related to the user question, grade it as relevant.
-        Give a binary score 'yes' or 'no' score to indicate whether the document is relevant to the question.""",
-        input_variables=["context", "question"],
-    )
+    # Chain (built once and shared by every grading call)
+    chain = get_chain(GRADE_PROMPT, output_schema=Grade, role="grade")
 
-    # Chain
-    chain = prompt | llm_with_tool
+    scored_result = chain.invoke(_grade_inputs(messages))
+    return _llm_decision(scored_result.binary_score, top_score, last_message)
 
-    messages = state["messages"]
-    last_message = messages[-1]
 
-    # Get the last human message (question)
-    user_messages = [m for m in messages if isinstance(m, HumanMessage)]
-    question = user_messages[-1].content if user_messages else messages[0].content
+async def agrade_documents(state) -> Literal["generate", "rewrite"]:
+    """Async version of grade_documents, awaiting the LLM grader instead of blocking a thread"""
+    print("---CHECK RELEVANCE---")
 
-    docs = last_message.content
+    messages = state["messages"]
+    last_message = messages[-1]
 
-    scored_result = chain.invoke({"question": question, "context": docs})
-    score = scored_result.binary_score
+    decision, top_score = _score_decision(last_message)
+    if decision is not None:
+        return decision
 
-    if score == "yes":
-        print("---DECISION: DOCS RELEVANT---")
-        return "generate"
-    else:
-        print("---DECISION: DOCS NOT RELEVANT---")
-        return "rewrite"
+    chain = get_chain(GRADE_PROMPT, output_schema=Grade, role="grade")
+    scored_result = await chain.ainvoke(_grade_inputs(messages))
+    return _llm_decision(scored_result.binary_score, top_score, last_message)
@@ -2,12 +2,15 @@
 Graph Compilation - Build and compile the LangGraph workflow
 Following architecture from agentic_rag_with_multiple_tools.ipynb
 """
+from functools import partial
+
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import END, StateGraph, START
 from langgraph.prebuilt import ToolNode, tools_condition
 
 from src.state.state_graph import AgentState
-from src.nodes.nodes import agent, generate, rewrite
-from src.edges.edges import grade_documents
+from src.nodes.nodes import agent, aagent, generate, agenerate, rewrite, arewrite
+from src.edges.edges import grade_documents, agrade_documents
 
 
 def create_graph(tools: list):
@@ -21,6 +24,9 @@ def create_graph(tools: list):
     - Generate creates answer from relevant docs
     - Rewrite reformulates query if docs not relevant
     
+    Every node and edge has a sync and an async implementation, so the graph
+    runs with invoke()/stream() as well as ainvoke()/astream().
+    
     Args:
         tools: List of available tools
         
@@ -31,11 +37,11 @@ def create_graph(tools: list):
     workflow = StateGraph(AgentState)
     
     # Define the nodes we will cycle between
-    workflow.add_node("agent", lambda state: agent(state, tools))
+    workflow.add_node("agent", RunnableLambda(partial(agent, tools=tools), afunc=partial(aagent, tools=tools)))
     retrieve = ToolNode(tools)
     workflow.add_node("retrieve", retrieve)
-    workflow.add_node("rewrite", rewrite)
-    workflow.add_node("generate", generate)
+    workflow.add_node("rewrite", RunnableLambda(rewrite, afunc=arewrite))
+    workflow.add_node("generate", RunnableLambda(generate, afunc=agenerate))
     
     # Set entry point
     workflow.add_edge(START, "agent")
@@ -53,7 +59,11 @@ def create_graph(tools: list):
     # After retrieval, grade documents
     workflow.add_conditional_edges(
         "retrieve",
-        grade_documents,
+        RunnableLambda(grade_documents, afunc=agrade_documents),
+        {
+            "generate": "generate",
+            "rewrite": "rewrite",
+        },
     )
     
     # Connect generate and rewrite to end/agent
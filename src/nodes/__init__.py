@@ -1,6 +1,6 @@
 """
 Nodes package - Graph node functions
 """
-from .nodes import agent, generate, rewrite
+from .nodes import agent, generate, rewrite, aagent, agenerate, arewrite
 
-__all__ = ["agent", "generate", "rewrite"]
+__all__ = ["agent", "generate", "rewrite", "aagent", "agenerate", "arewrite"]
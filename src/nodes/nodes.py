@@ -6,7 +6,39 @@ from langchain_core.messages import HumanMessage, AIMessage
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import PromptTemplate
 
-from configuration.llm import get_llm
+from configuration.llm import get_llm, get_llm_with_tools, get_chain
+
+# RAG Prompt
+GENERATE_PROMPT = PromptTemplate(
+    template="""You are an assistant for question-answering tasks. Use the following pieces of retrieved context to answer the question. If you don't know the answer, just say that you don't know. Use three sentences maximum and keep the answer concise.
+
+Question: {question}
+
+Context: {context}
+
+Answer:""",
+    input_variables=["question", "context"],
+)
+_STR_PARSER = StrOutputParser()
+
+
+def _question(messages) -> str:
+    """Content of the last user message (the question being answered)"""
+    user_messages = [m for m in messages if isinstance(m, HumanMessage)]
+    return user_messages[-1].content if user_messages else messages[0].content
+
+
+def _rewrite_messages(question: str) -> list:
+    return [
+        HumanMessage(
+            content=f"""Look at the input and try to reason about the underlying semantic intent / meaning.
+    Here is the initial question:
+    \n ------- \n
+    {question} 
+    \n ------- \n
+    Formulate an improved question: """,
+        )
+    ]
 
 
 def agent(state, tools):
@@ -23,15 +55,28 @@ def agent(state, tools):
     """
     print("---CALL AGENT---")
     messages = state["messages"]
-    model = get_llm().bind_tools(tools)
+    # Bound once per tool set, not on every turn
+    model = get_llm_with_tools(tools, role="agent")
     response = model.invoke(messages)
     return {"messages": [response]}
 
 
+async def aagent(state, tools):
+    """Async version of agent, awaiting the LLM instead of blocking a thread"""
+    print("---CALL AGENT---")
+    model = get_llm_with_tools(tools, role="agent")
+    response = await model.ainvoke(state["messages"])
+    return {"messages": [response]}
+
+
 def generate(state):
     """
     Generate answer using retrieved documents
 
+    The chain is invoked rather than streamed, so its LLM call still goes
+    through the response cache; graph runs with stream_mode="messages" (see
+    AgenticRAGAgent.stream) receive its tokens as they are generated.
+
     Args:
         state: The current state with messages
 
@@ -42,33 +87,29 @@ def generate(state):
     messages = state["messages"]
 
     # Get question from user messages
-    user_messages = [m for m in messages if isinstance(m, HumanMessage)]
-    question = user_messages[-1].content if user_messages else messages[0].content
+    question = _question(messages)
 
     # Get retrieved documents from last message
     last_message = messages[-1]
     docs = last_message.content
 
-    # RAG Prompt
-    prompt = PromptTemplate(
-        template="""You are an assistant for question-answering tasks. Use the following pieces of retrieved context to answer the question. If you don't know the answer, just say that you don't know. Use three sentences maximum and keep the answer concise.
-
-Question: {question}
-
-Context: {context}
-
-Answer:""",
-        input_variables=["question", "context"],
-    )
-
-    # Chain
-    rag_chain = prompt | get_llm() | StrOutputParser()
+    # Chain (built once and shared by every generate call)
+    rag_chain = get_chain(GENERATE_PROMPT, output_parser=_STR_PARSER, role="generate")
 
     # Generate
     response = rag_chain.invoke({"context": docs, "question": question})
     return {"messages": [AIMessage(content=response)]}
 
 
+async def agenerate(state):
+    """Async version of generate, awaiting the LLM instead of blocking a thread"""
+    print("---GENERATE---")
+    messages = state["messages"]
+    rag_chain = get_chain(GENERATE_PROMPT, output_parser=_STR_PARSER, role="generate")
+    response = await rag_chain.ainvoke({"context": messages[-1].content, "question": _question(messages)})
+    return {"messages": [AIMessage(content=response)]}
+
+
 def rewrite(state):
     """
     Transform the query to produce a better question.
@@ -83,19 +124,14 @@ def rewrite(state):
     messages = state["messages"]
 
     # Get question
-    user_messages = [m for m in messages if isinstance(m, HumanMessage)]
-    question = user_messages[-1].content if user_messages else messages[0].content
+    question = _question(messages)
+
+    response = get_llm(role="rewrite").invoke(_rewrite_messages(question))
+    return {"messages": [response]}
 
-    msg = [
-        HumanMessage(
-            content=f"""Look at the input and try to reason about the underlying semantic intent / meaning.
-    Here is the initial question:
-    \n ------- \n
-    {question} 
-    \n ------- \n
-    Formulate an improved question: """,
-        )
-    ]
 
-    response = get_llm().invoke(msg)
+async def arewrite(state):
+    """Async version of rewrite, awaiting the LLM instead of blocking a thread"""
+    print("---TRANSFORM QUERY---")
+    response = await get_llm(role="rewrite").ainvoke(_rewrite_messages(_question(state["messages"])))
     return {"messages": [response]}
@@ -0,0 +1,77 @@
+"""
+Retrieval package - Shared indexing infrastructure for the retriever tools
+"""
+from .ann import INDEX_TYPES, VECTOR_STORAGES, TuneResult, apply_index_type, autotune_index, build_index
+from .bm25 import BM25Index, reciprocal_rank_fusion, tokenize
+from .content_extract import ContentSection, ExtractedContent, extract_main_content
+from .corpus_loader import fingerprint_corpus, iter_corpus_documents, list_corpus_files
+from .dedup import NearDuplicateFilter
+from .docstore import MmapDocstore
+from .embedding_store import EmbeddingStore, get_embedding_store
+from .encoder import BatchEncoder, get_batch_encoder
+from .index_cache import (
+    hash_file,
+    hash_documents,
+    chunk_id,
+    index_cache_key,
+    load_or_build_vectorstore,
+    load_or_build_lexical_index,
+)
+from .parallel import iter_process_map
+from .pdf_pipeline import PDF_PARSERS, get_pdf_parser, iter_pdf_pages, register_pdf_parser
+from .splitter import TokenAwareTextSplitter, benchmark_splitters, create_text_splitter, get_token_counter
+from .unified_index import (
+    SIMILARITY_KEY,
+    UnifiedIndex,
+    SourceRetriever,
+    build_unified_index,
+    get_unified_index,
+)
+from .web_fetch import FetchResult, fetch_urls, load_web_documents
+
+__all__ = [
+    "INDEX_TYPES",
+    "VECTOR_STORAGES",
+    "TuneResult",
+    "apply_index_type",
+    "autotune_index",
+    "build_index",
+    "BM25Index",
+    "reciprocal_rank_fusion",
+    "tokenize",
+    "ContentSection",
+    "ExtractedContent",
+    "extract_main_content",
+    "fingerprint_corpus",
+    "iter_corpus_documents",
+    "list_corpus_files",
+    "NearDuplicateFilter",
+    "MmapDocstore",
+    "EmbeddingStore",
+    "get_embedding_store",
+    "BatchEncoder",
+    "get_batch_encoder",
+    "hash_file",
+    "hash_documents",
+    "chunk_id",
+    "index_cache_key",
+    "load_or_build_vectorstore",
+    "load_or_build_lexical_index",
+    "iter_process_map",
+    "PDF_PARSERS",
+    "get_pdf_parser",
+    "iter_pdf_pages",
+    "register_pdf_parser",
+    "TokenAwareTextSplitter",
+    "benchmark_splitters",
+    "create_text_splitter",
+    "get_token_counter",
+    "SIMILARITY_KEY",
+    "UnifiedIndex",
+    "SourceRetriever",
+    "build_unified_index",
+    "get_unified_index",
+    "FetchResult",
+    "fetch_urls",
+    "load_web_documents",
+]
@@ -0,0 +1,337 @@
+"""
+ANN Indexes - Flat / HNSW / IVF FAISS indexes with compressed vector storage
+and latency-target autotuning
+"""
+import math
+import time
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+import faiss
+import numpy as np
+
+from configuration.configuration import (
+    RETRIEVER_K,
+    ANN_TARGET_P95_MS,
+    ANN_MIN_RECALL,
+    ANN_TUNE_SAMPLE_SIZE,
+    HNSW_M,
+    VECTOR_STORAGE,
+    PQ_M,
+)
+
+INDEX_TYPES = ("flat", "hnsw", "ivf")
+VECTOR_STORAGES = ("float32", "float16", "int8", "pq")
+
+# Candidate values tried by the autotuner, cheapest first
+HNSW_EF_SEARCH_CANDIDATES = (16, 32, 64, 128, 256, 512)
+IVF_NPROBE_CANDIDATES = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+# FAISS recommends roughly 39 training points per IVF list / PQ centroid
+IVF_MIN_POINTS_PER_LIST = 39
+PQ_MIN_TRAINING_POINTS = 39 * 256
+
+
+@dataclass
+class TuneResult:
+    """Search parameter chosen for an index and the quality it measured"""
+    index_type: str
+    storage: str = "float32"
+    bytes_per_vector: int = 0
+    param: Optional[str] = None
+    value: Optional[int] = None
+    recall: float = 1.0
+    p95_ms: float = 0.0
+    met_target: bool = True
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def reconstruct_vectors(index: faiss.Index) -> np.ndarray:
+    """Get every stored vector of an index, in id order"""
+    if index.ntotal == 0:
+        return np.zeros((0, index.d), dtype=np.float32)
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.make_direct_map()
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def is_lossless(index: faiss.Index) -> bool:
+    """Whether an index stores the original float32 vectors"""
+    return isinstance(index, (faiss.IndexFlat, faiss.IndexHNSWFlat, faiss.IndexIVFFlat))
+
+
+def to_flat_index(index: faiss.Index) -> faiss.Index:
+    """
+    Copy any index into a new exact IndexFlatL2 holding the same vectors
+
+    The copy is always a fresh, writable index (memory-mapped indexes must not be
+    modified). For compressed indexes the vectors are the decoded approximations.
+    """
+    flat = faiss.IndexFlatL2(index.d)
+    flat.add(reconstruct_vectors(index))
+    return flat
+
+
+def ivf_nlist(count: int) -> int:
+    """Number of IVF lists for a corpus size (0 when the corpus is too small for IVF)"""
+    nlist = min(int(4 * math.sqrt(count)), count // IVF_MIN_POINTS_PER_LIST)
+    return nlist if nlist >= 2 else 0
+
+
+def pq_subquantizers(d: int, pq_m: int = PQ_M) -> int:
+    """Largest number of PQ sub-quantizers not above pq_m that divides the dimension"""
+    return next(m for m in range(min(pq_m, d), 0, -1) if d % m == 0)
+
+
+def resolve_storage(storage: str, count: int) -> str:
+    """Storage actually used for a corpus size (PQ needs enough vectors to train)"""
+    if storage not in VECTOR_STORAGES:
+        raise ValueError(f"Unknown vector storage '{storage}', available: {', '.join(VECTOR_STORAGES)}")
+    if storage == "pq" and count < PQ_MIN_TRAINING_POINTS:
+        return "int8"
+    return storage
+
+
+def bytes_per_vector(storage: str, d: int, pq_m: int = PQ_M) -> int:
+    """Size of one stored vector code in bytes"""
+    return {"float32": 4 * d, "float16": 2 * d, "int8": d, "pq": pq_subquantizers(d, pq_m)}[storage]
+
+
+def index_factory_string(index_type: str, storage: str, d: int, count: int, hnsw_m: int = HNSW_M) -> str:
+    """FAISS index_factory description for an index type and vector storage"""
+    codec = {
+        "float32": "Flat",
+        "float16": "SQfp16",
+        "int8": "SQ8",
+        "pq": f"PQ{pq_subquantizers(d)}",
+    }[storage]
+    if index_type == "hnsw":
+        return f"HNSW{hnsw_m}" if codec == "Flat" else f"HNSW{hnsw_m}_{codec}"
+    if index_type == "ivf" and ivf_nlist(count):
+        return f"IVF{ivf_nlist(count)},{codec}"
+    return codec
+
+
+def build_index(
+    index_type: str,
+    vectors: np.ndarray,
+    storage: str = "float32",
+    hnsw_m: int = HNSW_M,
+) -> faiss.Index:
+    """
+    Build a FAISS index of the given type and vector storage (ids follow row order)
+
+    Args:
+        index_type: "flat", "hnsw" or "ivf"
+        vectors: float32 matrix of shape (n, d)
+        storage: "float32", "float16", "int8" (scalar quantized) or "pq" (product quantized)
+        hnsw_m: Graph degree of HNSW indexes
+
+    Returns:
+        The populated index (IVF falls back to flat and PQ to int8 for corpora too
+        small to train them)
+    """
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type '{index_type}', available: {', '.join(INDEX_TYPES)}")
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    count, d = vectors.shape
+    storage = resolve_storage(storage, count)
+
+    if index_type == "flat" and storage == "float32":
+        index = faiss.IndexFlatL2(d)
+    else:
+        index = faiss.index_factory(d, index_factory_string(index_type, storage, d, count, hnsw_m))
+    if not index.is_trained:
+        index.train(vectors)
+    index.add(vectors)
+    return index
+
+
+def index_type_of(index: faiss.Index) -> str:
+    """Name of the ANN family an index belongs to"""
+    if faiss.try_extract_index_ivf(index) is not None:
+        return "ivf"
+    if isinstance(index, faiss.IndexHNSW):
+        return "hnsw"
+    return "flat"
+
+
+def storage_of(index: faiss.Index) -> str:
+    """Name of the vector storage an index uses"""
+    if isinstance(index, faiss.IndexHNSW):
+        codec = faiss.downcast_index(index.storage)
+    else:
+        ivf = faiss.try_extract_index_ivf(index)
+        codec = faiss.downcast_index(ivf) if ivf is not None else index
+    if isinstance(codec, (faiss.IndexPQ, faiss.IndexIVFPQ)):
+        return "pq"
+    if isinstance(codec, (faiss.IndexScalarQuantizer, faiss.IndexIVFScalarQuantizer)):
+        return "float16" if codec.sq.qtype == faiss.ScalarQuantizer.QT_fp16 else "int8"
+    return "float32"
+
+
+def mmap_io_flags(index_type: str) -> int:
+    """
+    faiss.read_index flags that memory-map a saved index read-only
+
+    Mapped vectors are shared between processes through the page cache. IVF
+    indexes map their inverted lists; the other types map their code arrays.
+    """
+    if index_type == "ivf":
+        return faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+    return faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY
+
+
+def set_search_param(index: faiss.Index, param: Optional[str], value: Optional[int]):
+    """Set an index search parameter such as efSearch or nprobe"""
+    if param and value is not None:
+        faiss.ParameterSpace().set_index_parameter(index, param, value)
+
+
+def search_params(index: faiss.Index, selector: faiss.IDSelector = None) -> faiss.SearchParameters:
+    """Per-call search parameters keeping the index's tuned efSearch / nprobe, with an optional id filter"""
+    if isinstance(index, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=index.hnsw.efSearch)
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        return faiss.SearchParametersIVF(sel=selector, nprobe=ivf.nprobe)
+    return faiss.SearchParameters(sel=selector)
+
+
+def filtered_search(index: faiss.Index, query: np.ndarray, positions: np.ndarray, k: int):
+    """
+    Search only among the given index positions
+
+    Args:
+        index: Index to search
+        query: float32 query vector of shape (d,)
+        positions: Index positions allowed in the result
+        k: Number of neighbours
+
+    Returns:
+        Tuple of (distances, positions) arrays of the hits, nearest first
+    """
+    selector = faiss.IDSelectorBatch(np.ascontiguousarray(positions, dtype=np.int64))
+    distances, found = index.search(query.reshape(1, -1), k, params=search_params(index, selector))
+    keep = found[0] >= 0
+    return distances[0][keep], found[0][keep]
+
+
+def _measure(index: faiss.Index, queries: np.ndarray, truth: np.ndarray, query_ids: np.ndarray, k: int):
+    """Recall@k against exact neighbours and p95 single-query latency in ms"""
+    latencies = []
+    hits = 0
+    for qid, query, expected in zip(query_ids, queries, truth):
+        start = time.perf_counter()
+        _, found = index.search(query.reshape(1, -1), k + 1)
+        latencies.append((time.perf_counter() - start) * 1000)
+        found = [i for i in found[0] if i != qid and i >= 0][:k]
+        hits += len(set(found) & set(expected))
+    recall = hits / max(1, truth.size)
+    return recall, float(np.percentile(latencies, 95))
+
+
+def autotune_index(
+    index: faiss.Index,
+    vectors: np.ndarray,
+    k: int = RETRIEVER_K,
+    target_p95_ms: float = ANN_TARGET_P95_MS,
+    min_recall: float = ANN_MIN_RECALL,
+    sample_size: int = ANN_TUNE_SAMPLE_SIZE,
+    seed: int = 0,
+) -> TuneResult:
+    """
+    Pick the cheapest search parameter that meets a recall and p95 latency target
+
+    A sample of corpus vectors is held out as queries; each query's own vector is
+    excluded from both the exact and the approximate results, and recall@k is
+    measured against exact float32 search, so it also captures the accuracy lost
+    to compressed vector storage. Candidates are tried cheapest first. When no
+    candidate meets both targets, the most accurate one within the latency target
+    is used (or the most accurate overall if none is fast enough).
+
+    Args:
+        index: Index over ``vectors``
+        vectors: Original float32 vectors stored in the index, in id order
+        k: Number of neighbours retrieved per query
+        target_p95_ms: Target 95th percentile latency per query in milliseconds
+        min_recall: Minimum recall@k against exact search
+        sample_size: Number of held-out query vectors
+        seed: Random seed of the query sample
+
+    Returns:
+        TuneResult with the chosen parameter (already applied to the index)
+    """
+    index_type = index_type_of(index)
+    storage = storage_of(index)
+    code_size = bytes_per_vector(storage, index.d)
+    if (index_type == "flat" and storage == "float32") or index.ntotal <= k + 1:
+        return TuneResult(index_type, storage, code_size)
+
+    if index_type == "hnsw":
+        param, candidates = "efSearch", [c for c in HNSW_EF_SEARCH_CANDIDATES if c >= k]
+    elif index_type == "ivf":
+        nlist = faiss.try_extract_index_ivf(index).nlist
+        param, candidates = "nprobe", [c for c in IVF_NPROBE_CANDIDATES if c < nlist] + [nlist]
+    else:
+        # Compressed flat index: nothing to tune, only measure the accuracy loss
+        param, candidates = None, [None]
+
+    rng = np.random.default_rng(seed)
+    query_ids = rng.choice(len(vectors), size=min(sample_size, len(vectors)), replace=False)
+    queries = np.ascontiguousarray(vectors[query_ids], dtype=np.float32)
+
+    exact = faiss.IndexFlatL2(vectors.shape[1])
+    exact.add(np.ascontiguousarray(vectors, dtype=np.float32))
+    _, exact_ids = exact.search(queries, k + 1)
+    truth = np.array([[i for i in row if i != qid][:k] for qid, row in zip(query_ids, exact_ids)])
+
+    results = []
+    for value in candidates:
+        set_search_param(index, param, value)
+        recall, p95 = _measure(index, queries, truth, query_ids, k)
+        met_target = recall >= min_recall and p95 <= target_p95_ms
+        result = TuneResult(index_type, storage, code_size, param, value, recall, p95, met_target)
+        results.append(result)
+        if result.met_target:
+            return result
+
+    fast_enough = [r for r in results if r.p95_ms <= target_p95_ms]
+    best = max(fast_enough or results, key=lambda r: r.recall)
+    set_search_param(index, best.param, best.value)
+    return best
+
+
+def apply_index_type(
+    vectorstore,
+    index_type: str,
+    storage: str = VECTOR_STORAGE,
+    vectors: np.ndarray = None,
+    k: int = RETRIEVER_K,
+) -> TuneResult:
+    """
+    Rebuild a LangChain FAISS vectorstore's index with the given type and storage, and autotune it
+
+    Vectors keep their positions, so the docstore mapping stays valid.
+
+    Args:
+        vectorstore: LangChain FAISS vectorstore
+        index_type: "flat", "hnsw" or "ivf"
+        storage: "float32", "float16", "int8" or "pq"
+        vectors: Original float32 vectors in position order (reconstructed from
+            the current index when omitted, which is only exact for lossless indexes)
+        k: Number of neighbours retrieved per query
+
+    Returns:
+        TuneResult of the new index
+    """
+    if vectors is None:
+        vectors = reconstruct_vectors(vectorstore.index)
+    if len(vectors) == 0:
+        vectorstore.index = faiss.IndexFlatL2(vectorstore.index.d)
+        return TuneResult("flat", "float32", bytes_per_vector("float32", vectorstore.index.d))
+    vectorstore.index = build_index(index_type, vectors, storage)
+    return autotune_index(vectorstore.index, vectors, k)
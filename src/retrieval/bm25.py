@@ -0,0 +1,189 @@
+"""
+BM25 - Inverted lexical index over index chunks and reciprocal rank fusion
+"""
+import hashlib
+import json
+import math
+import re
+import shutil
+import uuid
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from configuration.configuration import BM25_K1, BM25_B, RRF_K
+
+_WORD = re.compile(r"\w+")
+# Parts of compound identifiers: StateGraph -> State, Graph; add_edge -> add, edge
+_WORD_PART = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+BM25_META_FILE = "meta.json"
+BM25_VOCABULARY_FILE = "vocabulary.json"
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lower-case terms
+
+    Compound identifiers are kept whole and also split into their parts, so an
+    exact API name and its words both match.
+    """
+    tokens = []
+    for word in _WORD.findall(text):
+        tokens.append(word.lower())
+        parts = _WORD_PART.findall(word)
+        if len(parts) > 1:
+            tokens.extend(part.lower() for part in parts)
+    return tokens
+
+
+def ids_fingerprint(ids: Sequence[str]) -> str:
+    """Fingerprint of the chunk ids of an index, in position order"""
+    return hashlib.sha256("\n".join(ids).encode("utf-8")).hexdigest()
+
+
+class BM25Index:
+    """
+    Okapi BM25 over the chunks of a vector index, addressed by index position
+
+    Postings are stored in CSR form (per-term offsets into flat position and term
+    frequency arrays) and saved as .npy files that are loaded memory-mapped.
+    """
+
+    def __init__(
+        self,
+        vocabulary: Dict[str, int],
+        offsets: np.ndarray,
+        postings: np.ndarray,
+        term_freqs: np.ndarray,
+        doc_lengths: np.ndarray,
+        fingerprint: str = "",
+        k1: float = BM25_K1,
+        b: float = BM25_B,
+    ):
+        self.vocabulary = vocabulary
+        self.offsets = offsets
+        self.postings = postings
+        self.term_freqs = term_freqs
+        self.doc_lengths = doc_lengths
+        self.fingerprint = fingerprint
+        self.k1 = k1
+        self.b = b
+        self.avg_doc_length = max(float(doc_lengths.mean()), 1.0) if len(doc_lengths) else 1.0
+
+    @property
+    def size(self) -> int:
+        """Number of indexed chunks"""
+        return len(self.doc_lengths)
+
+    @classmethod
+    def build(cls, texts: Iterable[str], fingerprint: str = "", k1: float = BM25_K1, b: float = BM25_B) -> "BM25Index":
+        """
+        Build the index from chunk texts in position order
+
+        Args:
+            texts: Chunk texts, the n-th text being index position n
+            fingerprint: ids_fingerprint of the chunks, checked when loading
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        term_postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        doc_lengths = []
+        for position, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            doc_lengths.append(sum(counts.values()))
+            for term, count in counts.items():
+                term_postings[term].append((position, count))
+
+        terms = sorted(term_postings)
+        vocabulary = {term: term_id for term_id, term in enumerate(terms)}
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(term_postings[t]) for t in terms])
+        postings = np.empty(offsets[-1], dtype=np.int32)
+        term_freqs = np.empty(offsets[-1], dtype=np.int32)
+        for term_id, term in enumerate(terms):
+            entries = np.array(term_postings[term], dtype=np.int32).reshape(-1, 2)
+            postings[offsets[term_id]:offsets[term_id + 1]] = entries[:, 0]
+            term_freqs[offsets[term_id]:offsets[term_id + 1]] = entries[:, 1]
+        return cls(vocabulary, offsets, postings, term_freqs, np.array(doc_lengths, dtype=np.int32), fingerprint, k1, b)
+
+    def search(self, query: str, k: int, allowed: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k chunks for a query
+
+        Args:
+            query: Query text
+            k: Number of results
+            allowed: Optional boolean mask over positions restricting the results
+
+        Returns:
+            Tuple of (positions, scores), best first (only chunks sharing a term)
+        """
+        scores = np.zeros(self.size, dtype=np.float32)
+        for term in set(tokenize(query)):
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                continue
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            docs = self.postings[start:end]
+            tf = self.term_freqs[start:end].astype(np.float32)
+            idf = math.log(1 + (self.size - (end - start) + 0.5) / ((end - start) + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[docs] / self.avg_doc_length)
+            # Every chunk appears once per term, so plain fancy-index addition is safe
+            scores[docs] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        if allowed is not None:
+            scores[~allowed] = 0
+        candidates = np.flatnonzero(scores > 0)
+        top = candidates[np.argsort(-scores[candidates], kind="stable")[:k]]
+        return top, scores[top]
+
+    def save(self, directory):
+        """Write the index to a directory (replacing any previous copy)"""
+        directory = Path(directory)
+        tmp_dir = directory.with_name(f".{directory.name}-{uuid.uuid4().hex}")
+        tmp_dir.mkdir(parents=True)
+        try:
+            for name in ("offsets", "postings", "term_freqs", "doc_lengths"):
+                np.save(tmp_dir / f"{name}.npy", np.asarray(getattr(self, name)))
+            (tmp_dir / BM25_VOCABULARY_FILE).write_text(json.dumps(self.vocabulary), encoding="utf-8")
+            meta = {"fingerprint": self.fingerprint, "k1": self.k1, "b": self.b}
+            (tmp_dir / BM25_META_FILE).write_text(json.dumps(meta), encoding="utf-8")
+            shutil.rmtree(directory, ignore_errors=True)
+            tmp_dir.rename(directory)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+    @classmethod
+    def load(cls, directory) -> "BM25Index":
+        """Load a saved index, memory-mapping its posting arrays"""
+        directory = Path(directory)
+        meta = json.loads((directory / BM25_META_FILE).read_text(encoding="utf-8"))
+        vocabulary = json.loads((directory / BM25_VOCABULARY_FILE).read_text(encoding="utf-8"))
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r")
+            for name in ("offsets", "postings", "term_freqs", "doc_lengths")
+        }
+        return cls(vocabulary, fingerprint=meta["fingerprint"], k1=meta["k1"], b=meta["b"], **arrays)
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[int]], k: int = RRF_K) -> List[int]:
+    """
+    Merge ranked lists with reciprocal rank fusion
+
+    Args:
+        rankings: Ranked lists of positions, best first
+        k: RRF constant damping the weight of top ranks
+
+    Returns:
+        Positions ordered by fused score (ties keep first-seen order)
+    """
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, position in enumerate(ranking):
+            position = int(position)
+            fused[position] = fused.get(position, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(fused, key=fused.get, reverse=True)
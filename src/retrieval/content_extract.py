@@ -0,0 +1,160 @@
+"""
+Content Extract - Main-content extraction from HTML pages, split into heading sections
+"""
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import Comment
+
+# Elements that never hold article content
+_DROP_TAGS = (
+    "script", "style", "noscript", "template", "iframe", "svg", "canvas", "form",
+    "button", "input", "select", "nav", "footer", "aside", "dialog",
+)
+_DROP_ROLES = {"navigation", "banner", "contentinfo", "complementary", "search", "dialog", "alertdialog"}
+# class / id fragments of menus, sidebars, cookie banners and similar page furniture
+_BOILERPLATE = re.compile(
+    r"(^|[-_\s])(nav|navbar|menu|sidebar|footer|breadcrumbs?|toc|cookies?|consent|banner|"
+    r"social|share|skip|announce|feedback|pagination|md-source|headerlink)([-_\s]|$)",
+    re.IGNORECASE,
+)
+_MAIN_SELECTORS = ("main", "article", "[role=main]", "#content", ".content", ".md-content", "#main")
+_HEADINGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+# Text blocks whose descendants are not walked separately
+_BLOCKS = {"p", "blockquote", "dt", "dd", "figcaption", "caption", "summary"}
+_CONTAINERS = {"p", "pre", "ul", "ol", "dl", "table", "div", "section", "blockquote", *_HEADINGS}
+# Elements flowing inside a line of text
+_INLINE = {
+    "a", "abbr", "b", "br", "cite", "code", "em", "i", "img", "kbd", "mark", "q", "s",
+    "samp", "small", "span", "strong", "sub", "sup", "time", "u", "var",
+}
+# Headings up to this level start a new section; deeper ones stay inline
+SECTION_HEADING_LEVEL = 3
+
+
+@dataclass
+class ContentSection:
+    """Text under one heading of a page"""
+    headings: List[str]
+    blocks: List[str] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        """Section text, blocks separated by blank lines"""
+        return "\n\n".join(self.blocks)
+
+
+@dataclass
+class ExtractedContent:
+    """Main content of a page and how much of the page text it kept"""
+    sections: List[ContentSection]
+    bytes_total: int
+    bytes_kept: int
+
+    @property
+    def bytes_discarded(self) -> int:
+        """Bytes of page text that were dropped"""
+        return max(0, self.bytes_total - self.bytes_kept)
+
+
+def _is_boilerplate(tag: Tag) -> bool:
+    if tag.name in _DROP_TAGS:
+        return True
+    if tag.get("role") in _DROP_ROLES or tag.get("aria-hidden") == "true" or tag.has_attr("hidden"):
+        return True
+    names = " ".join(tag.get("class") or []) + " " + (tag.get("id") or "")
+    return bool(_BOILERPLATE.search(names))
+
+
+def _clean(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _main_root(soup: BeautifulSoup) -> Tag:
+    """The element holding the page content (the one with the most text among the candidates)"""
+    candidates = [tag for selector in _MAIN_SELECTORS for tag in soup.select(selector)]
+    if candidates:
+        return max(candidates, key=lambda tag: len(tag.get_text()))
+    return soup.body or soup
+
+
+class _SectionWriter:
+    """Walks the content tree in document order, collecting blocks under their headings"""
+
+    def __init__(self):
+        self.path: List[tuple] = []
+        self.sections = [ContentSection([])]
+
+    def add(self, text: str):
+        if text:
+            self.sections[-1].blocks.append(text)
+
+    def heading(self, level: int, title: str):
+        if not title:
+            return
+        if level > SECTION_HEADING_LEVEL:
+            self.add(f"{'#' * level} {title}")
+            return
+        self.path = [(lvl, t) for lvl, t in self.path if lvl < level] + [(level, title)]
+        self.sections.append(ContentSection([t for _, t in self.path], [f"{'#' * level} {title}"]))
+
+    def walk(self, node: Tag):
+        # Runs of text and inline elements between blocks form one block
+        line: List[str] = []
+        for child in node.children:
+            if isinstance(child, Comment):
+                continue
+            if isinstance(child, NavigableString):
+                line.append(str(child))
+                continue
+            if not isinstance(child, Tag) or _is_boilerplate(child):
+                continue
+            if child.name in _INLINE and not child.find(list(_CONTAINERS)):
+                line.append(child.get_text())
+                continue
+            self.add(_clean("".join(line)))
+            line = []
+            if child.name in _HEADINGS:
+                # Permalink anchors (mkdocs "¶") are not part of the title
+                self.heading(_HEADINGS[child.name], _clean(child.get_text(" ")).rstrip("¶#").strip())
+            elif child.name == "pre":
+                # Code keeps its line breaks and indentation
+                self.add(child.get_text().strip("\n"))
+            elif child.name == "tr":
+                self.add(" | ".join(_clean(cell.get_text(" ")) for cell in child.find_all(["td", "th"])))
+            elif child.name in _BLOCKS or (
+                child.name in ("li", "td", "th") and not child.find(list(_CONTAINERS))
+            ):
+                self.add(_clean(child.get_text(" ")))
+            else:
+                self.walk(child)
+        self.add(_clean("".join(line)))
+
+
+def extract_main_content(html: str, soup: Optional[BeautifulSoup] = None) -> ExtractedContent:
+    """
+    Extract the article body and code blocks of an HTML page
+
+    Menus, headers, footers, sidebars, cookie banners and scripts are dropped;
+    the remaining text is split into sections at headings (h1-h3), each
+    carrying the heading path it sits under.
+
+    Args:
+        html: Page HTML
+        soup: Already parsed page (parsed from ``html`` when omitted)
+
+    Returns:
+        ExtractedContent with the non-empty sections and the bytes of page text
+        kept versus the full page text
+    """
+    soup = soup or BeautifulSoup(html, "html.parser")
+    bytes_total = len(soup.get_text().encode("utf-8"))
+
+    writer = _SectionWriter()
+    writer.walk(_main_root(soup))
+    # A heading directly followed by a subheading has no text of its own (its title stays in the path)
+    sections = [section for section in writer.sections if len(section.blocks) > bool(section.headings)]
+    bytes_kept = sum(len(section.text.encode("utf-8")) for section in sections)
+    return ExtractedContent(sections, bytes_total, bytes_kept)
@@ -0,0 +1,113 @@
+"""
+Dedup - MinHash / LSH near-duplicate detection for chunks before embedding
+"""
+import hashlib
+import re
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from configuration.configuration import (
+    NEAR_DUPLICATE_THRESHOLD,
+    MINHASH_PERMUTATIONS,
+    MINHASH_BANDS,
+    SHINGLE_SIZE,
+)
+
+_WORD = re.compile(r"\w+")
+# Fixed seed so signatures are stable across builds; with the loaders yielding in
+# input order, the same member of a near-duplicate pair is kept every time
+_MINHASH_SEED = 0x5EED
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """
+    Stable 64-bit hashes of the word n-grams of a text
+
+    Texts shorter than ``size`` words yield a single shingle of all their words.
+    """
+    words = [w.lower() for w in _WORD.findall(text)]
+    grams = {" ".join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))}
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "little") for g in grams],
+        dtype=np.uint64,
+    )
+
+
+class NearDuplicateFilter:
+    """
+    Streaming near-duplicate filter over chunk texts
+
+    Each text gets a MinHash signature over its word shingles; signatures are
+    split into LSH bands, and texts sharing a band with an earlier one are
+    compared on the full signature. A text whose estimated Jaccard similarity
+    with an earlier text of the same scope reaches the threshold is reported
+    as a duplicate and not remembered, so the first occurrence is the one kept.
+    Scopes keep sources apart: a chunk is only dropped in favour of a chunk
+    that the same retriever can return.
+    """
+
+    def __init__(
+        self,
+        threshold: float = NEAR_DUPLICATE_THRESHOLD,
+        num_perm: int = MINHASH_PERMUTATIONS,
+        bands: int = MINHASH_BANDS,
+        shingle_size: int = SHINGLE_SIZE,
+    ):
+        if num_perm % bands:
+            raise ValueError(f"MinHash permutations ({num_perm}) must be a multiple of the bands ({bands})")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(_MINHASH_SEED)
+        # Multiply-shift hashing: odd multipliers, arithmetic wraps modulo 2^64
+        self._a = rng.integers(1, 2**63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, num_perm, dtype=np.uint64)
+        self._signatures: List[np.ndarray] = []
+        self._buckets: Dict[Tuple[str, int, bytes], List[int]] = defaultdict(list)
+        self.seen = 0
+        self.removed = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether near-duplicates are detected at all"""
+        return self.threshold > 0
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of a text"""
+        hashes = shingles(text, self.shingle_size)
+        permuted = (hashes[:, None] * self._a[None, :] + self._b[None, :]) >> np.uint64(32)
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def is_duplicate(self, text: str, scope: str = "") -> bool:
+        """
+        Check a text against the texts kept so far, remembering it when it is new
+
+        Args:
+            text: Chunk text
+            scope: Only texts of the same scope (e.g. source) are compared
+
+        Returns:
+            True if the text nearly duplicates a kept text of the same scope
+        """
+        self.seen += 1
+        if not self.enabled:
+            return False
+        signature = self.signature(text)
+        keys = [
+            (scope, band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+        candidates = {i for key in keys for i in self._buckets.get(key, ())}
+        for i in candidates:
+            if np.mean(self._signatures[i] == signature) >= self.threshold:
+                self.removed += 1
+                return True
+
+        position = len(self._signatures)
+        self._signatures.append(signature)
+        for key in keys:
+            self._buckets[key].append(position)
+        return False
@@ -0,0 +1,156 @@
+"""
+Docstore - Memory-mapped chunk store backed by an append-only record file
+"""
+import json
+import mmap
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from langchain_community.docstore.base import AddableMixin, Docstore
+from langchain_core.documents import Document
+
+DOCSTORE_DATA_FILE = "docstore.data"
+DOCSTORE_OFFSETS_FILE = "docstore.offsets.json"
+
+
+class MmapDocstore(Docstore, AddableMixin):
+    """
+    Chunk store keeping page_content and metadata on disk instead of in a dict
+
+    Records are appended to a single data file; only an id -> (offset, length)
+    index is held in memory. Lookups read the record through a read-only memory
+    map, so a retrieval hit only touches the pages of the chunks it returns and
+    processes opening the same file share them through the page cache. Deleting
+    drops the id from the index; the space is reclaimed when the store is saved.
+    Pickling keeps only the path and the index, so worker processes reopen the
+    file instead of receiving a copy of every chunk.
+    """
+
+    def __init__(self, data_path, offsets: Optional[Dict[str, Tuple[int, int]]] = None):
+        self.data_path = Path(data_path)
+        self._offsets: Dict[str, Tuple[int, int]] = dict(offsets or {})
+        self._lock = threading.Lock()
+        self._writer = None
+        self._reader = None
+        self._map: Optional[mmap.mmap] = None
+        self._size = self.data_path.stat().st_size if self.data_path.exists() else 0
+
+    @classmethod
+    def load(cls, directory) -> "MmapDocstore":
+        """Open a store saved with save() (read-only until something is added)"""
+        directory = Path(directory)
+        offsets = json.loads((directory / DOCSTORE_OFFSETS_FILE).read_text(encoding="utf-8"))
+        return cls(directory / DOCSTORE_DATA_FILE, {k: tuple(v) for k, v in offsets.items()})
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._offsets
+
+    def __getstate__(self):
+        self.flush()
+        return {"data_path": self.data_path, "offsets": self._offsets}
+
+    def __setstate__(self, state):
+        self.__init__(state["data_path"], state["offsets"])
+
+    def _view(self, end: int) -> mmap.mmap:
+        """Memory map covering at least the first ``end`` bytes of the data file"""
+        if self._map is None or len(self._map) < end:
+            if self._writer is not None:
+                self._writer.flush()
+            if self._map is not None:
+                self._map.close()
+            if self._reader is None:
+                self._reader = open(self.data_path, "rb")
+            self._map = mmap.mmap(self._reader.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def _read(self, doc_id: str) -> Document:
+        offset, length = self._offsets[doc_id]
+        with self._lock:
+            record = self._view(offset + length)[offset:offset + length]
+        page_content, metadata = pickle.loads(record)
+        return Document(id=doc_id, page_content=page_content, metadata=metadata)
+
+    def search(self, search: str) -> Union[str, Document]:
+        """Look up a chunk by id (an error message when missing, like InMemoryDocstore)"""
+        if search not in self._offsets:
+            return f"ID {search} not found."
+        return self._read(search)
+
+    def add(self, texts: Dict[str, Document]) -> None:
+        """Append chunks to the data file"""
+        overlapping = set(texts).intersection(self._offsets)
+        if overlapping:
+            raise ValueError(f"Tried to add ids that already exist: {overlapping}")
+        with self._lock:
+            if self._writer is None:
+                self.data_path.parent.mkdir(parents=True, exist_ok=True)
+                self._writer = open(self.data_path, "ab")
+            for doc_id, doc in texts.items():
+                record = pickle.dumps((doc.page_content, doc.metadata), protocol=pickle.HIGHEST_PROTOCOL)
+                self._writer.write(record)
+                self._offsets[doc_id] = (self._size, len(record))
+                self._size += len(record)
+
+    def delete(self, ids: List) -> None:
+        """Remove chunks from the index (their records stay until the next save)"""
+        if not set(ids).intersection(self._offsets):
+            raise ValueError(f"Tried to delete ids that do not exist: {ids}")
+        for doc_id in ids:
+            self._offsets.pop(doc_id, None)
+
+    def flush(self):
+        """Flush appended records to the data file"""
+        with self._lock:
+            if self._writer is not None:
+                self._writer.flush()
+
+    def save(self, directory):
+        """
+        Write the live chunks to a compacted data file and offset index in a directory
+
+        Records are copied as raw bytes in offset order, so saving never
+        deserializes chunk text.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        data_path = directory / DOCSTORE_DATA_FILE
+        tmp_path = data_path.with_suffix(".tmp")
+        offsets = {}
+        position = 0
+        with open(tmp_path, "wb") as out:
+            if self._offsets:
+                with self._lock:
+                    view = self._view(max(offset + length for offset, length in self._offsets.values()))
+                    for doc_id, (offset, length) in sorted(self._offsets.items(), key=lambda item: item[1][0]):
+                        out.write(view[offset:offset + length])
+                        offsets[doc_id] = (position, length)
+                        position += length
+            out.flush()
+            os.fsync(out.fileno())
+
+        in_place = data_path.exists() and data_path.resolve() == self.data_path.resolve()
+        if in_place:
+            self.close()
+        os.replace(tmp_path, data_path)
+        (directory / DOCSTORE_OFFSETS_FILE).write_text(json.dumps(offsets), encoding="utf-8")
+        if in_place:
+            self._offsets = offsets
+            self._size = position
+
+    def close(self):
+        """Close the data file and its memory map"""
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            for handle in (self._reader, self._writer):
+                if handle is not None:
+                    handle.close()
+            self._reader = self._writer = None
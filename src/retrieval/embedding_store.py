@@ -0,0 +1,114 @@
+"""
+Embedding Store - Content-addressed on-disk cache of chunk embeddings
+"""
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from configuration.configuration import INDEX_CACHE_DIR
+
+EMBEDDING_STORE_FILE = "embeddings.sqlite3"
+
+
+def hash_text(text: str) -> str:
+    """Content address of a chunk text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """
+    SQLite-backed store mapping (embedding model, chunk text hash) to a vector
+
+    Identical chunk text is only ever embedded once per model, no matter which
+    source or index it belongs to.
+    """
+
+    def __init__(self, path: Path = None):
+        self.path = Path(path) if path else Path(INDEX_CACHE_DIR) / EMBEDDING_STORE_FILE
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (model, hash)
+            )"""
+        )
+        self._conn.commit()
+
+    def get_many(self, model: str, hashes: List[str]) -> Dict[str, np.ndarray]:
+        """Fetch the stored vectors for the given hashes (missing ones are omitted)"""
+        found = {}
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(hashes), 500):
+                batch = hashes[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT hash, vector FROM embeddings WHERE model = ? AND hash IN ({placeholders})",
+                    [model, *batch],
+                ).fetchall()
+                for h, blob in rows:
+                    found[h] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, model: str, items: List[Tuple[str, List[float]]]):
+        """Store vectors keyed by their text hash"""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, hash, vector) VALUES (?, ?, ?)",
+                [(model, h, np.asarray(v, dtype=np.float32).tobytes()) for h, v in items],
+            )
+            self._conn.commit()
+
+    def embed_documents(self, embeddings: Embeddings, model: str, texts: List[str]) -> Tuple[List[List[float]], int]:
+        """
+        Embed texts, reusing every vector already present in the store
+
+        Args:
+            embeddings: Embedding model used for texts not in the store
+            model: Model identifier the vectors are stored under
+            texts: Chunk texts to embed
+
+        Returns:
+            Tuple of (vectors in input order, number of reused vectors)
+        """
+        hashes = [hash_text(t) for t in texts]
+        cached = self.get_many(model, list(dict.fromkeys(hashes)))
+
+        missing = {}
+        for h, text in zip(hashes, texts):
+            if h not in cached and h not in missing:
+                missing[h] = text
+
+        if missing:
+            new_vectors = embeddings.embed_documents(list(missing.values()))
+            fresh = list(zip(missing.keys(), new_vectors))
+            self.put_many(model, fresh)
+            cached.update({h: np.asarray(v, dtype=np.float32) for h, v in fresh})
+
+        vectors = [cached[h].tolist() for h in hashes]
+        return vectors, len(texts) - len(missing)
+
+
+_STORES: Dict[Path, EmbeddingStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_embedding_store(path: Path = None) -> EmbeddingStore:
+    """Get the shared embedding store for a path (defaults to INDEX_CACHE_DIR)"""
+    resolved = Path(path) if path else Path(INDEX_CACHE_DIR) / EMBEDDING_STORE_FILE
+    with _STORES_LOCK:
+        store = _STORES.get(resolved)
+        if store is None:
+            store = EmbeddingStore(resolved)
+            _STORES[resolved] = store
+        return store
@@ -0,0 +1,139 @@
+"""
+Encoder - Batched, multi-process embedding of chunk texts for index builds
+"""
+import atexit
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from configuration.configuration import EMBED_ENCODE_BATCH_SIZE, EMBED_ENCODE_WORKERS
+from src.retrieval.parallel import PROCESS_CONTEXT
+
+# Model loaded once per worker process by the pool initializer
+_WORKER_MODEL = None
+
+
+def _init_worker(model_name: str, device: Optional[str], threads: int):
+    """Load the sentence-transformers model in a worker process"""
+    global _WORKER_MODEL
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    # Split the cores between the workers instead of letting every worker use all of them
+    torch.set_num_threads(threads)
+    _WORKER_MODEL = SentenceTransformer(model_name, device=device)
+
+
+def _encode_batch(texts: List[str], normalize_embeddings: bool) -> List[List[float]]:
+    """Encode one batch of texts in a worker process"""
+    # Same preprocessing as HuggingFaceEmbeddings, so vectors match in-process encoding
+    vectors = _WORKER_MODEL.encode(
+        [t.replace("\n", " ") for t in texts],
+        batch_size=len(texts),
+        normalize_embeddings=normalize_embeddings,
+        show_progress_bar=False,
+    )
+    return vectors.tolist()
+
+
+class BatchEncoder(Embeddings):
+    """
+    Embeds documents in fixed-size batches, optionally across a pool of worker processes
+
+    Results always come back in input order. Queries are embedded in-process through
+    the wrapped embeddings, only document batches go to the pool. Throughput of every
+    embed_documents call is accumulated and available through stats().
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        batch_size: int = EMBED_ENCODE_BATCH_SIZE,
+        workers: int = EMBED_ENCODE_WORKERS,
+    ):
+        self.embeddings = embeddings
+        self.batch_size = max(1, batch_size)
+        self.workers = max(1, workers)
+        self.model_name = getattr(embeddings, "model_name", None)
+        self.normalize_embeddings = getattr(embeddings, "normalize_embeddings", False)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._chunks = 0
+        self._seconds = 0.0
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Start the worker pool on first use (None when encoding in-process)"""
+        # Only the shared sentence-transformers models can be recreated in a worker
+        if self.workers <= 1 or self.model_name is None or not hasattr(self.embeddings, "device"):
+            return None
+        with self._pool_lock:
+            if self._pool is None:
+                threads = max(1, (os.cpu_count() or 1) // self.workers)
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=PROCESS_CONTEXT,
+                    initializer=_init_worker,
+                    initargs=(self.model_name, self.embeddings.device, threads),
+                )
+                atexit.register(self.close)
+            return self._pool
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents in batches, in parallel when a worker pool is configured"""
+        if not texts:
+            return []
+        start = time.perf_counter()
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+
+        pool = self._get_pool()
+        if pool is None:
+            vectors = [v for batch in batches for v in self.embeddings.embed_documents(batch)]
+        else:
+            results = pool.map(_encode_batch, batches, [self.normalize_embeddings] * len(batches))
+            vectors = [v for batch in results for v in batch]
+
+        with self._stats_lock:
+            self._chunks += len(texts)
+            self._seconds += time.perf_counter() - start
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query in-process"""
+        return self.embeddings.embed_query(text)
+
+    def stats(self) -> Dict[str, float]:
+        """Chunks encoded, time spent and throughput in chunks per second"""
+        with self._stats_lock:
+            rate = self._chunks / self._seconds if self._seconds else 0.0
+            return {"chunks": self._chunks, "seconds": self._seconds, "chunks_per_second": rate}
+
+    def close(self):
+        """Shut down the worker pool"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+_ENCODERS: Dict[Tuple[int, int, int], BatchEncoder] = {}
+_ENCODERS_LOCK = threading.Lock()
+
+
+def get_batch_encoder(
+    embeddings: Embeddings,
+    batch_size: int = EMBED_ENCODE_BATCH_SIZE,
+    workers: int = EMBED_ENCODE_WORKERS,
+) -> BatchEncoder:
+    """Get the shared batch encoder for an embedding model, so its worker pool is reused"""
+    key = (id(embeddings), batch_size, workers)
+    with _ENCODERS_LOCK:
+        encoder = _ENCODERS.get(key)
+        if encoder is None or encoder.embeddings is not embeddings:
+            encoder = BatchEncoder(embeddings, batch_size, workers)
+            _ENCODERS[key] = encoder
+        return encoder
@@ -0,0 +1,566 @@
+"""
+Index Cache - Persistent on-disk FAISS index store for the retriever tools
+"""
+import hashlib
+import json
+import pickle
+import queue
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+import faiss
+import numpy as np
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_text_splitters import TextSplitter
+
+from configuration.configuration import (
+    INDEX_CACHE_DIR,
+    EMBEDDING_MODEL,
+    SPLITTER_MODE,
+    EMBED_BATCH_SIZE,
+    INGEST_QUEUE_SIZE,
+    INDEX_TYPE,
+    VECTOR_STORAGE,
+    INDEX_MMAP,
+    NEAR_DUPLICATE_THRESHOLD,
+)
+from src.retrieval.ann import (
+    INDEX_TYPES,
+    TuneResult,
+    apply_index_type,
+    bytes_per_vector,
+    is_lossless,
+    mmap_io_flags,
+    reconstruct_vectors,
+    resolve_storage,
+    set_search_param,
+)
+from src.retrieval.bm25 import BM25Index, ids_fingerprint
+from src.retrieval.dedup import NearDuplicateFilter
+from src.retrieval.docstore import DOCSTORE_DATA_FILE, DOCSTORE_OFFSETS_FILE, MmapDocstore
+from src.retrieval.embedding_store import EMBEDDING_STORE_FILE, get_embedding_store
+from src.retrieval.encoder import BatchEncoder, get_batch_encoder
+from src.retrieval.splitter import create_text_splitter, splitter_cache_id
+
+MANIFEST_FILE = "manifest.json"
+INDEX_FILE = "index.faiss"
+# Docstore id of every index position, in position order
+INDEX_IDS_FILE = "index_ids.json"
+# BM25 inverted index over the chunks, saved with the vector index
+LEXICAL_INDEX_DIR = "bm25"
+# Metadata key naming the source of a chunk in a shared multi-source index
+SOURCE_TAG_KEY = "source_tag"
+
+
+def hash_file(path) -> str:
+    """
+    Hash the raw bytes of a source file
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Hex SHA-256 digest of the file content
+    """
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def hash_documents(docs: List[Document]) -> str:
+    """
+    Hash the content and metadata of loaded documents
+
+    Args:
+        docs: Documents as returned by a loader
+
+    Returns:
+        Hex SHA-256 digest of the documents
+    """
+    sha = hashlib.sha256()
+    for doc in docs:
+        sha.update(doc.page_content.encode("utf-8"))
+        sha.update(json.dumps(doc.metadata, sort_keys=True, default=str).encode("utf-8"))
+    return sha.hexdigest()
+
+
+def chunk_id(chunk: Document) -> str:
+    """
+    Stable id of a chunk, derived from its text and metadata
+
+    Chunks of a shared multi-source index carry their source tag as an id prefix,
+    so a source's chunks can be told apart without reading the docstore.
+    """
+    digest = hash_documents([chunk])
+    source_tag = chunk.metadata.get(SOURCE_TAG_KEY)
+    return f"{source_tag}:{digest}" if source_tag else digest
+
+
+def index_cache_key(embedding_model: str, chunk_size: int, chunk_overlap: int, splitter: str = "characters") -> str:
+    """Build the cache key for an index from the settings that shape its chunks and vectors"""
+    settings = {
+        "embedding_model": embedding_model,
+        "chunk_size": chunk_size,
+        "chunk_overlap": chunk_overlap,
+    }
+    # Character-split indexes keep the keys they had before other splitters existed
+    if splitter != "characters":
+        settings["splitter"] = splitter
+    payload = json.dumps(settings, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _embedding_id(embeddings: Embeddings, embedding_model: str = None) -> str:
+    """Identifier of the vectors an embedding model produces"""
+    model = embedding_model or getattr(embeddings, "model_name", EMBEDDING_MODEL)
+    if getattr(embeddings, "normalize_embeddings", False):
+        model += "#normalized"
+    return model
+
+
+def _index_dir(name: str, embedding_id: str, text_splitter: TextSplitter, cache_dir: Path) -> Path:
+    """Directory of a cached index"""
+    key = index_cache_key(
+        embedding_id, text_splitter._chunk_size, text_splitter._chunk_overlap, splitter_cache_id(text_splitter)
+    )
+    return Path(cache_dir) / name / key
+
+
+def _iter_chunk_batches(
+    documents: Iterable[Document],
+    text_splitter: TextSplitter,
+    batch_size: int = EMBED_BATCH_SIZE,
+    queue_size: int = INGEST_QUEUE_SIZE,
+    near_duplicates: Optional[NearDuplicateFilter] = None,
+) -> Iterator[List[Tuple[str, Document]]]:
+    """
+    Load and split documents on a background thread, handing over unique chunks in batches
+
+    Exact duplicates are dropped by chunk id and, when a ``near_duplicates``
+    filter is given, near-duplicates of an earlier chunk of the same source
+    (repeated navigation, sidebars, snippets) are dropped before they reach
+    the embedder. The hand-over queue is bounded, so loading never runs more
+    than ``queue_size`` batches ahead of embedding and memory stays flat for
+    large sources.
+    """
+    batches = queue.Queue(maxsize=queue_size)
+    finished = object()
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            seen = set()
+            batch = []
+            for doc in documents:
+                for chunk in text_splitter.split_documents([doc]):
+                    cid = chunk_id(chunk)
+                    if cid in seen:
+                        continue
+                    seen.add(cid)
+                    scope = str(chunk.metadata.get(SOURCE_TAG_KEY, ""))
+                    if near_duplicates is not None and near_duplicates.is_duplicate(chunk.page_content, scope):
+                        continue
+                    batch.append((cid, chunk))
+                    if len(batch) >= batch_size:
+                        if not put(batch):
+                            return
+                        batch = []
+            if batch and not put(batch):
+                return
+            put(finished)
+        except BaseException as e:
+            put(e)
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            item = batches.get()
+            if item is finished:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+def _embed_chunks(encoder: BatchEncoder, embedding_id: str, chunks: List[Document], cache_dir: Path):
+    """Embed chunks through the content-addressed embedding store"""
+    store = get_embedding_store(Path(cache_dir) / EMBEDDING_STORE_FILE)
+    return store.embed_documents(encoder, embedding_id, [c.page_content for c in chunks])
+
+
+def _throughput(before: dict, after: dict) -> str:
+    """Format the encoder throughput between two stats() snapshots"""
+    chunks = after["chunks"] - before["chunks"]
+    seconds = after["seconds"] - before["seconds"]
+    if not chunks or not seconds:
+        return "no new embeddings"
+    return f"{chunks} embedded at {chunks / seconds:.0f} chunks/s"
+
+
+def _load_vectorstore(index_dir: Path, embeddings: Embeddings, index_type: str, mmap: bool = INDEX_MMAP) -> FAISS:
+    """
+    Load a saved vectorstore, optionally memory-mapping the FAISS index read-only
+
+    Chunk texts stay on disk in a memory-mapped docstore. A memory-mapped index
+    must never be modified (FAISS aborts on writes), so updates always build a
+    new index from the exact vectors.
+    """
+    index = faiss.read_index(str(index_dir / INDEX_FILE), mmap_io_flags(index_type) if mmap else 0)
+    if (index_dir / DOCSTORE_OFFSETS_FILE).exists():
+        docstore = MmapDocstore.load(index_dir)
+        ids = json.loads((index_dir / INDEX_IDS_FILE).read_text(encoding="utf-8"))
+        index_to_docstore_id = dict(enumerate(ids))
+    else:
+        # Indexes saved before the memory-mapped docstore pickled an InMemoryDocstore
+        with open(index_dir / "index.pkl", "rb") as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+    return FAISS(embeddings, index, docstore, index_to_docstore_id)
+
+
+def _writable_docstore(vectorstore: FAISS, build_dir: Path) -> MmapDocstore:
+    """Copy a vectorstore's chunks into a docstore that can be appended to"""
+    docstore = MmapDocstore(build_dir / DOCSTORE_DATA_FILE)
+    if isinstance(vectorstore.docstore, MmapDocstore):
+        # Saved stores may be mapped by other processes: copy rather than append in place
+        vectorstore.docstore.save(build_dir)
+        docstore = MmapDocstore.load(build_dir)
+    else:
+        docstore.add({i: vectorstore.docstore.search(i) for i in vectorstore.index_to_docstore_id.values()})
+    return docstore
+
+
+def _exact_vectors(vectorstore: FAISS, embeddings: Embeddings, embedding_id: str, cache_dir: Path) -> np.ndarray:
+    """
+    Original float32 vectors of a vectorstore, in position order
+
+    Lossless indexes hold them already; for compressed indexes they come from the
+    embedding store (chunks missing from it are re-embedded).
+    """
+    index = vectorstore.index
+    if is_lossless(index):
+        return reconstruct_vectors(index)
+    texts = [
+        vectorstore.docstore.search(vectorstore.index_to_docstore_id[i]).page_content
+        for i in range(index.ntotal)
+    ]
+    store = get_embedding_store(Path(cache_dir) / EMBEDDING_STORE_FILE)
+    vectors, _ = store.embed_documents(get_batch_encoder(embeddings), embedding_id, texts)
+    return np.asarray(vectors, dtype=np.float32).reshape(len(texts), index.d)
+
+
+def _save_index(vectorstore: FAISS, manifest: dict, namespace_dir: Path, index_dir: Path) -> bool:
+    """
+    Atomically replace the index directory with the given vectorstore
+
+    On success the vectorstore is switched to the saved, memory-mapped docstore.
+    """
+    # Write to a private directory first so concurrent readers never see a half-written index
+    tmp_dir = namespace_dir / f".tmp-{uuid.uuid4().hex}"
+    old_dir = namespace_dir / f".old-{uuid.uuid4().hex}"
+    try:
+        tmp_dir.mkdir(parents=True)
+        faiss.write_index(vectorstore.index, str(tmp_dir / INDEX_FILE))
+        ids = [vectorstore.index_to_docstore_id[i] for i in range(vectorstore.index.ntotal)]
+        docstore = vectorstore.docstore
+        if not isinstance(docstore, MmapDocstore):
+            docstore = MmapDocstore(tmp_dir / DOCSTORE_DATA_FILE)
+            docstore.add({i: vectorstore.docstore.search(i) for i in ids})
+        docstore.save(tmp_dir)
+        (tmp_dir / INDEX_IDS_FILE).write_text(json.dumps(ids), encoding="utf-8")
+        lexical = BM25Index.build((vectorstore.docstore.search(i).page_content for i in ids), ids_fingerprint(ids))
+        lexical.save(tmp_dir / LEXICAL_INDEX_DIR)
+        (tmp_dir / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+        for stale in namespace_dir.iterdir():
+            if stale.name != index_dir.name and not stale.name.startswith("."):
+                shutil.rmtree(stale, ignore_errors=True)
+        if index_dir.exists():
+            index_dir.rename(old_dir)
+        tmp_dir.rename(index_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+        if isinstance(vectorstore.docstore, MmapDocstore):
+            vectorstore.docstore.close()
+        vectorstore.docstore = MmapDocstore.load(index_dir)
+        print(f"✓ Saved index to cache: {manifest['name']} ({index_dir.name})")
+        return True
+    except Exception as e:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        print(f"✗ Failed to cache index {manifest['name']}: {e}")
+        return False
+
+
+def _ingest(
+    name: str,
+    vectorstore: Optional[FAISS],
+    documents: Iterable[Document],
+    embeddings: Embeddings,
+    embedding_id: str,
+    text_splitter: TextSplitter,
+    cache_dir: Path,
+    build_dir: Path,
+    near_duplicate_threshold: float = NEAR_DUPLICATE_THRESHOLD,
+) -> Tuple[FAISS, int, int]:
+    """
+    Build a flat vectorstore from documents, or bring an existing one up to date
+
+    Chunk texts are appended to a docstore file in ``build_dir`` as they are
+    embedded, so a build never holds the whole corpus in memory.
+
+    Returns:
+        Tuple of (vectorstore, chunk_count, near_duplicates_removed)
+    """
+    encoder = get_batch_encoder(embeddings)
+    encoder_stats = encoder.stats()
+    incremental = vectorstore is not None
+    existing_ids = set(vectorstore.index_to_docstore_id.values()) if incremental else set()
+    seen_ids = set()
+    added = 0
+    reused = 0
+    near_duplicates = NearDuplicateFilter(near_duplicate_threshold)
+
+    for batch in _iter_chunk_batches(documents, text_splitter, near_duplicates=near_duplicates):
+        seen_ids.update(cid for cid, _ in batch)
+        # On an incremental update only chunks the index does not hold yet are embedded
+        new = [(cid, chunk) for cid, chunk in batch if cid not in existing_ids]
+        if not new:
+            continue
+
+        vectors, batch_reused = _embed_chunks(encoder, embedding_id, [c for _, c in new], cache_dir)
+        text_embeddings = list(zip([c.page_content for _, c in new], vectors))
+        metadatas = [c.metadata for _, c in new]
+        ids = [cid for cid, _ in new]
+        if vectorstore is None:
+            docstore = MmapDocstore(build_dir / DOCSTORE_DATA_FILE)
+            vectorstore = FAISS(embeddings, faiss.IndexFlatL2(len(vectors[0])), docstore, {})
+        vectorstore.add_embeddings(text_embeddings, metadatas=metadatas, ids=ids)
+        added += len(new)
+        reused += batch_reused
+
+    if vectorstore is None:
+        raise ValueError(f"No chunks to index for {name}")
+
+    throughput = _throughput(encoder_stats, encoder.stats())
+    dropped = f", {near_duplicates.removed} near-duplicates dropped" if near_duplicates.removed else ""
+    if incremental:
+        removed = [i for i in existing_ids if i not in seen_ids]
+        if removed:
+            vectorstore.delete(removed)
+        print(
+            f"✓ Updated index: {name} (+{added} / -{len(removed)} chunks{dropped}, "
+            f"{reused} embeddings reused, {throughput})"
+        )
+    else:
+        print(f"✓ Built index: {name} ({added} chunks{dropped}, {reused} embeddings reused, {throughput})")
+
+    return vectorstore, len(seen_ids), near_duplicates.removed
+
+
+def load_or_build_vectorstore(
+    name: str,
+    content_hash: str,
+    load_documents: Callable[[], Iterable[Document]],
+    embeddings: Embeddings,
+    embedding_model: str = None,
+    chunk_size: int = None,
+    chunk_overlap: int = None,
+    index_type: str = INDEX_TYPE,
+    storage: str = VECTOR_STORAGE,
+    cache_dir: Path = INDEX_CACHE_DIR,
+    near_duplicate_threshold: float = NEAR_DUPLICATE_THRESHOLD,
+    splitter: str = SPLITTER_MODE,
+) -> Tuple[FAISS, int]:
+    """
+    Load a FAISS index from the on-disk cache, or build, update and persist it
+
+    The index is stored under ``cache_dir/name/<key>`` where the key covers the
+    embedding model and the splitter settings; changing those triggers a full
+    rebuild and stale entries are pruned. When only the source content changed
+    the cached index is updated in place at chunk level: chunks that are gone
+    are deleted, new chunks are added, and vectors for any chunk text seen
+    before are reused from the content-addressed embedding store. Chunks are
+    embedded and added in batches while the source is still being loaded.
+
+    Ingestion always works on an exact flat index; the finished index is then
+    converted to ``index_type`` with ``storage`` vectors and its search parameter
+    autotuned, reporting recall@k against exact float32 search. Changing only the
+    index type or storage converts the cached vectors without touching the source.
+    Saved indexes are opened memory-mapped when INDEX_MMAP is set. Near-duplicate
+    chunks are dropped before embedding; changing the threshold re-ingests the
+    source (reusing stored embeddings).
+
+    Args:
+        name: Cache namespace, usually the tool name
+        content_hash: Hash of the source content (see hash_file / hash_documents)
+        load_documents: Callable returning the documents to index on a cache miss;
+            may return a generator, documents are split and embedded as they arrive
+        embeddings: Embedding model used to build or query the index
+        embedding_model: Embedding model name, part of the cache key
+            (defaults to the model name of ``embeddings``)
+        chunk_size: Splitter chunk size in the splitter's unit, part of the cache key
+            (defaults to CHUNK_SIZE characters or CHUNK_TOKENS tokens)
+        chunk_overlap: Splitter chunk overlap, part of the cache key
+        index_type: "flat", "hnsw" or "ivf"
+        storage: "float32", "float16", "int8" or "pq"
+        cache_dir: Root directory of the index cache
+        near_duplicate_threshold: Estimated Jaccard similarity at which a chunk
+            is dropped as a near-duplicate of an earlier one (0 disables)
+        splitter: "characters" or "tokens" (see create_text_splitter), part of the cache key
+
+    Returns:
+        Tuple of (vectorstore, chunk_count)
+    """
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type '{index_type}', available: {', '.join(INDEX_TYPES)}")
+
+    embedding_id = _embedding_id(embeddings, embedding_model)
+    text_splitter = create_text_splitter(splitter, chunk_size, chunk_overlap)
+    index_dir = _index_dir(name, embedding_id, text_splitter, cache_dir)
+    namespace_dir = index_dir.parent
+    key = index_dir.name
+    manifest_path = index_dir / MANIFEST_FILE
+
+    vectorstore = None
+    chunk_count = None
+    near_duplicates_removed = 0
+    build_dir = namespace_dir / f".build-{uuid.uuid4().hex}"
+    if manifest_path.exists():
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            vectorstore = _load_vectorstore(index_dir, embeddings, manifest.get("index_type", "flat"))
+            same_content = (
+                manifest.get("content_hash") == content_hash
+                and manifest.get("near_duplicate_threshold", 0.0) == near_duplicate_threshold
+            )
+            if same_content:
+                same_layout = (
+                    manifest.get("index_type", "flat") == index_type
+                    and manifest.get("storage", "float32") == storage
+                )
+                if same_layout:
+                    search = manifest.get("search", {})
+                    set_search_param(vectorstore.index, search.get("param"), search.get("value"))
+                    print(f"✓ Loaded cached index: {name} ({key})")
+                    return vectorstore, manifest["chunk_count"]
+                # Same content, different index type or storage: convert without re-ingesting
+                chunk_count = manifest["chunk_count"]
+                near_duplicates_removed = manifest.get("near_duplicates_removed", 0)
+        except Exception as e:
+            print(f"✗ Cached index unreadable, rebuilding: {name} - {e}")
+            vectorstore = None
+            chunk_count = None
+
+    if chunk_count is None:
+        try:
+            if vectorstore is not None:
+                # Incremental updates go to a fresh, writable exact index
+                flat = faiss.IndexFlatL2(vectorstore.index.d)
+                flat.add(_exact_vectors(vectorstore, embeddings, embedding_id, cache_dir))
+                vectorstore.index = flat
+                vectorstore.docstore = _writable_docstore(vectorstore, build_dir)
+            vectorstore, chunk_count, near_duplicates_removed = _ingest(
+                name, vectorstore, load_documents(), embeddings, embedding_id, text_splitter,
+                cache_dir, build_dir, near_duplicate_threshold,
+            )
+        except BaseException:
+            shutil.rmtree(build_dir, ignore_errors=True)
+            raise
+
+    if index_type == "flat" and storage == "float32" and type(vectorstore.index) is faiss.IndexFlatL2:
+        tune = TuneResult("flat", "float32", bytes_per_vector("float32", vectorstore.index.d))
+    else:
+        vectors = _exact_vectors(vectorstore, embeddings, embedding_id, cache_dir)
+        if resolve_storage(storage, len(vectors)) != storage:
+            print(f"✗ Too few vectors to train {storage} storage for {name}, using int8")
+        tune = apply_index_type(vectorstore, index_type, storage, vectors)
+    if tune.param or tune.storage != "float32":
+        search = f"{tune.param}={tune.value}, " if tune.param else ""
+        full_size = bytes_per_vector("float32", vectorstore.index.d)
+        print(
+            f"{'✓' if tune.met_target else '✗'} Tuned {tune.index_type}/{tune.storage} index: {name} "
+            f"({search}recall@k={tune.recall:.3f} vs exact float32, p95={tune.p95_ms:.2f}ms, "
+            f"{tune.bytes_per_vector}/{full_size} bytes per vector)"
+        )
+
+    manifest = {
+        "name": name,
+        "content_hash": content_hash,
+        "embedding_model": embedding_id,
+        "splitter": splitter_cache_id(text_splitter),
+        "chunk_size": text_splitter._chunk_size,
+        "chunk_overlap": text_splitter._chunk_overlap,
+        "chunk_count": chunk_count,
+        "near_duplicate_threshold": near_duplicate_threshold,
+        "near_duplicates_removed": near_duplicates_removed,
+        "index_type": index_type,
+        "storage": storage,
+        "search": tune.to_dict(),
+    }
+    if _save_index(vectorstore, manifest, namespace_dir, index_dir):
+        # The vectorstore now reads from the saved docstore; on failure it keeps the build files
+        shutil.rmtree(build_dir, ignore_errors=True)
+
+    return vectorstore, chunk_count
+
+
+def load_or_build_lexical_index(
+    vectorstore: FAISS,
+    name: str,
+    embeddings: Embeddings,
+    embedding_model: str = None,
+    chunk_size: int = None,
+    chunk_overlap: int = None,
+    cache_dir: Path = INDEX_CACHE_DIR,
+    splitter: str = SPLITTER_MODE,
+) -> BM25Index:
+    """
+    Load the BM25 index saved with a cached vectorstore
+
+    The saved index is only used when it covers exactly the vectorstore's chunks,
+    in position order; otherwise it is rebuilt from the docstore (and saved when
+    the cached index directory holds those same chunks).
+
+    Args:
+        vectorstore: Vectorstore returned by load_or_build_vectorstore
+        name, embeddings, embedding_model, chunk_size, chunk_overlap, cache_dir, splitter:
+            The arguments the vectorstore was loaded with
+
+    Returns:
+        BM25Index addressed by the vectorstore's index positions
+    """
+    text_splitter = create_text_splitter(splitter, chunk_size, chunk_overlap)
+    index_dir = _index_dir(name, _embedding_id(embeddings, embedding_model), text_splitter, cache_dir)
+    ids = [vectorstore.index_to_docstore_id[i] for i in range(vectorstore.index.ntotal)]
+    fingerprint = ids_fingerprint(ids)
+    try:
+        lexical = BM25Index.load(index_dir / LEXICAL_INDEX_DIR)
+        if lexical.fingerprint == fingerprint:
+            return lexical
+    except (OSError, ValueError, KeyError):
+        pass
+
+    lexical = BM25Index.build((vectorstore.docstore.search(i).page_content for i in ids), fingerprint)
+    try:
+        saved_ids = json.loads((index_dir / INDEX_IDS_FILE).read_text(encoding="utf-8"))
+        if ids_fingerprint(saved_ids) == fingerprint:
+            lexical.save(index_dir / LEXICAL_INDEX_DIR)
+    except (OSError, ValueError) as e:
+        print(f"✗ Failed to cache BM25 index {name}: {e}")
+    return lexical
@@ -0,0 +1,61 @@
+"""
+Parallel - Bounded process-pool mapping shared by the ingestion pipelines
+"""
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, Tuple
+
+# Start method of every ingestion and encoding pool: pools are started from builder
+# threads of a process that already runs torch and tokenizer threads, and forking
+# such a process can deadlock the child
+PROCESS_CONTEXT = multiprocessing.get_context("spawn")
+
+
+def iter_process_map(
+    fn: Callable,
+    args_iter: Iterable[Tuple],
+    workers: int,
+    max_in_flight: int = None,
+) -> Iterator:
+    """
+    Run ``fn(*args)`` in a process pool and yield results in submission order
+
+    Only ``max_in_flight`` tasks (default ``2 * workers``) are submitted at a time,
+    so results never pile up faster than the caller consumes them. Results come
+    back in the order of ``args_iter`` however the workers finish, so every run
+    over the same inputs sees the same sequence. With a single worker everything
+    runs in the calling process.
+
+    Workers are spawned, not forked, so ``fn`` and its arguments must be
+    picklable and ``fn`` importable at module level.
+
+    Args:
+        fn: Top-level (picklable) function to run
+        args_iter: Argument tuples, one per task
+        workers: Number of worker processes
+        max_in_flight: Maximum number of submitted but unconsumed tasks
+
+    Yields:
+        Task results in submission order
+    """
+    if workers <= 1:
+        for args in args_iter:
+            yield fn(*args)
+        return
+
+    max_in_flight = max_in_flight or 2 * workers
+    remaining = iter(args_iter)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=PROCESS_CONTEXT) as executor:
+        pending = deque()
+
+        def fill():
+            for args in remaining:
+                pending.append(executor.submit(fn, *args))
+                if len(pending) >= max_in_flight:
+                    break
+
+        fill()
+        while pending:
+            yield pending.popleft().result()
+            fill()
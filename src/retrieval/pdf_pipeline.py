@@ -0,0 +1,122 @@
+"""
+PDF Pipeline - Streaming, page-parallel PDF parsing with pluggable parser backends
+"""
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from langchain_core.documents import Document
+
+from configuration.configuration import PDF_PARSER, PDF_PARSE_WORKERS, PDF_PAGES_PER_TASK
+from src.retrieval.parallel import iter_process_map
+
+
+# ==================== Parser Backends ====================
+# Backends are pairs of top-level functions so they can be shipped to worker processes:
+#   page_count(path) -> int
+#   extract_pages(path, page_numbers) -> [(page_number, text), ...]
+
+def _pypdf_page_count(path: str) -> int:
+    from pypdf import PdfReader
+    return len(PdfReader(path).pages)
+
+
+def _pypdf_extract_pages(path: str, page_numbers: List[int]) -> List[Tuple[int, str]]:
+    from pypdf import PdfReader
+    reader = PdfReader(path)
+    return [(i, reader.pages[i].extract_text() or "") for i in page_numbers]
+
+
+def _pymupdf_page_count(path: str) -> int:
+    import pymupdf
+    with pymupdf.open(path) as doc:
+        return doc.page_count
+
+
+def _pymupdf_extract_pages(path: str, page_numbers: List[int]) -> List[Tuple[int, str]]:
+    import pymupdf
+    with pymupdf.open(path) as doc:
+        return [(i, doc[i].get_text()) for i in page_numbers]
+
+
+def _pdfium_page_count(path: str) -> int:
+    import pypdfium2
+    pdf = pypdfium2.PdfDocument(path)
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def _pdfium_extract_pages(path: str, page_numbers: List[int]) -> List[Tuple[int, str]]:
+    import pypdfium2
+    pdf = pypdfium2.PdfDocument(path)
+    try:
+        return [(i, pdf[i].get_textpage().get_text_range()) for i in page_numbers]
+    finally:
+        pdf.close()
+
+
+PDF_PARSERS: Dict[str, Tuple[Callable, Callable]] = {
+    "pypdf": (_pypdf_page_count, _pypdf_extract_pages),
+    "pymupdf": (_pymupdf_page_count, _pymupdf_extract_pages),
+    "pdfium": (_pdfium_page_count, _pdfium_extract_pages),
+}
+
+
+def register_pdf_parser(name: str, page_count: Callable, extract_pages: Callable):
+    """
+    Register a PDF parser backend
+
+    Args:
+        name: Backend name, selectable through PDF_PARSER
+        page_count: Top-level function (path) -> number of pages
+        extract_pages: Top-level function (path, page_numbers) -> [(page_number, text)]
+    """
+    PDF_PARSERS[name] = (page_count, extract_pages)
+
+
+def get_pdf_parser(name: str = PDF_PARSER) -> Tuple[Callable, Callable]:
+    """Get the (page_count, extract_pages) functions of a parser backend"""
+    if name not in PDF_PARSERS:
+        raise ValueError(f"Unknown PDF parser '{name}', available: {', '.join(PDF_PARSERS)}")
+    return PDF_PARSERS[name]
+
+
+def iter_pdf_pages(
+    pdf_path,
+    parser: str = PDF_PARSER,
+    workers: int = PDF_PARSE_WORKERS,
+    pages_per_task: int = PDF_PAGES_PER_TASK,
+) -> Iterator[Document]:
+    """
+    Stream the pages of a PDF as documents, parsing page ranges in a process pool
+
+    At most ``2 * workers`` page ranges are in flight, so only a bounded number of
+    parsed pages is held in memory; pages are yielded as their range finishes.
+
+    Args:
+        pdf_path: Path to the PDF file
+        parser: Name of the parser backend (see PDF_PARSERS)
+        workers: Number of worker processes (1 parses in the calling process)
+        pages_per_task: Number of pages parsed per task
+
+    Yields:
+        One Document per page with source, page and total_pages metadata
+    """
+    page_count, extract_pages = get_pdf_parser(parser)
+
+    path = str(Path(pdf_path))
+    total_pages = page_count(path)
+    ranges = [list(range(start, min(start + pages_per_task, total_pages)))
+              for start in range(0, total_pages, pages_per_task)]
+
+    def to_documents(pages: List[Tuple[int, str]]) -> Iterator[Document]:
+        for page_number, text in pages:
+            yield Document(
+                page_content=text,
+                metadata={"source": path, "page": page_number, "total_pages": total_pages},
+            )
+
+    workers = max(1, min(workers, len(ranges)))
+    for pages in iter_process_map(extract_pages, ((path, r) for r in ranges), workers):
+        yield from to_documents(pages)
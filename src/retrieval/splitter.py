@@ -0,0 +1,263 @@
+"""
+Splitter - Single-pass text splitter sizing chunks in model tokens
+"""
+import re
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_text_splitters import RecursiveCharacterTextSplitter, TextSplitter
+
+from configuration.configuration import (
+    EMBEDDING_MODEL,
+    LLM_TOKENIZER,
+    CHUNK_SIZE,
+    CHUNK_OVERLAP,
+    SPLITTER_MODE,
+    SPLITTER_TOKENIZER,
+    CHUNK_TOKENS,
+    CHUNK_OVERLAP_TOKENS,
+    PDF_FILE,
+)
+
+SPLITTER_MODES = ("characters", "tokens")
+SPLITTER_TOKENIZERS = ("embedding", "llm")
+
+# Rough BPE-like pieces, used when no model tokenizer can be loaded
+_APPROX_TOKEN = re.compile(r"[A-Za-z]{1,6}|\d{1,3}|[^\sA-Za-z\d]")
+_NEWLINE = ord("\n")
+_SENTENCE_END = np.array([ord(c) for c in ".!?"], dtype=np.uint32)
+_WHITESPACE = np.array([ord(c) for c in " \t\n\r\f\v"], dtype=np.uint32)
+# Tokens all-MiniLM-L6-v2 embeds (max_seq_length 256 minus [CLS] and [SEP]); the rest is truncated
+EMBEDDING_MAX_TOKENS = 254
+
+
+class TokenCounter:
+    """
+    Character offsets and counts of the tokens of a model tokenizer
+
+    Wraps a Hugging Face ``tokenizers`` tokenizer (no special tokens, no
+    truncation), or a regular-expression approximation when ``tokenizer`` is None.
+    """
+
+    def __init__(self, name: str, tokenizer=None):
+        self.name = name
+        self.tokenizer = tokenizer
+        if tokenizer is not None:
+            tokenizer.no_truncation()
+            tokenizer.no_padding()
+
+    def offsets(self, text: str) -> np.ndarray:
+        """(start, end) character offsets of every token, shape (n, 2)"""
+        if self.tokenizer is None:
+            spans = [m.span() for m in _APPROX_TOKEN.finditer(text)]
+        else:
+            spans = self.tokenizer.encode(text, add_special_tokens=False).offsets
+        return np.array(spans, dtype=np.int64).reshape(-1, 2)
+
+    def count(self, text: str) -> int:
+        """Number of tokens in a text"""
+        if self.tokenizer is None:
+            return sum(1 for _ in _APPROX_TOKEN.finditer(text))
+        return len(self.tokenizer.encode(text, add_special_tokens=False).ids)
+
+
+_COUNTERS: Dict[str, TokenCounter] = {}
+_COUNTERS_LOCK = threading.Lock()
+
+
+def get_token_counter(kind: str = SPLITTER_TOKENIZER) -> TokenCounter:
+    """
+    Get the shared token counter of the embedding model or the LLM
+
+    Args:
+        kind: "embedding" (EMBEDDING_MODEL) or "llm" (LLM_TOKENIZER)
+
+    Returns:
+        TokenCounter (an approximate one if the tokenizer cannot be loaded)
+    """
+    if kind not in SPLITTER_TOKENIZERS:
+        raise ValueError(f"Unknown tokenizer '{kind}', available: {', '.join(SPLITTER_TOKENIZERS)}")
+    with _COUNTERS_LOCK:
+        if kind not in _COUNTERS:
+            model = EMBEDDING_MODEL if kind == "embedding" else LLM_TOKENIZER
+            try:
+                from tokenizers import Tokenizer
+
+                _COUNTERS[kind] = TokenCounter(model, Tokenizer.from_pretrained(model))
+            except Exception as e:
+                print(f"✗ Tokenizer {model} unavailable, approximating token counts: {e}")
+                _COUNTERS[kind] = TokenCounter(f"approx:{model}")
+        return _COUNTERS[kind]
+
+
+def _boundary_scores(text: str, starts: np.ndarray) -> np.ndarray:
+    """
+    How good a chunk boundary the start of every token is
+
+    3 after a blank line, 2 after a line break, 1 after a sentence end,
+    0.5 after other whitespace and 0 inside a word.
+    """
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    # Two newlines of padding make the first token a paragraph start
+    padded = np.concatenate([np.full(2, _NEWLINE, dtype=np.uint32), codes, np.zeros(1, dtype=np.uint32)])
+    before2, before1, first = padded[starts], padded[starts + 1], padded[starts + 2]
+    newlines = (before2 == _NEWLINE).astype(np.int8) + (before1 == _NEWLINE) + (first == _NEWLINE)
+    space1, space0 = np.isin(before1, _WHITESPACE), np.isin(first, _WHITESPACE)
+    sentence = (space1 & np.isin(before2, _SENTENCE_END)) | (space0 & np.isin(before1, _SENTENCE_END))
+    scores = np.where(space1 | space0, 0.5, 0.0)
+    scores[sentence] = 1.0
+    scores[newlines == 1] = 2.0
+    scores[newlines >= 2] = 3.0
+    return scores
+
+
+class TokenAwareTextSplitter(TextSplitter):
+    """
+    Splits text into chunks of at most ``chunk_size`` model tokens in one pass
+
+    The text is tokenized once with character offsets; every chunk then takes up
+    to ``chunk_size`` tokens and ends at the best boundary (paragraph, line,
+    sentence, word) within the second half of that window, and the next chunk
+    starts ``chunk_overlap`` tokens earlier on a word start. Unlike the recursive
+    character splitter, nothing is re-split or re-measured, so the cost is linear
+    in the text and every chunk fits the model's token budget.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = CHUNK_TOKENS,
+        chunk_overlap: int = CHUNK_OVERLAP_TOKENS,
+        counter: Optional[TokenCounter] = None,
+        **kwargs,
+    ):
+        self.counter = counter or get_token_counter()
+        super().__init__(chunk_size=chunk_size, chunk_overlap=chunk_overlap, length_function=self.counter.count, **kwargs)
+
+    @property
+    def cache_id(self) -> str:
+        """Identifier of the chunks this splitter produces, part of the index cache key"""
+        return f"tokens:{self.counter.name}"
+
+    def split_text(self, text: str) -> List[str]:
+        offsets = self.counter.offsets(text)
+        n = len(offsets)
+        if n == 0:
+            return []
+        scores = _boundary_scores(text, offsets[:, 0])
+        size, overlap = self._chunk_size, self._chunk_overlap
+
+        chunks = []
+        start = 0
+        while start < n:
+            end = min(start + size, n)
+            if end < n:
+                # Latest best-scoring boundary in the second half of the window
+                window = scores[start + size // 2 + 1:end + 1][::-1]
+                end = end - int(np.argmax(window))
+            chunk = text[offsets[start, 0]:offsets[end - 1, 1]].strip()
+            if chunk:
+                chunks.append(chunk)
+            if end >= n:
+                break
+            next_start = max(end - overlap, start + 1)
+            while next_start < end and scores[next_start] == 0:
+                next_start += 1
+            start = next_start
+        return chunks
+
+
+def create_text_splitter(
+    mode: str = SPLITTER_MODE,
+    chunk_size: Optional[int] = None,
+    chunk_overlap: Optional[int] = None,
+) -> TextSplitter:
+    """
+    Create the text splitter used for ingestion
+
+    Args:
+        mode: "characters" or "tokens"
+        chunk_size: Chunk size in the mode's unit (defaults from config)
+        chunk_overlap: Chunk overlap in the mode's unit (defaults from config)
+
+    Returns:
+        RecursiveCharacterTextSplitter or TokenAwareTextSplitter
+    """
+    if mode not in SPLITTER_MODES:
+        raise ValueError(f"Unknown splitter mode '{mode}', available: {', '.join(SPLITTER_MODES)}")
+    if mode == "tokens":
+        return TokenAwareTextSplitter(
+            CHUNK_TOKENS if chunk_size is None else chunk_size,
+            CHUNK_OVERLAP_TOKENS if chunk_overlap is None else chunk_overlap,
+        )
+    return RecursiveCharacterTextSplitter(
+        chunk_size=CHUNK_SIZE if chunk_size is None else chunk_size,
+        chunk_overlap=CHUNK_OVERLAP if chunk_overlap is None else chunk_overlap,
+    )
+
+
+def splitter_cache_id(text_splitter: TextSplitter) -> str:
+    """Identifier of a splitter's chunking scheme ("characters" for the recursive splitter)"""
+    return getattr(text_splitter, "cache_id", "characters")
+
+
+def benchmark_splitters(pdf_path=PDF_FILE, repeat: int = 3) -> List[Tuple[str, dict]]:
+    """
+    Compare the character splitter with the token splitter on a PDF
+
+    Three splitters are timed: the current character splitter, the recursive
+    splitter measuring every candidate chunk in tokens (the usual way to size
+    chunks in tokens), and the single-pass token splitter. Chunk sizes are
+    measured with the embedding model's tokenizer; the model silently truncates
+    chunks longer than EMBEDDING_MAX_TOKENS.
+
+    Returns:
+        List of (splitter, stats) with best-of-``repeat`` split time, chunk count
+        and token statistics
+    """
+    from src.retrieval.pdf_pipeline import iter_pdf_pages
+
+    text = "\n\n".join(doc.page_content for doc in iter_pdf_pages(pdf_path))
+    counter = get_token_counter("embedding")
+    results = []
+    splitters = (
+        ("characters", create_text_splitter("characters")),
+        ("recursive-tokens", RecursiveCharacterTextSplitter(
+            chunk_size=CHUNK_TOKENS, chunk_overlap=CHUNK_OVERLAP_TOKENS, length_function=counter.count,
+        )),
+        ("tokens", create_text_splitter("tokens")),
+    )
+    for name, splitter in splitters:
+        seconds = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            chunks = splitter.split_text(text)
+            seconds.append(time.perf_counter() - start)
+        tokens = np.array([counter.count(chunk) for chunk in chunks])
+        results.append((name, {
+            "seconds": min(seconds),
+            "chunks": len(chunks),
+            "mean_tokens": float(tokens.mean()),
+            "max_tokens": int(tokens.max()),
+            "over_limit": int((tokens > EMBEDDING_MAX_TOKENS).sum()),
+            "tokens_per_second": len(counter.offsets(text)) / min(seconds),
+        }))
+    return results
+
+
+def main():
+    """Benchmark the splitters on the bundled whitepaper (or a PDF given on the command line)"""
+    pdf_path = sys.argv[1] if len(sys.argv) > 1 else PDF_FILE
+    print(f"Splitting {pdf_path}")
+    for name, stats in benchmark_splitters(pdf_path):
+        print(
+            f"{name:>16}: {stats['seconds'] * 1000:7.1f} ms, {stats['chunks']} chunks, "
+            f"{stats['mean_tokens']:.0f} mean / {stats['max_tokens']} max tokens, "
+            f"{stats['over_limit']} over the embedding limit, {stats['tokens_per_second']:,.0f} tokens/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
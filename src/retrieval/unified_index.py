@@ -0,0 +1,391 @@
+"""
+Unified Index - One shared FAISS index over every local source, searched through per-source views
+"""
+import asyncio
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+from langchain_core.callbacks import AsyncCallbackManagerForRetrieverRun, CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+
+from configuration.configuration import (
+    RETRIEVER_K,
+    INDEX_TYPE,
+    VECTOR_STORAGE,
+    SEARCH_BATCH_WINDOW_MS,
+    SEARCH_WORKERS,
+    UNIFIED_FETCH_FACTOR,
+    RETRIEVAL_MODE,
+)
+from configuration.embeddings import get_embeddings
+from src.retrieval.ann import filtered_search
+from src.retrieval.bm25 import reciprocal_rank_fusion
+from src.retrieval.index_cache import SOURCE_TAG_KEY, load_or_build_lexical_index, load_or_build_vectorstore
+
+UNIFIED_INDEX_NAME = "local_sources"
+RETRIEVAL_MODES = ("dense", "hybrid")
+# Metadata key of the query similarity attached to every retrieved chunk
+SIMILARITY_KEY = "similarity"
+# Async searches run their batches here rather than in the event loop's default executor,
+# so retrieval never queues behind other blocking work of the loop
+_SEARCH_EXECUTOR = ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix="unified-index")
+# Batch-serving tasks of async searches, referenced until done (the loop only keeps weak references)
+_SERVE_TASKS: "set[asyncio.Task]" = set()
+
+
+def similarity_from_distance(distance: float) -> float:
+    """Cosine similarity of unit vectors from their squared L2 distance (the model emits unit vectors)"""
+    return 1.0 - distance / 2.0
+
+
+@dataclass
+class LocalSource:
+    """A local source registered with the unified index"""
+    name: str
+    content_hash: str
+    load_documents: Callable[[], Iterable[Document]]
+
+
+class _SearchRequest:
+    """One pending source search, answered by the batch it joins"""
+
+    def __init__(self, query: str, source: str, k: int, future: Optional[asyncio.Future] = None):
+        self.query = query
+        self.source = source
+        self.k = k
+        self.result: List[Document] = []
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+        # Set for requests awaited on an event loop; completed from whichever thread runs the batch
+        self.future = future
+
+    def finish(self):
+        self.done.set()
+        if self.future is not None:
+            self.future.get_loop().call_soon_threadsafe(self._resolve)
+
+    def _resolve(self):
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class UnifiedIndex:
+    """
+    One FAISS index over all local sources; each source is a filtered view of it
+
+    Sources register a content hash and a document loader; build() indexes all of
+    them together, tagging every chunk with its source (unchanged sources keep
+    their chunks and vectors on updates). A search arriving while no other one is
+    being served runs at once; while one is, searches arriving within a short
+    window are served together: each distinct query is embedded once and all of them go
+    through a single batched index search whose hits are split by source. A source
+    that gets fewer than k hits from that shared search is topped up with a search
+    restricted to its own chunks. In hybrid mode the dense ranking of a source is
+    fused with a BM25 ranking over the same chunks by reciprocal rank fusion, so
+    exact identifiers and rare terms surface even when embeddings miss them.
+    Every returned chunk carries its cosine similarity to the query in the
+    SIMILARITY_KEY metadata, so callers can judge relevance without an LLM.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        name: str = UNIFIED_INDEX_NAME,
+        index_type: str = INDEX_TYPE,
+        storage: str = VECTOR_STORAGE,
+        batch_window_ms: float = SEARCH_BATCH_WINDOW_MS,
+        fetch_factor: int = UNIFIED_FETCH_FACTOR,
+        retrieval_mode: str = RETRIEVAL_MODE,
+    ):
+        if retrieval_mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode {retrieval_mode!r}, expected one of {RETRIEVAL_MODES}")
+        self.embeddings = embeddings
+        self.name = name
+        self.index_type = index_type
+        self.storage = storage
+        self.batch_window_ms = batch_window_ms
+        self.fetch_factor = max(1, fetch_factor)
+        self.retrieval_mode = retrieval_mode
+        self._sources: Dict[str, LocalSource] = {}
+        self._build_lock = threading.RLock()
+        self._dirty = True
+        self._chunk_count = 0
+        self._version: Optional[str] = None
+        # (vectorstore, BM25 index or None, source code of every position, positions and code of every source),
+        # swapped atomically
+        self._state = None
+        self._pending: List[_SearchRequest] = []
+        self._pending_lock = threading.Lock()
+        # Batches being served; while any are, a new batch waits the window for more searches
+        self._serving = 0
+
+    @property
+    def sources(self) -> List[str]:
+        """Names of the registered sources"""
+        return sorted(self._sources)
+
+    def register(self, name: str, content_hash: str, load_documents: Callable[[], Iterable[Document]]):
+        """
+        Register a local source (or update its content hash)
+
+        Args:
+            name: Source tag, usually the name of the tool searching it
+            content_hash: Hash of the source content (see hash_file / hash_documents)
+            load_documents: Callable returning the source documents
+        """
+        with self._build_lock:
+            previous = self._sources.get(name)
+            self._sources[name] = LocalSource(name, content_hash, load_documents)
+            if previous is None or previous.content_hash != content_hash:
+                self._dirty = True
+
+    @property
+    def version(self) -> Optional[str]:
+        """Content hash the live index was built from (None before the first build)"""
+        return self._version
+
+    def content_hash(self) -> str:
+        """Combined hash of all registered sources"""
+        sha = hashlib.sha256()
+        for name in self.sources:
+            sha.update(f"{name}|{self._sources[name].content_hash}\n".encode("utf-8"))
+        return sha.hexdigest()
+
+    def _iter_documents(self, sources: List[LocalSource]) -> Iterator[Document]:
+        for source in sources:
+            for doc in source.load_documents():
+                doc.metadata = {**doc.metadata, SOURCE_TAG_KEY: source.name}
+                yield doc
+
+    def build(self) -> int:
+        """
+        Build or update the shared index for the registered sources
+
+        Returns:
+            Number of chunks in the index (nothing is rebuilt when up to date)
+        """
+        with self._build_lock:
+            if not self._dirty:
+                return self._chunk_count
+            sources = [self._sources[name] for name in self.sources]
+            if not sources:
+                raise ValueError("No local sources registered")
+
+            content_hash = self.content_hash()
+            vectorstore, chunk_count = load_or_build_vectorstore(
+                self.name,
+                content_hash,
+                lambda: self._iter_documents(sources),
+                self.embeddings,
+                index_type=self.index_type,
+                storage=self.storage,
+            )
+            codes = {name: code for code, name in enumerate(self.sources)}
+            ids = vectorstore.index_to_docstore_id
+            position_source = np.array(
+                [codes.get(ids[i].split(":", 1)[0], -1) for i in range(vectorstore.index.ntotal)],
+                dtype=np.int32,
+            )
+            positions = {name: np.flatnonzero(position_source == code) for name, code in codes.items()}
+            lexical = None
+            if self.retrieval_mode == "hybrid":
+                lexical = load_or_build_lexical_index(vectorstore, self.name, self.embeddings)
+            self._state = (vectorstore, lexical, position_source, positions, codes)
+            self._chunk_count = chunk_count
+            self._version = content_hash
+            self._dirty = False
+
+            counts = ", ".join(f"{name}: {len(positions[name])}" for name in self.sources)
+            print(f"✓ Unified index ready: {self.name} ({chunk_count} chunks - {counts}, {self.retrieval_mode})")
+            return chunk_count
+
+    def search(self, query: str, source: str, k: int = RETRIEVER_K) -> List[Document]:
+        """
+        Top-k chunks of one source for a query, batched with concurrent searches
+
+        Args:
+            query: Search query
+            source: Source tag to search
+            k: Number of chunks to return
+
+        Returns:
+            Matching documents, most similar first
+        """
+        if self._dirty:
+            self.build()
+
+        request = _SearchRequest(query, source, k)
+        window = self._enqueue(request)
+        if window is not None:
+            # The first request of a batch collects concurrent tool calls for the window, then serves them all
+            try:
+                if window:
+                    time.sleep(window)
+            finally:
+                self._serve()
+
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    async def asearch(self, query: str, source: str, k: int = RETRIEVER_K) -> List[Document]:
+        """
+        Async version of search: waits for the batch on the event loop instead of blocking a thread
+
+        Searches from coroutines and from threads join the same batches; the
+        embedding and index search of a batch run on the search executor. A batch
+        is served by a task of its own, so cancelling the search that opened it
+        never leaves the other requests of the batch waiting.
+        """
+        loop = asyncio.get_running_loop()
+        if self._dirty:
+            await loop.run_in_executor(_SEARCH_EXECUTOR, self.build)
+
+        request = _SearchRequest(query, source, k, loop.create_future())
+        window = self._enqueue(request)
+        if window is not None:
+            task = loop.create_task(self._aserve(window))
+            _SERVE_TASKS.add(task)
+            task.add_done_callback(_SERVE_TASKS.discard)
+
+        await request.future
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    async def _aserve(self, window: float):
+        """Wait the batch window on the event loop, then answer every pending request on the search executor"""
+        if window:
+            await asyncio.sleep(window)
+        await asyncio.get_running_loop().run_in_executor(_SEARCH_EXECUTOR, self._serve)
+
+    def _enqueue(self, request: _SearchRequest) -> Optional[float]:
+        """
+        Add a request to the pending batch
+
+        Returns:
+            None if another request already leads the batch; otherwise the seconds
+            to wait for more requests before serving it (0 when no search is in flight)
+        """
+        with self._pending_lock:
+            self._pending.append(request)
+            if len(self._pending) > 1:
+                return None
+            return self.batch_window_ms / 1000 if self._serving else 0.0
+
+    def _serve(self):
+        """Answer every pending request"""
+        with self._pending_lock:
+            batch, self._pending = self._pending, []
+            self._serving += 1
+        try:
+            self._run_batch(batch)
+        except Exception as e:
+            for pending in batch:
+                pending.error = e
+        finally:
+            with self._pending_lock:
+                self._serving -= 1
+            for pending in batch:
+                pending.finish()
+
+    def _run_batch(self, batch: List[_SearchRequest]):
+        """Embed each distinct query once and answer every request from one index search"""
+        vectorstore, lexical, position_source, positions, codes = self._state
+        index = vectorstore.index
+
+        queries = list(dict.fromkeys(request.query for request in batch))
+        rows = {query: row for row, query in enumerate(queries)}
+        vectors = np.array([self.embeddings.embed_query(q) for q in queries], dtype=np.float32)
+
+        fetch_k = min(index.ntotal, max(r.k for r in batch) * max(1, len(positions)) * self.fetch_factor)
+        distances, found = index.search(vectors, fetch_k)
+
+        for request in batch:
+            allowed = positions.get(request.source)
+            if allowed is None or not len(allowed):
+                request.result = []
+                continue
+            row = rows[request.query]
+            code = codes[request.source]
+            row_distances = {int(p): float(d) for p, d in zip(found[row], distances[row]) if p >= 0}
+            # Hybrid mode fuses deeper rankings than the k results it returns
+            depth = request.k * self.fetch_factor if lexical is not None else request.k
+            hits = [p for p in found[row] if p >= 0 and position_source[p] == code][:depth]
+            if len(hits) < min(request.k, len(allowed)):
+                fallback_distances, hits = filtered_search(index, vectors[row], allowed, depth)
+                row_distances.update(zip(hits.tolist(), fallback_distances.tolist()))
+            if lexical is not None:
+                lexical_hits, _ = lexical.search(request.query, depth, position_source == code)
+                hits = reciprocal_rank_fusion([hits, lexical_hits])
+            hits = [int(p) for p in hits[:request.k]]
+            missing = [p for p in hits if p not in row_distances]
+            if missing:
+                # Hits found only by BM25 are scored against the query vector as well
+                missing_distances, scored = filtered_search(index, vectors[row], np.array(missing), len(missing))
+                row_distances.update(zip(scored.tolist(), missing_distances.tolist()))
+            request.result = [self._document(vectorstore, p, row_distances.get(p)) for p in hits]
+
+    @staticmethod
+    def _document(vectorstore, position: int, distance: Optional[float]) -> Document:
+        """Chunk at an index position, with its query similarity when known"""
+        doc = vectorstore.docstore.search(vectorstore.index_to_docstore_id[position])
+        metadata = dict(doc.metadata)
+        if distance is not None:
+            metadata[SIMILARITY_KEY] = round(similarity_from_distance(distance), 4)
+        return Document(id=doc.id, page_content=doc.page_content, metadata=metadata)
+
+    def as_retriever(self, source: str, k: int = RETRIEVER_K) -> "SourceRetriever":
+        """Retriever searching only the chunks of one source"""
+        return SourceRetriever(index=self, source=source, k=k)
+
+
+class SourceRetriever(BaseRetriever):
+    """Retriever over one source of a unified index"""
+
+    index: Any
+    source: str
+    k: int = RETRIEVER_K
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        return self.index.search(query, self.source, self.k)
+
+    async def _aget_relevant_documents(
+        self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return await self.index.asearch(query, self.source, self.k)
+
+
+_UNIFIED_INDEX: Optional[UnifiedIndex] = None
+_UNIFIED_INDEX_LOCK = threading.Lock()
+
+
+def get_unified_index() -> UnifiedIndex:
+    """Get the shared index of the local sources"""
+    global _UNIFIED_INDEX
+    with _UNIFIED_INDEX_LOCK:
+        if _UNIFIED_INDEX is None:
+            _UNIFIED_INDEX = UnifiedIndex(get_embeddings())
+        return _UNIFIED_INDEX
+
+
+def build_unified_index() -> Optional[int]:
+    """
+    Build the shared index of the registered local sources
+
+    Returns:
+        Number of chunks, or None if the build failed
+    """
+    try:
+        return get_unified_index().build()
+    except Exception as e:
+        print(f"✗ Failed to build the local source index: {e}")
+        return None
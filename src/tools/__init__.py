@@ -7,6 +7,9 @@ from .duckgo_search_tool import create_duckgo_search_tool
 from .url_retriever_tool import create_url_retriever_tool
 from .pdf_retriever_tool import create_pdf_retriever_tool
 from .text_retriever_tool import create_text_retriever_tool
+from .corpus_retriever_tool import create_corpus_retriever_tool
+from .source_tool import make_source_tool
+from .tool_registry import ToolRegistry, ToolSpec
 
 __all__ = [
     "create_wikipedia_tool",
@@ -15,4 +18,8 @@ __all__ = [
     "create_url_retriever_tool",
     "create_pdf_retriever_tool",
     "create_text_retriever_tool",
+    "create_corpus_retriever_tool",
+    "make_source_tool",
+    "ToolRegistry",
+    "ToolSpec",
 ]
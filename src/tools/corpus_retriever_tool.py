@@ -0,0 +1,53 @@
+"""
+Corpus Retriever Tool - Knowledge base directory search
+"""
+from pathlib import Path
+
+from src.retrieval import UnifiedIndex, fingerprint_corpus, iter_corpus_documents, list_corpus_files
+from src.tools.source_tool import make_source_tool
+
+
+def create_corpus_retriever_tool(
+    corpus_dir: str,
+    name: str = "knowledge_base_search",
+    description: str = "Search the local knowledge base documents. Use for questions about topics covered by the knowledge base files.",
+    index: UnifiedIndex = None,
+):
+    """
+    Create a retriever tool from a directory tree of PDF, text and markdown files
+    
+    Args:
+        corpus_dir: Root directory of the corpus
+        name: Tool name
+        description: Tool description shown to the agent
+        index: Shared local source index (defaults to get_unified_index())
+        
+    Returns:
+        Retriever tool or None if failed
+    """
+    try:
+        corpus_path = Path(corpus_dir)
+        
+        if not corpus_path.is_dir():
+            print(f"✗ Corpus directory not found: {corpus_dir}")
+            return None
+        
+        files = list_corpus_files(corpus_path)
+        if not files:
+            print(f"✗ No corpus files found in: {corpus_dir}")
+            return None
+        
+        corpus_retriever_tool = make_source_tool(
+            index,
+            name,
+            fingerprint_corpus(corpus_path, files),
+            lambda: iter_corpus_documents(corpus_path, files),
+            description,
+        )
+        
+        print(f"✓ Corpus Retriever Tool created ({len(files)} files, shared local index)")
+        return corpus_retriever_tool
+        
+    except Exception as e:
+        print(f"✗ Failed to create corpus retriever: {e}")
+        return None
@@ -2,19 +2,18 @@
 PDF Retriever Tool - Agent Quality Whitepaper search
 """
 from pathlib import Path
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_community.vectorstores import FAISS
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_core.tools.retriever import create_retriever_tool
 
+from src.retrieval import UnifiedIndex, hash_file, iter_pdf_pages
+from src.tools.source_tool import make_source_tool
 
-def create_pdf_retriever_tool(pdf_path: str):
+
+def create_pdf_retriever_tool(pdf_path: str, index: UnifiedIndex = None):
     """
     Create a retriever tool from a PDF file
     
     Args:
         pdf_path: Path to the PDF file
+        index: Shared local source index (defaults to get_unified_index())
         
     Returns:
         Retriever tool or None if failed
@@ -26,25 +25,15 @@ def create_pdf_retriever_tool(pdf_path: str):
             print(f"✗ PDF not found: {pdf_path}")
             return None
         
-        loader = PyPDFLoader(str(pdf_file))
-        pdf_docs = loader.load()
-        
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
-        pdf_splits = text_splitter.split_documents(pdf_docs)
-        
-        pdf_vectorstore = FAISS.from_documents(
-            documents=pdf_splits,
-            embedding=HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
-        )
-        pdf_retriever = pdf_vectorstore.as_retriever(search_kwargs={"k": 4})
-        
-        pdf_retriever_tool = create_retriever_tool(
-            pdf_retriever,
+        pdf_retriever_tool = make_source_tool(
+            index,
             "pdf_search",
-            "Search the Agent Quality Whitepaper PDF. Use for questions about agent quality."
+            hash_file(pdf_file),
+            lambda: iter_pdf_pages(pdf_file),
+            "Search the Agent Quality Whitepaper PDF. Use for questions about agent quality.",
         )
         
-        print(f"✓ PDF Retriever Tool created ({len(pdf_splits)} chunks)")
+        print("✓ PDF Retriever Tool created (shared local index)")
         return pdf_retriever_tool
         
     except Exception as e:
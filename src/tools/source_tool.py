@@ -0,0 +1,46 @@
+"""
+Source Tool - Retriever tool over one source of the shared local index
+"""
+from typing import Callable, Iterable
+
+from langchain_core.documents import Document
+from langchain_core.tools import BaseTool
+from langchain_core.tools.retriever import create_retriever_tool
+
+from configuration.configuration import RETRIEVER_K
+from src.retrieval import UnifiedIndex, get_unified_index
+
+
+def make_source_tool(
+    index: UnifiedIndex,
+    name: str,
+    content_hash: str,
+    load_documents: Callable[[], Iterable[Document]],
+    description: str,
+) -> BaseTool:
+    """
+    Register a local source in the shared index and create the tool searching it
+
+    Every local source is indexed in one unified index (re-embedded only when
+    its content hash changes); the tool searches only the chunks of its own
+    source. The scored documents are returned as the tool message artifact, so
+    grading can decide from the retrieval scores before calling the LLM.
+
+    Args:
+        index: Shared local source index (defaults to get_unified_index())
+        name: Source tag and tool name
+        content_hash: Hash of the source content
+        load_documents: Loader of the source documents, called when the index is built
+        description: Tool description shown to the agent
+
+    Returns:
+        Retriever tool
+    """
+    index = index or get_unified_index()
+    index.register(name, content_hash, load_documents)
+    return create_retriever_tool(
+        index.as_retriever(name, k=RETRIEVER_K),
+        name,
+        description,
+        response_format="content_and_artifact",
+    )
@@ -3,18 +3,18 @@ Text Retriever Tool - About Abhiram search
 """
 from pathlib import Path
 from langchain_community.document_loaders import TextLoader
-from langchain_community.vectorstores import FAISS
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_core.tools.retriever import create_retriever_tool
 
+from src.retrieval import UnifiedIndex, hash_file
+from src.tools.source_tool import make_source_tool
 
-def create_text_retriever_tool(text_path: str):
+
+def create_text_retriever_tool(text_path: str, index: UnifiedIndex = None):
     """
     Create a retriever tool from a text file
     
     Args:
         text_path: Path to the text file
+        index: Shared local source index (defaults to get_unified_index())
         
     Returns:
         Retriever tool or None if failed
@@ -26,25 +26,15 @@ def create_text_retriever_tool(text_path: str):
             print(f"✗ Text file not found: {text_path}")
             return None
         
-        loader = TextLoader(str(text_file))
-        text_docs = loader.load()
-        
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
-        text_splits = text_splitter.split_documents(text_docs)
-        
-        text_vectorstore = FAISS.from_documents(
-            documents=text_splits,
-            embedding=HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
-        )
-        text_retriever = text_vectorstore.as_retriever(search_kwargs={"k": 4})
-        
-        text_retriever_tool = create_retriever_tool(
-            text_retriever,
+        text_retriever_tool = make_source_tool(
+            index,
             "about_abhiram_search",
-            "Search information about Abhiram. Use for questions about Abhiram's background, experience, or profile."
+            hash_file(text_file),
+            lambda: TextLoader(str(text_file)).load(),
+            "Search information about Abhiram. Use for questions about Abhiram's background, experience, or profile.",
         )
         
-        print(f"✓ Text Retriever Tool created ({len(text_splits)} chunks)")
+        print("✓ Text Retriever Tool created (shared local index)")
         return text_retriever_tool
         
     except Exception as e:
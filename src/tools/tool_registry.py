@@ -0,0 +1,167 @@
+"""
+Tool Registry - Background tool construction with per-tool readiness
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from configuration.configuration import TOOL_READY_TIMEOUT
+from src.retrieval import build_unified_index
+
+TOOL_PENDING = "pending"
+TOOL_BUILDING = "building"
+TOOL_INDEXING = "indexing"
+TOOL_READY = "ready"
+TOOL_FAILED = "failed"
+
+
+@dataclass
+class ToolSpec:
+    """
+    How to build one tool
+
+    Attributes:
+        name: Key of the tool (a tool name or a route)
+        factory: Callable returning the tool, or None if it could not be created
+        indexed: Whether the tool searches the shared local index; such tools are
+            built in the background and only become ready once the index is built
+    """
+    name: str
+    factory: Callable[[], Any]
+    indexed: bool = False
+
+
+class ToolRegistry:
+    """
+    Builds tools in the background and tracks when each one is ready
+
+    Network tools (Wikipedia, Arxiv, DuckDuckGo) are cheap to create and are built
+    by start() itself, so they can answer immediately. Retriever tools fetch
+    and hash their sources in worker threads; once all of them have registered
+    their source, the shared local index is built (or loaded from the cache)
+    and they become ready together. Every change bumps ``version``, so callers
+    can rebuild whatever they bound to the ready tools.
+    """
+
+    def __init__(self, specs: List[ToolSpec], build_index: Callable[[], Optional[int]] = build_unified_index):
+        self.specs = list(specs)
+        self.build_index = build_index
+        self._tools: Dict[str, Any] = {}
+        self._status: Dict[str, str] = {spec.name: TOOL_PENDING for spec in self.specs}
+        self._version = 0
+        self._changed = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def version(self) -> int:
+        """Counter bumped whenever a tool becomes ready or fails"""
+        return self._version
+
+    @property
+    def done(self) -> bool:
+        """Whether every tool is either ready or failed"""
+        with self._changed:
+            return all(state in (TOOL_READY, TOOL_FAILED) for state in self._status.values())
+
+    def _set(self, names: List[str], state: str, tools: Dict[str, Any] = None):
+        with self._changed:
+            for name in names:
+                self._status[name] = state
+            self._tools.update(tools or {})
+            if state in (TOOL_READY, TOOL_FAILED):
+                self._version += 1
+            self._changed.notify_all()
+
+    def _build(self, spec: ToolSpec) -> Any:
+        self._set([spec.name], TOOL_BUILDING)
+        try:
+            tool = spec.factory()
+        except Exception as e:
+            print(f"✗ Failed to create tool {spec.name}: {e}")
+            tool = None
+        if tool is None:
+            self._set([spec.name], TOOL_FAILED)
+        return tool
+
+    def start(self) -> "ToolRegistry":
+        """
+        Create the network tools and start building the retriever tools
+
+        Returns:
+            The registry, so construction and start can be chained
+        """
+        for spec in self.specs:
+            if not spec.indexed:
+                tool = self._build(spec)
+                if tool is not None:
+                    self._set([spec.name], TOOL_READY, {spec.name: tool})
+
+        indexed = [spec for spec in self.specs if spec.indexed]
+        if indexed:
+            self._thread = threading.Thread(target=self._build_indexed, args=(indexed,), name="tool-builder", daemon=True)
+            self._thread.start()
+        return self
+
+    def _build_indexed(self, specs: List[ToolSpec]):
+        with ThreadPoolExecutor(max_workers=len(specs), thread_name_prefix="tool-builder") as pool:
+            built = dict(zip([spec.name for spec in specs], pool.map(self._build, specs)))
+        built = {name: tool for name, tool in built.items() if tool is not None}
+        if not built:
+            return
+
+        names = list(built)
+        self._set(names, TOOL_INDEXING)
+        # All retriever tools search one index, built once every source has registered
+        if self.build_index() is None:
+            self._set(names, TOOL_FAILED)
+            return
+        self._set(names, TOOL_READY, built)
+        print(f"[INFO] {len(names)} retriever tools ready")
+
+    def status(self) -> Dict[str, str]:
+        """State of every tool: pending, building, indexing, ready or failed"""
+        with self._changed:
+            return dict(self._status)
+
+    def ready_tools(self) -> Dict[str, Any]:
+        """Tools that can be used now, by name, in the order they were specified"""
+        with self._changed:
+            return {spec.name: self._tools[spec.name] for spec in self.specs if spec.name in self._tools}
+
+    def pending_count(self) -> int:
+        """Number of tools still being built"""
+        with self._changed:
+            return sum(state not in (TOOL_READY, TOOL_FAILED) for state in self._status.values())
+
+    def get(self, name: str, timeout: float = TOOL_READY_TIMEOUT) -> Optional[Any]:
+        """
+        Get a tool, waiting for it if it is still being built
+
+        Args:
+            name: Tool name
+            timeout: Seconds to wait for the tool
+
+        Returns:
+            The tool, or None if it failed, is unknown or did not become ready in time
+        """
+        with self._changed:
+            self._changed.wait_for(
+                lambda: self._status.get(name, TOOL_FAILED) in (TOOL_READY, TOOL_FAILED), timeout
+            )
+            return self._tools.get(name)
+
+    def wait(self, timeout: float = TOOL_READY_TIMEOUT) -> bool:
+        """Wait until every tool is ready or failed; returns whether that happened in time"""
+        with self._changed:
+            return self._changed.wait_for(
+                lambda: all(state in (TOOL_READY, TOOL_FAILED) for state in self._status.values()), timeout
+            )
+
+    def wait_for_any(self, timeout: float = TOOL_READY_TIMEOUT) -> bool:
+        """Wait until at least one tool is ready (or all have failed); returns whether one is ready"""
+        with self._changed:
+            self._changed.wait_for(
+                lambda: self._tools or all(state == TOOL_FAILED for state in self._status.values()), timeout
+            )
+            return bool(self._tools)
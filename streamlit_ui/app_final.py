@@ -5,7 +5,6 @@ Supports both Agentic RAG and Router Agent modes with streaming responses
 import streamlit as st
 from pathlib import Path
 import sys
-import time
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -150,9 +149,13 @@ try:
     if agent_mode:
         agent = get_router_agent()
         st.sidebar.success(f"✅ Router Agent Ready")
+        pending = agent.get_pending_route_count()
     else:
         agent = get_agentic_rag_agent()
         st.sidebar.success(f"✅ {agent.get_tool_count()} tools ready")
+        pending = agent.get_pending_tool_count()
+    if pending:
+        st.sidebar.info(f"⏳ {pending} retriever tools indexing in the background")
 except Exception as e:
     st.error(f"Failed to initialize agent: {e}")
     st.stop()
@@ -175,21 +178,13 @@ for message in st.session_state.messages:
                 st.caption(f"📍 Route: {meta['route']}")
 
 
-def stream_response(text: str, delay: float = 0.02):
-    """Generator to stream text character by character"""
-    for char in text:
-        yield char
-        time.sleep(delay)
-
-
-def stream_response_words(text: str, delay: float = 0.05):
-    """Generator to stream text word by word"""
-    words = text.split(' ')
-    for i, word in enumerate(words):
-        if i > 0:
-            yield ' '
-        yield word
-        time.sleep(delay)
+# Progress shown while a step of the agent is running (keyed by the step that just finished)
+NEXT_STEP_STATUS = {
+    "agent": "🔎 *Retrieving documents...*",
+    "retrieve": "⚖️ *Grading relevance and writing the answer...*",
+    "rewrite": "✏️ *Rewrote the question, reasoning again...*",
+    "route": "🔎 *Querying the selected source...*",
+}
 
 
 # Chat input
@@ -209,27 +204,32 @@ if prompt := st.chat_input("Ask me anything..."):
         status_placeholder.markdown(f"🔄 *{mode_name} is processing...*")
         
         try:
+            streamed_text = ""
             if agent_mode:
                 # Router Agent Mode
                 status_placeholder.markdown("🧭 *Routing query to best source...*")
-                result = agent.query(prompt)
+                route_placeholder = st.empty()
+                response_placeholder = st.empty()
+                result = {}
+                for event in agent.stream(prompt):
+                    if event["event"] == "node":
+                        if event["node"] == "route":
+                            route_placeholder.caption(f"📍 Route: {event['route']}")
+                        status_placeholder.markdown(NEXT_STEP_STATUS.get(event["node"], "🔄 *Working...*"))
+                    elif event["event"] == "token":
+                        status_placeholder.empty()
+                        streamed_text += event["text"]
+                        response_placeholder.markdown(streamed_text + "▌")
+                    else:
+                        result = event["result"]
                 response = result["answer"]
+                response_placeholder.markdown(response)
                 metadata = {
                     "route": result["route"],
                     "tools_used": [result["route"]]
                 }
-                
-                # Clear status and show route
-                status_placeholder.empty()
-                st.caption(f"📍 Route: {result['route']}")
-                
-                # Stream the response
-                response_placeholder = st.empty()
-                streamed_text = ""
-                for word in stream_response_words(response):
-                    streamed_text += word
-                    response_placeholder.markdown(streamed_text + "▌")
-                response_placeholder.markdown(streamed_text)
+                if result.get("cached"):
+                    route_placeholder.caption(f"📍 Route: {result['route']} · ⚡ Answered from cache")
                 
                 # Show context
                 with st.expander("📄 Retrieved Context"):
@@ -238,7 +238,18 @@ if prompt := st.chat_input("Ask me anything..."):
             else:
                 # Agentic RAG Mode
                 status_placeholder.markdown("🤖 *Agent is reasoning...*")
-                response, details = agent.query_with_details(prompt)
+                response_placeholder = st.empty()
+                details = {}
+                for event in agent.stream(prompt):
+                    if event["event"] == "node":
+                        status_placeholder.markdown(NEXT_STEP_STATUS.get(event["node"], "🔄 *Working...*"))
+                    elif event["event"] == "token":
+                        status_placeholder.empty()
+                        streamed_text += event["text"]
+                        response_placeholder.markdown(streamed_text + "▌")
+                    else:
+                        response, details = event["response"], event["details"]
+                response_placeholder.markdown(response)
                 metadata = {
                     "tools_used": details.get("tools_used", []),
                     "total_messages": details.get("total_messages", 0)
@@ -250,14 +261,8 @@ if prompt := st.chat_input("Ask me anything..."):
                     tools_html = " ".join([f'<span class="tool-badge">{t}</span>' for t in details["tools_used"]])
                     st.markdown(tools_html, unsafe_allow_html=True)
                     st.caption(f"📊 Steps: {details.get('total_messages', 0)}")
-                
-                # Stream the response
-                response_placeholder = st.empty()
-                streamed_text = ""
-                for word in stream_response_words(response):
-                    streamed_text += word
-                    response_placeholder.markdown(streamed_text + "▌")
-                response_placeholder.markdown(streamed_text)
+                if details.get("answer_cache", {}).get("hit"):
+                    st.caption("⚡ Answered from cache")
             
             # Save to history
             st.session_state.messages.append({
@@ -0,0 +1,72 @@
+"""
+Unified Index tests - Search batching of the shared local index
+"""
+import asyncio
+import threading
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import FakeEmbeddings
+
+from src.retrieval.unified_index import UnifiedIndex
+
+
+def _index(batch_window_ms: float = 20) -> UnifiedIndex:
+    """Index whose batches answer every request with its own query, recording the batch sizes"""
+    index = UnifiedIndex(FakeEmbeddings(size=8), batch_window_ms=batch_window_ms)
+    index._dirty = False
+    index.batches = []
+
+    def run_batch(batch):
+        index.batches.append(len(batch))
+        for request in batch:
+            request.result = [Document(page_content=request.query)]
+
+    index._run_batch = run_batch
+    return index
+
+
+def test_cancelled_batch_leader_does_not_block_the_batch():
+    index = _index()
+    # Another batch in flight, so the next batch waits its window
+    index._serving = 1
+
+    async def scenario():
+        leader = asyncio.create_task(index.asearch("first", "docs"))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(index.asearch("second", "docs"))
+        await asyncio.sleep(0)
+        leader.cancel()
+        docs = await asyncio.wait_for(follower, timeout=5)
+        # Later searches still get served
+        later = await asyncio.wait_for(index.asearch("third", "docs"), timeout=5)
+        return leader, docs, later
+
+    leader, docs, later = asyncio.run(scenario())
+    assert leader.cancelled()
+    assert [doc.page_content for doc in docs] == ["second"]
+    assert [doc.page_content for doc in later] == ["third"]
+    assert index._pending == []
+
+
+def test_concurrent_searches_share_a_batch():
+    index = _index()
+    index._serving = 1
+    results = {}
+
+    def search(query):
+        results[query] = index.search(query, "docs")[0].page_content
+
+    threads = [threading.Thread(target=search, args=(f"q{i}",)) for i in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert results == {f"q{i}": f"q{i}" for i in range(5)}
+    assert sum(index.batches) == 5 and len(index.batches) < 5
+
+
+def test_lone_search_is_served_without_a_window():
+    index = _index(batch_window_ms=10_000)
+    assert index.search("alone", "docs")[0].page_content == "alone"
+    assert index.batches == [1]